@@ -0,0 +1,181 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import router, transaction
+from django.db.models import Model
+from django.utils.functional import SimpleLazyObject
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .blacklist import blacklist_filter
+
+ROLE_CLAIM = 'role'
+IS_STAFF_CLAIM = 'is_staff'
+
+
+def user_cache_key(user_id):
+    return f"accounts:user:{user_id}"
+
+
+def claims_cache_key(user_id):
+    return f"accounts:user:claims:{user_id}"
+
+
+def user_claims(user):
+    return {ROLE_CLAIM: user.role, IS_STAFF_CLAIM: user.is_staff}
+
+
+class RoleRefreshToken(RefreshToken):
+    """RefreshToken carrying the role and is_staff claims, which its access tokens copy"""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token.payload.update(user_claims(user))
+        return token
+
+    @property
+    def access_token(self):
+        # A decoded (refreshed, maybe rotated many times) token re-reads the
+        # claims so role changes reach the next access token
+        if self.token is not None:
+            self.payload.update(user_claims(cached_user(self[api_settings.USER_ID_CLAIM])))
+        return super().access_token
+
+    def check_blacklist(self):
+        # Most refreshed tokens were never blacklisted, which the filter
+        # answers without a query
+        if (settings.TOKEN_BLACKLIST_FILTER
+                and not blacklist_filter().might_contain(self[api_settings.JTI_CLAIM])):
+            return
+        super().check_blacklist()
+
+
+def cached_user(user_id):
+    """
+    The User for user_id
+    With JWT_CLAIMS_AUTHENTICATION its fields, less the password hash, are
+    cached for USER_CACHE_TIMEOUT seconds; the rebuilt instance loads the
+    password on access and save() leaves it alone.
+    """
+    User = get_user_model()
+    lookup = {api_settings.USER_ID_FIELD: user_id}
+    if not settings.JWT_CLAIMS_AUTHENTICATION:
+        try:
+            return User.objects.get(**lookup)
+        except (User.DoesNotExist, ValidationError, ValueError):
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+    key = user_cache_key(user_id)
+    fields = cache.get(key)
+    if fields is None:
+        attnames = [field.attname for field in User._meta.concrete_fields if field.attname != 'password']
+        fields = User.objects.filter(**lookup).values(*attnames).first()
+        if fields is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        cache.set(key, fields, settings.USER_CACHE_TIMEOUT)
+    return User.from_db(router.db_for_read(User), list(fields), list(fields.values()))
+
+
+def forget_user(user, deleted=False):
+    """
+    Drop the cached row after a save or delete
+    Access tokens minted before the change keep their claims until they
+    expire, so the current ones are cached for that long and override them.
+    """
+    user_id = str(getattr(user, api_settings.USER_ID_FIELD))
+    claims = dict(user_claims(user), is_active=user.is_active and not deleted)
+    cache.set(claims_cache_key(user_id), claims, int(api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()))
+    key = user_cache_key(user_id)
+    cache.delete(key)
+    # Again once committed, in case a concurrent request cached the old row meanwhile
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+class ClaimsUser(SimpleLazyObject):
+    """
+    request.user built from the access token's claims
+    - pk, role, is_staff and is_authenticated come from the token (or the
+      cached claims that override it), which is all the permission classes
+      read, so checking them costs no query
+    - Comparisons with model instances (obj.applicant == request.user) and
+      queryset filters (created_by=request.user) only need the pk
+    - Any other attribute loads the full User through cached_user()
+    """
+
+    def __init__(self, token, claims=None):
+        User = get_user_model()
+        claims = claims or token
+        user_id = token[api_settings.USER_ID_CLAIM]
+        super().__init__(lambda: cached_user(user_id))
+        pk = User._meta.pk.to_python(user_id)
+        self.__dict__.update({
+            '_meta': User._meta,
+            'pk': pk,
+            User._meta.pk.attname: pk,
+            'role': claims[ROLE_CLAIM],
+            'is_staff': claims[IS_STAFF_CLAIM],
+            'is_authenticated': True,
+            'is_anonymous': False,
+        })
+
+    # isinstance(request.user, User) holds without loading the row
+    __class__ = property(lambda self: self._meta.model)
+
+    def __getattr__(self, name):
+        # Probes like hasattr(request.user, 'resolve_expression') in queryset
+        # filters must not load the row
+        if name != '_state' and not hasattr(self._meta.model, name):
+            raise AttributeError(name)
+        return super().__getattr__(name)
+
+    def _is_pk_set(self):
+        return True
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if isinstance(other, Model):
+            return self._meta.concrete_model == other._meta.concrete_model and self.pk == other.pk
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __repr__(self):
+        return f"<ClaimsUser: {self.pk}>"
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication without the User query on every request
+    - Only with JWT_CLAIMS_AUTHENTICATION, which needs a cache all workers
+      share; otherwise every request loads the user as JWTAuthentication does
+    - Tokens with role claims get a ClaimsUser; tokens minted before the
+      claims existed get cached_user()
+    - The same cache read picks up claims changed since the token was minted
+      and rejects users deactivated or deleted meanwhile
+    """
+
+    def get_user(self, validated_token):
+        if not settings.JWT_CLAIMS_AUTHENTICATION:
+            return super().get_user(validated_token)
+        try:
+            user_id = str(validated_token[api_settings.USER_ID_CLAIM])
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        claims = cache.get(claims_cache_key(user_id))
+        if claims is not None and not claims['is_active']:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if claims is not None or (ROLE_CLAIM in validated_token and IS_STAFF_CLAIM in validated_token):
+            return ClaimsUser(validated_token, claims)
+
+        user = cached_user(user_id)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
@@ -0,0 +1,95 @@
+import functools
+import hashlib
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+# Headroom for tokens blacklisted between rebuilds
+MIN_CAPACITY = 1000
+
+
+def recent_cache_key(jti):
+    return f"accounts:blacklisted:{jti}"
+
+
+class BloomFilter:
+    """
+    Set of strings in a fixed bit array
+    Membership tests never miss an added value, and wrongly report a value
+    that wasn't added about error_rate of the time while holding capacity values.
+    """
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def positions(self, value):
+        # Double hashing: k positions from the two halves of one digest
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        step = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + index * step) % self.size for index in range(self.hash_count))
+
+    def add(self, value):
+        for position in self.positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, value):
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self.positions(value))
+
+
+class BlacklistFilter:
+    """
+    Per-process Bloom filter of the blacklisted refresh token JTIs
+    - Rebuilt from the unexpired blacklisted tokens every
+      TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS, on the first check after that
+    - Tokens blacklisted since the last rebuild are added to this process's
+      filter and marked in the shared cache, so other workers see them too
+    - might_contain() False means definitely not blacklisted; True needs the
+      database to tell a blacklisted token from a false positive
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.bloom = None
+        self.built_at = None
+
+    def stale(self):
+        return (self.bloom is None or
+                time.monotonic() - self.built_at > settings.TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS)
+
+    def rebuild(self):
+        # Taken before the query, so tokens blacklisted while it runs are
+        # still within the recent markers' lifetime at the next rebuild
+        built_at = time.monotonic()
+        jtis = (BlacklistedToken.objects
+                .filter(token__expires_at__gt=timezone.now())
+                .values_list('token__jti', flat=True))
+        bloom = BloomFilter(jtis.count() * 2 + MIN_CAPACITY, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        for jti in jtis.iterator(chunk_size=10000):
+            bloom.add(jti)
+        self.bloom, self.built_at = bloom, built_at
+
+    def might_contain(self, jti):
+        if self.stale():
+            with self.lock:
+                if self.stale():
+                    self.rebuild()
+        return jti in self.bloom or cache.get(recent_cache_key(jti)) is not None
+
+    def add(self, jti):
+        if self.bloom is not None:
+            self.bloom.add(jti)
+        cache.set(recent_cache_key(jti), True, settings.TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS * 2)
+
+
+@functools.cache
+def blacklist_filter():
+    return BlacklistFilter()
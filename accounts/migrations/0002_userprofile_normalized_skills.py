@@ -0,0 +1,83 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:10
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+# Skill normalization of jobs.skills as of this migration, copied so later
+# changes to it don't alter what the backfill computes
+MAX_SKILL_LENGTH = 100
+
+
+def normalize_skill(name):
+    return ' '.join(str(name).split()).lower().rstrip('.;')[:MAX_SKILL_LENGTH]
+
+
+def display_skill(name):
+    return ' '.join(str(name).split()).rstrip('.;')[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    """Unique (display, normalized) pairs from a comma-separated skills string"""
+    seen = {}
+    for part in (text or '').split(','):
+        normalized = normalize_skill(part)
+        if normalized and normalized not in seen:
+            seen[normalized] = display_skill(part)
+    return [(display, normalized) for normalized, display in seen.items()]
+
+
+def resolve_skill_ids(pairs, Skill, SkillAlias):
+    """{normalized: skill id} for the pairs, through aliases, creating unknown skills"""
+    names = {normalized: display for display, normalized in pairs}
+    if not names:
+        return {}
+    resolved = dict(SkillAlias.objects.filter(alias__in=names).values_list('alias', 'skill_id'))
+    pending = [name for name in names if name not in resolved]
+    resolved.update(Skill.objects.filter(normalized_name__in=pending).values_list('normalized_name', 'id'))
+    missing = [name for name in pending if name not in resolved]
+    if missing:
+        Skill.objects.bulk_create([Skill(name=names[name], normalized_name=name) for name in missing],
+                                  ignore_conflicts=True)
+        resolved.update(Skill.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'id'))
+    return resolved
+
+
+def backfill_profile_skills(apps, schema_editor):
+    UserProfile = apps.get_model('accounts', 'UserProfile')
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+    ProfileSkill = UserProfile.normalized_skills.through
+
+    profiles = UserProfile.objects.exclude(skills='').order_by('pk')
+    last_pk = None
+    while True:
+        batch = profiles if last_pk is None else profiles.filter(pk__gt=last_pk)
+        rows = list(batch.values_list('pk', 'skills')[:BATCH_SIZE])
+        if not rows:
+            break
+        parsed = {pk: parse_skills(text) for pk, text in rows}
+        skill_ids = resolve_skill_ids([pair for pairs in parsed.values() for pair in pairs], Skill, SkillAlias)
+        ProfileSkill.objects.bulk_create(
+            [ProfileSkill(userprofile_id=pk, skill_id=skill_ids[name])
+             for pk, pairs in parsed.items() for _, name in pairs],
+            ignore_conflicts=True,
+        )
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        ('jobs', '0012_skill_jobskill_job_normalized_skills_skillalias_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='normalized_skills',
+            field=models.ManyToManyField(blank=True, related_name='profiles', to='jobs.skill'),
+        ),
+        migrations.RunPython(backfill_profile_skills, migrations.RunPython.noop),
+    ]
@@ -59,6 +59,8 @@ class UserProfile(models.Model):
         null=True)
     linkedIn_url = models.URLField(blank=True)
     skills = models.TextField(blank=True, help_text="Comma-separated skills")
+    # Canonical skills parsed from skills, kept in sync by accounts.signals
+    normalized_skills = models.ManyToManyField('jobs.Skill', related_name='profiles', blank=True)
     experience_years = models.IntegerField(
         default=0,
         validators=[MinValueValidator(0)]
@@ -2,7 +2,8 @@ from rest_framework import serializers
 from .models import User
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
-from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from .authentication import RoleRefreshToken
 import re
 
 class UserSerializer(serializers.ModelSerializer):
@@ -96,7 +97,7 @@ class LoginSerializer(serializers.Serializer):
             if not user.is_active:
                 raise serializers.ValidationError("User account is disabled")
             
-            refresh = RefreshToken.for_user(user)
+            refresh = RoleRefreshToken.for_user(user)
             
             data['user'] = user
             data['refresh'] = str(refresh)
@@ -104,4 +105,13 @@ class LoginSerializer(serializers.Serializer):
 
             return data
         
-        raise serializers.ValidationError("Both username and password are required")
\ No newline at end of file
+        raise serializers.ValidationError("Both username and password are required")
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    # /api/token/ mints the same role claims as the login endpoint
+    token_class = RoleRefreshToken
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    token_class = RoleRefreshToken
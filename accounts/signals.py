@@ -1,6 +1,13 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
+from django.utils import timezone
 from .models import User, UserProfile
+from jobs.skills import sync_profile_skills
+from applications.models import ApplyJob
+from applications.scoring import rescore_applications
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+from .authentication import forget_user
+from .blacklist import blacklist_filter
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -9,4 +16,50 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    instance.userprofile.save()
\ No newline at end of file
+    instance.userprofile.save()
+
+# The authentication cache must not serve a stale user or stale role claims
+@receiver(post_save, sender=User)
+def forget_saved_user(sender, instance, **kwargs):
+    forget_user(instance)
+
+# Employers' application lists show the applicant's name and email;
+# touch the applications so their validators notice an edit
+APPLICANT_FIELDS = ('first_name', 'last_name', 'email')
+
+def applicant_details(user):
+    return tuple(user.__dict__.get(field) for field in APPLICANT_FIELDS)
+
+@receiver(post_init, sender=User)
+def remember_applicant_details(sender, instance, **kwargs):
+    instance._applicant_details = applicant_details(instance)
+
+@receiver(post_save, sender=User)
+def touch_applicant_applications(sender, instance, created, **kwargs):
+    details = applicant_details(instance)
+    if not created and details != instance._applicant_details:
+        ApplyJob.objects.filter(applicant=instance).update(updated_on=timezone.now())
+    instance._applicant_details = details
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    forget_user(instance, deleted=True)
+
+@receiver(post_save, sender=BlacklistedToken)
+def add_to_blacklist_filter(sender, instance, created, **kwargs):
+    if created:
+        blacklist_filter().add(instance.token.jti)
+
+# Keep normalized_skills in sync with the skills text, only when it changed
+@receiver(post_init, sender=UserProfile)
+def remember_profile_skills(sender, instance, **kwargs):
+    instance._synced_skills = instance.__dict__.get('skills')
+
+@receiver(post_save, sender=UserProfile)
+def sync_profile_skill_index(sender, instance, created, **kwargs):
+    if instance.skills != instance._synced_skills or (created and instance.skills):
+        sync_profile_skills(instance)
+        instance._synced_skills = instance.skills
+        # The applicant's applications are scored against these skills
+        if not created:
+            rescore_applications(ApplyJob.objects.filter(applicant_id=instance.user_id), touch=True)
@@ -1,3 +1,194 @@
-from django.test import TestCase
+import datetime
+import time
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.tokens import AccessToken
+from job_board_backend.throttling import SlidingWindowThrottle, counters
+from jobs.models import Location
+from .authentication import cached_user, user_cache_key
+from .blacklist import BloomFilter, blacklist_filter
+from .models import User
 
-# Create your tests here.
+
+class LoginThrottleTests(APITestCase):
+    """LoginAnonThrottle (5/minute) on the shared sliding-window counters"""
+    url = '/api/auth/login/'
+
+    def setUp(self):
+        counters().clear()
+
+    def attempt(self, now):
+        with mock.patch.object(SlidingWindowThrottle, 'timer', return_value=now):
+            return self.client.post(self.url, {'email': 'nobody@example.com', 'password': 'wrong'})
+
+    def test_sixth_attempt_in_a_minute_is_throttled(self):
+        start = (time.time() // 60) * 60
+        statuses = [self.attempt(start + second).status_code for second in range(6)]
+        self.assertNotIn(429, statuses[:5])
+        self.assertEqual(statuses[5], 429)
+
+    def test_window_slides(self):
+        start = (time.time() // 60) * 60
+        for second in range(5):
+            self.attempt(start + second)
+        # Halfway through the next minute about half the attempts have slid out
+        self.assertEqual(self.attempt(start + 60).status_code, 429)
+        self.assertNotEqual(self.attempt(start + 90).status_code, 429)
+
+    def test_rejected_attempts_are_not_counted(self):
+        start = (time.time() // 60) * 60
+        for second in range(20):
+            self.attempt(start + second)
+        self.assertNotEqual(self.attempt(start + 90).status_code, 429)
+
+
+class TokenClientMixin:
+    """An employer with one location, logged in through the API"""
+    url = '/api/jobs/locations/'
+
+    def setUp(self):
+        cache.clear()
+        counters().clear()
+        self.employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='pass1234',
+            first_name='Em', last_name='Ployer', role='employer')
+        Location.objects.create(country='Kenya', city='Nairobi', region='Nairobi',
+                                created_by=self.employer)
+        response = self.client.post('/api/auth/login/', {'username': 'employer', 'password': 'pass1234'})
+        self.tokens = response.data
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {self.tokens['access']}")
+
+    def get(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.url)
+        user_queries = [query['sql'] for query in context.captured_queries
+                        if 'FROM "accounts_user"' in query['sql']]
+        return response, user_queries
+
+
+@override_settings(JWT_CLAIMS_AUTHENTICATION=True)
+class ClaimsAuthenticationTests(TokenClientMixin, APITestCase):
+    """Access tokens carry role claims, so authenticating runs no User query"""
+
+    def test_login_token_carries_role_claims(self):
+        token = AccessToken(self.tokens['access'])
+        self.assertEqual(token['role'], 'employer')
+        self.assertIs(token['is_staff'], False)
+
+    def test_permission_checks_run_no_user_query(self):
+        response, user_queries = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(user_queries, [])
+
+    def test_role_change_overrides_claims(self):
+        self.employer.role = 'job_seeker'
+        self.employer.save()
+        response, _ = self.get()
+        self.assertEqual(response.status_code, 403)
+
+    def test_deactivated_user_is_rejected(self):
+        self.employer.is_active = False
+        self.employer.save()
+        response, _ = self.get()
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_reads_current_claims(self):
+        self.employer.is_staff = True
+        self.employer.save()
+        response = self.client.post('/api/token/refresh/', {'refresh': self.tokens['refresh']})
+        self.assertEqual(response.status_code, 200)
+        self.assertIs(AccessToken(response.data['access'])['is_staff'], True)
+
+    def test_cached_user_leaves_out_the_password(self):
+        user = cached_user(str(self.employer.pk))
+        self.assertNotIn('password', cache.get(user_cache_key(str(self.employer.pk))))
+        self.assertEqual(user.username, 'employer')
+        # Loaded on access, and untouched by save()
+        user.first_name = 'Renamed'
+        user.save()
+        self.assertTrue(User.objects.get(pk=self.employer.pk).check_password('pass1234'))
+
+
+@override_settings(JWT_CLAIMS_AUTHENTICATION=False)
+class DatabaseAuthenticationTests(TokenClientMixin, APITestCase):
+    """Without a shared cache every request loads the user, as JWTAuthentication does"""
+
+    def test_bulk_deactivation_is_seen_at_once(self):
+        User.objects.filter(pk=self.employer.pk).update(is_active=False)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+    def test_bulk_role_change_is_seen_at_once(self):
+        User.objects.filter(pk=self.employer.pk).update(role='job_seeker')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 403)
+
+
+@override_settings(TOKEN_BLACKLIST_FILTER=True)
+class BlacklistFilterTests(APITestCase):
+    """Refresh token blacklist checks through the Bloom filter"""
+
+    def setUp(self):
+        cache.clear()
+        counters().clear()
+        blacklist_filter.cache_clear()
+        User.objects.create_user(
+            username='seeker', email='seeker@example.com', password='pass1234',
+            first_name='Job', last_name='Seeker', role='job_seeker')
+        response = self.client.post('/api/auth/login/', {'username': 'seeker', 'password': 'pass1234'})
+        self.refresh = response.data['refresh']
+
+    def refresh_token(self, token):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/token/refresh/', {'refresh': token})
+        # The membership check; rotating the token also looks up its own blacklist row
+        blacklist_queries = [query['sql'] for query in context.captured_queries
+                             if 'FROM "token_blacklist_blacklistedtoken" INNER JOIN' in query['sql']]
+        return response, blacklist_queries
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        values = [f"jti-{number}" for number in range(1000)]
+        for value in values:
+            bloom.add(value)
+        self.assertTrue(all(value in bloom for value in values))
+        false_positives = sum(f"other-{number}" in bloom for number in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_fresh_token_skips_blacklist_query(self):
+        blacklist_filter().rebuild()
+        response, blacklist_queries = self.refresh_token(self.refresh)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(blacklist_queries, [])
+
+    def test_rotated_token_is_rejected(self):
+        self.assertEqual(self.refresh_token(self.refresh)[0].status_code, 200)
+        response, blacklist_queries = self.refresh_token(self.refresh)
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(len(blacklist_queries), 1)
+
+    def test_token_blacklisted_by_another_worker_is_rejected(self):
+        # This process's filter predates the blacklisting; the shared cache marker catches it
+        blacklist_filter().rebuild()
+        self.assertEqual(self.refresh_token(self.refresh)[0].status_code, 200)
+        blacklist_filter().bloom = BloomFilter(1000)
+        self.assertEqual(self.refresh_token(self.refresh)[0].status_code, 401)
+
+    def test_prune_tokens_deletes_expired(self):
+        self.refresh_token(self.refresh)
+        expired = OutstandingToken.objects.create(
+            jti='expired', token='token', expires_at=timezone.now() - datetime.timedelta(hours=1))
+        BlacklistedToken.objects.create(token=expired)
+        call_command('prune_tokens', chunk_size=1, stdout=StringIO())
+        self.assertFalse(OutstandingToken.objects.filter(jti='expired').exists())
+        self.assertFalse(BlacklistedToken.objects.filter(token__jti='expired').exists())
+        self.assertEqual(OutstandingToken.objects.count(), 2)
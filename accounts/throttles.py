@@ -1,4 +1,4 @@
-from rest_framework.throttling import AnonRateThrottle
+from job_board_backend.throttling import AnonRateThrottle
 from rest_framework.exceptions import Throttled
 
 class LoginAnonThrottle(AnonRateThrottle):
@@ -3,4 +3,8 @@ from .models import ApplyJob
 
 class ApplyJobAdmin(admin.ModelAdmin):
     list_display = ['job', 'status']
+    # ApplyJob.__str__ and Job.__str__ follow job -> company
+    list_select_related = ['job__company']
+    # A select widget would render every job's __str__
+    raw_id_fields = ['job', 'applicant', 'reviewed_by']
 admin.site.register(ApplyJob, ApplyJobAdmin)
\ No newline at end of file
@@ -0,0 +1,92 @@
+import csv
+import json
+import zlib
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+from jobs.models import Job
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+# Rows fetched per round trip (server-side cursor on PostgreSQL)
+CHUNK_SIZE = 2000
+
+# Output column -> values() lookup
+COLUMNS = {
+    'id': 'id',
+    'job': 'job_id',
+    'job_title': 'job__title',
+    'applicant_first_name': 'applicant__first_name',
+    'applicant_last_name': 'applicant__last_name',
+    'applicant_email': 'applicant__email',
+    'status': 'status',
+    'applied_on': 'applied_on',
+    'experience_years': 'experience_years',
+    'expected_salary': 'expected_salary',
+    'match_score': 'match_score',
+    'cover_letter': 'cover_letter',
+    'resume': 'resume',
+}
+FIELDNAMES = [*COLUMNS, 'job_location']
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class LineBuffer:
+    """File-like object whose write() returns the line instead of storing it"""
+    def write(self, value):
+        return value
+
+
+def job_locations(job_ids):
+    """{job id: "loc | loc"} formatted like EmployerApplicationSerializer.job_location"""
+    locations = {}
+    for job in Job.objects.filter(pk__in=job_ids).prefetch_related('location').only('pk'):
+        locations[job.pk] = " | ".join(str(location) for location in job.location.all()) or None
+    return locations
+
+
+def application_rows(queryset, request):
+    """
+    Export rows as dicts, read with values() through an iterator so
+    memory stays flat however many applications there are
+    """
+    locations = job_locations(queryset.order_by().values('job_id').distinct())
+    rows = queryset.values(*COLUMNS.values()).iterator(chunk_size=CHUNK_SIZE)
+    for values in rows:
+        row = {column: values[lookup] for column, lookup in COLUMNS.items()}
+        if row['resume']:
+            row['resume'] = request.build_absolute_uri(default_storage.url(row['resume']))
+        row['job_location'] = locations.get(row['job'])
+        yield row
+
+
+def escape_formula(value):
+    """Prefix text a spreadsheet would run as a formula with ' so it shows as text"""
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def encode_rows(rows, export_format):
+    """Serialize rows one line at a time"""
+    if export_format == 'csv':
+        writer = csv.DictWriter(LineBuffer(), fieldnames=FIELDNAMES)
+        yield writer.writeheader().encode('utf-8')
+        for row in rows:
+            # Applicants write names and cover letters, so no cell may become a formula
+            yield writer.writerow({column: escape_formula(value) for column, value in row.items()}).encode('utf-8')
+    else:
+        for row in rows:
+            yield (json.dumps(row, cls=DjangoJSONEncoder) + '\n').encode('utf-8')
+
+
+def gzip_stream(chunks):
+    """Compress a byte stream on the fly into gzip format"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
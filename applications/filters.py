@@ -0,0 +1,27 @@
+from rest_framework.filters import OrderingFilter
+
+
+class AliasOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that also accepts the view's ordering_aliases
+    e.g. ordering_aliases = {'match': '-match_score'} makes ?ordering=match
+    best match first and ?ordering=-match the reverse
+    """
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if params:
+            aliases = getattr(view, 'ordering_aliases', {})
+            fields = [self.expand_alias(param.strip(), aliases) for param in params.split(',')]
+            ordering = self.remove_invalid_fields(queryset, fields, view, request)
+            if ordering:
+                return ordering
+        return self.get_default_ordering(view)
+
+    def expand_alias(self, term, aliases):
+        descending = term.startswith('-')
+        field = aliases.get(term.lstrip('-'))
+        if field is None:
+            return term
+        if descending:
+            return field[1:] if field.startswith('-') else f"-{field}"
+        return field
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from applications.models import ApplyJob
+from applications.scoring import rescore_applications, BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = ("Recompute stored application match scores, e.g. after a job's skills, "
+            "experience level or salary band changed")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--job', action='append', default=[],
+                            help="Only rescore applications to this job id (repeatable)")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help="Number of applications scored and updated per batch")
+
+    def handle(self, *args, **options):
+        applications = ApplyJob.objects.all()
+        if options['job']:
+            applications = applications.filter(job_id__in=options['job'])
+        total = rescore_applications(applications, options['batch_size'], touch=True)
+        self.stdout.write(self.style.SUCCESS(f"{total} applications rescored."))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_applyjob_unique_job_application'),
+        ('jobs', '0011_job_jobs_job_posted__2e3dce_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applyjob',
+            index=models.Index(fields=['-applied_on', '-id'], name='application_applied_09a231_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applyjob',
+            index=models.Index(fields=['applicant', 'applied_on', 'id'], name='application_applica_d7e9a8_idx'),
+        ),
+    ]
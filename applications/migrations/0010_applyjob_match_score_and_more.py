@@ -0,0 +1,111 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:22
+
+from django.conf import settings
+from django.db import migrations, models
+from decimal import Decimal
+
+BATCH_SIZE = 500
+
+# The scoring rules of jobs.matching as of this migration, copied so later
+# changes to them don't alter what the backfill computes
+EXPERIENCE_YEARS = {
+    'entry': (0, 2),
+    'mid_level': (2, 5),
+    'senior': (5, 8),
+    'lead': (8, 12),
+    'executive': (12, None),
+}
+SKILL_WEIGHT = 0.6
+EXPERIENCE_WEIGHT = 0.25
+SALARY_WEIGHT = 0.15
+UNDER_EXPERIENCE_PENALTY = 0.25
+OVER_EXPERIENCE_PENALTY = 0.1
+OVER_SALARY_PENALTY = 0.2
+
+
+def experience_fit(years, level):
+    low, high = EXPERIENCE_YEARS.get(level, (0, None))
+    if years < low:
+        return max(0.0, 1 - (low - years) * UNDER_EXPERIENCE_PENALTY)
+    if high is not None and years >= high:
+        return max(0.0, 1 - (years - high + 1) * OVER_EXPERIENCE_PENALTY)
+    return 1.0
+
+
+def skill_fit(job_skill_ids, candidate_skill_ids):
+    if not job_skill_ids:
+        return 0.0
+    return len(job_skill_ids & candidate_skill_ids) / len(job_skill_ids)
+
+
+def salary_fit(expected_salary, salary_min, salary_max):
+    ceiling = salary_max if salary_max is not None else salary_min
+    if expected_salary is None or not ceiling or expected_salary <= ceiling:
+        return 1.0
+    overshoot = (Decimal(expected_salary) - Decimal(ceiling)) / Decimal(ceiling)
+    return max(0.0, 1 - float(overshoot) * 10 * OVER_SALARY_PENALTY)
+
+
+def skill_sets(through_model, owner_field, owner_ids):
+    sets = {}
+    rows = through_model.objects.filter(**{f"{owner_field}__in": owner_ids})
+    for owner_id, skill_id in rows.values_list(owner_field, 'skill_id'):
+        sets.setdefault(owner_id, set()).add(skill_id)
+    return sets
+
+
+def backfill_match_scores(apps, schema_editor):
+    ApplyJob = apps.get_model('applications', 'ApplyJob')
+    Job = apps.get_model('jobs', 'Job')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+    ProfileSkill = apps.get_model('accounts', 'UserProfile').normalized_skills.through
+
+    applications = ApplyJob.objects.order_by('pk').only(
+        'pk', 'job_id', 'applicant_id', 'experience_years', 'expected_salary')
+    last_pk = None
+    while True:
+        batch = applications if last_pk is None else applications.filter(pk__gt=last_pk)
+        rows = list(batch[:BATCH_SIZE])
+        if not rows:
+            break
+        job_ids = {row.job_id for row in rows}
+        applicant_ids = {row.applicant_id for row in rows}
+        jobs = {
+            job['pk']: job for job in Job.objects.filter(pk__in=job_ids).values(
+                'pk', 'experience_level', 'salary_min', 'salary_max')
+        }
+        job_skills = skill_sets(JobSkill, 'job_id', job_ids)
+        applicant_skills = skill_sets(ProfileSkill, 'userprofile__user_id', applicant_ids)
+        for row in rows:
+            job = jobs[row.job_id]
+            row.match_score = round(
+                SKILL_WEIGHT * skill_fit(job_skills.get(row.job_id, set()),
+                                         applicant_skills.get(row.applicant_id, set()))
+                + EXPERIENCE_WEIGHT * experience_fit(row.experience_years, job['experience_level'])
+                + SALARY_WEIGHT * salary_fit(row.expected_salary, job['salary_min'], job['salary_max']),
+                4)
+        ApplyJob.objects.bulk_update(rows, ['match_score'])
+        last_pk = rows[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_userprofile_normalized_skills'),
+        ('applications', '0009_applyjob_application_applied_09a231_idx_and_more'),
+        ('jobs', '0014_job_jobs_job_available_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applyjob',
+            name='match_score',
+            field=models.FloatField(default=0, editable=False, help_text="Fit against the job's skills, experience level and salary band (0-1)"),
+        ),
+        migrations.AddIndex(
+            model_name='applyjob',
+            index=models.Index(fields=['job', '-match_score', '-id'], name='application_job_id_558585_idx'),
+        ),
+        migrations.RunPython(backfill_match_scores, migrations.RunPython.noop),
+    ]
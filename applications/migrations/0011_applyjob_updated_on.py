@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 21:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_applyjob_match_score_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applyjob',
+            name='updated_on',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -2,6 +2,7 @@ from django.db import models
 import uuid
 from jobs.models import Job
 from django.conf import settings
+from .scoring import score_applications
 
 # save application documents in different directories for each user
 def user_directory_path(instance, filename):
@@ -52,6 +53,10 @@ class ApplyJob(models.Model):
     reviewed_at = models.DateTimeField(blank=True, null=True,
                                        help_text="Date and time when the application was reviewed")
     applied_on = models.DateTimeField(auto_now_add=True)
+    updated_on = models.DateTimeField(auto_now=True)
+    match_score = models.FloatField(
+        default=0, editable=False,
+        help_text="Fit against the job's skills, experience level and salary band (0-1)")
 
     class Meta:
         verbose_name = "Application"
@@ -62,6 +67,11 @@ class ApplyJob(models.Model):
             models.Index(fields=['applicant']),
             models.Index(fields=['status']),
             models.Index(fields=['applied_on']),
+            # Keyset pagination over the default ordering
+            models.Index(fields=['-applied_on', '-id']),
+            models.Index(fields=['applicant', 'applied_on', 'id']),
+            # ?ordering=match for one job is a scan of this index
+            models.Index(fields=['job', '-match_score', '-id']),
         ]
 
         constraints = [
@@ -73,3 +83,28 @@ class ApplyJob(models.Model):
 
     def __str__(self):
         return f"{self.job.company.name} - {self.job.title} applied on {self.applied_on}. Stage: {self.status})"
+
+    # Fields match_score depends on; it is recomputed only when they change
+    score_fields = ('job_id', 'applicant_id', 'experience_years', 'expected_salary')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._scored_inputs = instance.score_inputs()
+        return instance
+
+    def score_inputs(self):
+        # __dict__ so deferred fields are not loaded one query at a time
+        return tuple(self.__dict__.get(field) for field in self.score_fields)
+
+    def save(self, *args, **kwargs):
+        if self._state.adding or self.score_inputs() != getattr(self, '_scored_inputs', None):
+            score_applications([self])
+            update_fields = kwargs.get('update_fields')
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'match_score'}
+        if kwargs.get('update_fields') is not None:
+            # auto_now only applies to fields being saved
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'updated_on'}
+        super().save(*args, **kwargs)
+        self._scored_inputs = self.score_inputs()
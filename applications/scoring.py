@@ -0,0 +1,66 @@
+from django.utils import timezone
+from accounts.models import UserProfile
+from jobs.matching import applicant_score
+from jobs.models import Job, JobSkill
+
+BATCH_SIZE = 500
+
+
+def skill_sets(through_model, owner_field, owner_ids):
+    """{owner id: {skill ids}} from a skill through table in one query"""
+    sets = {}
+    rows = through_model.objects.filter(**{f"{owner_field}__in": owner_ids})
+    for owner_id, skill_id in rows.values_list(owner_field, 'skill_id'):
+        sets.setdefault(owner_id, set()).add(skill_id)
+    return sets
+
+
+def score_applications(applications):
+    """
+    Set match_score on applications against their jobs (see jobs.matching)
+    Three queries for the whole batch.
+    """
+    job_ids = {application.job_id for application in applications}
+    applicant_ids = {application.applicant_id for application in applications}
+    jobs = {
+        row['pk']: row for row in Job.objects.filter(pk__in=job_ids).values(
+            'pk', 'experience_level', 'salary_min', 'salary_max')
+    }
+    job_skills = skill_sets(JobSkill, 'job_id', job_ids)
+    applicant_skills = skill_sets(UserProfile.normalized_skills.through, 'userprofile__user_id', applicant_ids)
+
+    for application in applications:
+        job = jobs[application.job_id]
+        application.match_score = applicant_score(
+            job_skills.get(application.job_id, ()),
+            applicant_skills.get(application.applicant_id, ()),
+            application.experience_years, job['experience_level'],
+            application.expected_salary, job['salary_min'], job['salary_max'],
+        )
+    return applications
+
+
+def rescore_applications(queryset, batch_size=BATCH_SIZE, touch=False):
+    """
+    Recompute and store match_score for every application in queryset, in pk batches
+    touch also bumps updated_on so conditional GETs notice the new scores.
+    """
+    queryset = queryset.order_by('pk').only('pk', 'job_id', 'applicant_id', 'experience_years', 'expected_salary')
+    model = queryset.model
+    last_pk = None
+    total = 0
+    while True:
+        batch = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        applications = list(batch[:batch_size])
+        if not applications:
+            return total
+        score_applications(applications)
+        fields = ['match_score']
+        if touch:
+            now = timezone.now()
+            for application in applications:
+                application.updated_on = now
+            fields.append('updated_on')
+        model.objects.bulk_update(applications, fields)
+        total += len(applications)
+        last_pk = applications[-1].pk
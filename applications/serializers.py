@@ -1,11 +1,16 @@
 from rest_framework import serializers
 from .models import ApplyJob
+from jobs.models import Job
 
 class ApplyJobSerializer(serializers.ModelSerializer):
+    # The browsable API's job choices render Job.__str__, which reads company.name
+    job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.select_related('company'))
+
     class Meta:
         model = ApplyJob
         fields = '__all__'
-        read_only_fields = ['id', 'applicant', 'status', 'reviewed_by', 'reviewed_at', 'applied_on', 'resume']
+        read_only_fields = ['id', 'applicant', 'status', 'reviewed_by', 'reviewed_at', 'applied_on', 'resume',
+                            'match_score']
     
     def validate_job(self, value):
         request = self.context['request']
@@ -29,10 +34,10 @@ class ApplicantHistorySerializer(serializers.ModelSerializer):
         read_only_fields = ['job_title', 'company_name']
 
     def get_job_location(self, obj):
-        job = obj.job  # go through the application
         """Returns formatted location(s) using Location's __str__ method"""
-        if obj.job and obj.job.location.exists():
-            locations = [str(location) for location in obj.job.location.all()]
+        # .all() reads the prefetched job__location; .exists() would query per row
+        locations = [str(location) for location in obj.job.location.all()]
+        if locations:
             return " | ".join(locations)  # Separate multiple locations with |
         return None
     
@@ -46,16 +51,16 @@ class EmployerApplicationSerializer(serializers.ModelSerializer):
         model = ApplyJob
         fields = ['id', 'job', 'job_title', 'applicant_name', 'applicant_email',
                   'job_location', 'status', 'applied_on','experience_years',
-                  'expected_salary', 'cover_letter', 'resume']
+                  'expected_salary', 'cover_letter', 'resume', 'match_score']
         read_only_fields = ['id', 'job', 'job_title', 'applicant_name', 'applicant_email',
                             'job_location','applied_on','experience_years',
-                            'expected_salary', 'cover_letter', 'resume']
+                            'expected_salary', 'cover_letter', 'resume', 'match_score']
         
     def get_applicant_name(self, obj):
         return f"{obj.applicant.first_name} {obj.applicant.last_name}"
 
     def get_job_location(self, obj):
-        if obj.job and obj.job.location.exists():
-            locations = [str(location) for location in obj.job.location.all()]
+        locations = [str(location) for location in obj.job.location.all()]
+        if locations:
             return " | ".join(locations)
         return None
\ No newline at end of file
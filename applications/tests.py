@@ -1,3 +1,229 @@
-from django.test import TestCase
+import csv
+import gzip
+import importlib
+import io
+import json
+from asgiref.sync import async_to_sync
+from django.apps import apps
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from job_board_backend.testing import JobBoardTestMixin, QueryBudgetMixin
+from .models import ApplyJob
+from .scoring import score_applications
 
-# Create your tests here.
+
+class ApplicationTestMixin(JobBoardTestMixin):
+    """create_application() posts a job in two locations and applies"""
+
+    def setUp(self):
+        super().setUp()
+        self.locations = [self.location, self.create_location()]
+
+    def create_application(self, applicant=None):
+        return super().create_application(applicant, self.create_job(locations=self.locations))
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, ApplicationTestMixin, APITestCase):
+    """Application list endpoints must run a constant number of queries per page"""
+
+    def test_my_applications(self):
+        url = '/api/applications/my-applications-history/'
+        self.client.force_authenticate(self.applicant)
+        self.assertQueryBudget(url, self.create_application)
+
+    def test_job_applications(self):
+        url = '/api/applications/job-applications-history/'
+        self.client.force_authenticate(self.employer)
+        self.assertQueryBudget(url, lambda: self.create_application(self.create_applicant()))
+
+    def test_not_modified(self):
+        url = '/api/applications/my-applications-history/'
+        self.client.force_authenticate(self.applicant)
+        application = self.create_application()
+        etag = self.client.get(url)['ETag']
+
+        # Revalidation only runs the validator query
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        application.status = 'reviewed'
+        application.save(update_fields=['status'])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_company_and_location_changes_revalidate(self):
+        url = '/api/applications/my-applications-history/'
+        self.client.force_authenticate(self.applicant)
+        self.create_application()
+
+        # Rows show the company name and job locations, which the application doesn't timestamp
+        for instance, field, value in [(self.company, 'name', 'Acme Group'), (self.locations[0], 'city', 'Kisumu')]:
+            response = self.client.get(url)
+            self.assertNotIn('Last-Modified', response)
+            etag = response['ETag']
+            with self.captureOnCommitCallbacks(execute=True):
+                setattr(instance, field, value)
+                instance.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(value, json.dumps(response.data))
+
+
+    def test_applicant_changes_revalidate(self):
+        url = '/api/applications/job-applications-history/'
+        self.client.force_authenticate(self.employer)
+        self.create_application()
+        etag = self.client.get(url)['ETag']
+
+        # Rows show the applicant's name and email
+        self.applicant.refresh_from_db()
+        self.applicant.last_name = 'Renamed'
+        self.applicant.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renamed', response.content.decode())
+
+        # Saves that leave those fields alone keep the ETag
+        etag = response['ETag']
+        self.applicant.phone_number = '0700000000'
+        self.applicant.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+class MatchScoreTests(ApplicationTestMixin, APITestCase):
+    """match_score follows changes to the job and to the applicant's profile"""
+
+    def setUp(self):
+        super().setUp()
+        self.application = self.create_application()
+        self.job = self.application.job
+
+    def stored_score(self):
+        return ApplyJob.objects.values_list('match_score', flat=True).get(pk=self.application.pk)
+
+    def test_profile_skills_rescore(self):
+        self.assertEqual(self.stored_score(), 0.4)
+        updated_on = ApplyJob.objects.get().updated_on
+
+        profile = self.applicant.userprofile
+        profile.skills = 'python'
+        profile.save()
+        self.assertEqual(self.stored_score(), 1.0)
+        self.assertGreater(ApplyJob.objects.get().updated_on, updated_on)
+
+    def test_job_changes_rescore(self):
+        self.applicant.userprofile.skills = 'Python'
+        self.applicant.userprofile.save()
+
+        self.job.skills_required = 'Python, Go'
+        self.job.save()
+        self.assertEqual(self.stored_score(), 0.7)
+
+        self.job.salary_max = 40000
+        self.job.save()
+        self.assertEqual(self.stored_score(), 0.625)
+
+        self.job.experience_level = 'senior'
+        self.job.save()
+        self.assertEqual(self.stored_score(), 0.375)
+
+    def test_unrelated_changes_skip_rescoring(self):
+        updated_on = ApplyJob.objects.get().updated_on
+        self.job.title = 'Renamed'
+        self.job.save()
+        self.applicant.userprofile.bio = 'Hello'
+        self.applicant.userprofile.save()
+        self.assertEqual(ApplyJob.objects.get().updated_on, updated_on)
+
+    def test_migration_backfill_matches_scoring(self):
+        self.applicant.userprofile.skills = 'Python'
+        self.applicant.userprofile.save()
+        self.job.skills_required = 'Python, Go'
+        self.job.salary_max = 40000
+        self.job.save()
+        self.create_application(self.create_applicant())
+        expected = {application.pk: application.match_score
+                    for application in score_applications(list(ApplyJob.objects.all()))}
+
+        ApplyJob.objects.update(match_score=0)
+        migration = importlib.import_module('applications.migrations.0010_applyjob_match_score_and_more')
+        migration.backfill_match_scores(apps, None)
+        self.assertEqual(dict(ApplyJob.objects.values_list('pk', 'match_score')), expected)
+
+
+class AsyncMyApplicationsTests(ApplicationTestMixin, APITestCase):
+    """/api/async/ serves the applicant's own applications like the sync endpoint"""
+    url = '/api/async/applications/my-applications-history/'
+
+    def get(self, url, user):
+        headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+        return async_to_sync(self.async_client.get)(url, headers=headers)
+
+    def test_list_and_retrieve(self):
+        application = self.create_application()
+        other = self.create_application(self.create_applicant())
+
+        response = self.get(self.url, self.applicant)
+        self.assertEqual(response.status_code, 200)
+        self.client.force_authenticate(self.applicant)
+        self.assertEqual(response.json(),
+                         self.client.get('/api/applications/my-applications-history/').json())
+        self.assertEqual([row['id'] for row in response.json()['results']], [str(application.pk)])
+
+        self.assertEqual(self.get(f'{self.url}{application.pk}/', self.applicant).json()['id'],
+                         str(application.pk))
+        # Someone else's application
+        self.assertEqual(self.get(f'{self.url}{other.pk}/', self.applicant).status_code, 404)
+
+    def test_requires_authentication(self):
+        response = async_to_sync(self.async_client.get)(self.url)
+        self.assertEqual(response.status_code, 401)
+
+
+class ExportTests(ApplicationTestMixin, APITestCase):
+    """The streamed export in each format, with applicant text kept inert in CSV"""
+    url = '/api/applications/job-applications-history/export/'
+
+    def setUp(self):
+        super().setUp()
+        self.applicant.first_name = '=HYPERLINK("x")'
+        self.applicant.last_name = '-2+3'
+        self.applicant.save()
+        self.application = self.create_application()
+        self.application.cover_letter = '@SUM(A1)'
+        self.application.save()
+        self.create_application(self.create_applicant())
+        self.client.force_authenticate(self.employer)
+
+    def download(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content)
+
+    def test_csv_escapes_formulas(self):
+        rows = list(csv.DictReader(io.StringIO(self.download().decode())))
+        self.assertEqual(len(rows), 2)
+        row = next(row for row in rows if row['id'] == str(self.application.pk))
+        self.assertEqual(row['applicant_first_name'], '\'=HYPERLINK("x")')
+        self.assertEqual(row['applicant_last_name'], "'-2+3")
+        self.assertEqual(row['cover_letter'], "'@SUM(A1)")
+        self.assertEqual(row['expected_salary'], '50000.00')
+        self.assertEqual(row['job_location'], ' | '.join(sorted(str(location) for location in self.locations)))
+
+    def test_jsonl_keeps_values(self):
+        rows = [json.loads(line) for line in self.download(export_format='jsonl').splitlines()]
+        self.assertEqual(len(rows), 2)
+        row = next(row for row in rows if row['id'] == str(self.application.pk))
+        self.assertEqual(row['applicant_first_name'], '=HYPERLINK("x")')
+        self.assertEqual(row['cover_letter'], '@SUM(A1)')
+
+    def test_gzip(self):
+        response = self.client.get(self.url, {'gzip': '1'})
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('applications.csv.gz', response['Content-Disposition'])
+        body = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(body, self.download())
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get(self.url, {'export_format': 'xml'}).status_code, 400)
@@ -1,10 +1,21 @@
 from django.shortcuts import render
-from rest_framework import viewsets
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.filters import SearchFilter
+from django_filters.rest_framework import DjangoFilterBackend
 from .serializers import ApplyJobSerializer, ApplicantHistorySerializer, EmployerApplicationSerializer
 from .models import ApplyJob
 from .permissions import IsAuthenticatedToApply, IsApplicantOwner, IsJobOwner
 from rest_framework.permissions import IsAuthenticated
 from .throttles import CustomUserThrottle
+from .filters import AliasOrderingFilter
+from job_board_backend.async_views import AsyncViewSetMixin
+from jobs.cache import GenerationETagMixin
+from .exports import EXPORT_FORMATS, application_rows, encode_rows, gzip_stream
+from notifications.outbox import record_application, record_status_change
 
 # Create your views here.
 class ApplyJobViewset(viewsets.ModelViewSet):
@@ -16,11 +27,14 @@ class ApplyJobViewset(viewsets.ModelViewSet):
     throttle_classes = [CustomUserThrottle]
 
     def perform_create(self, serializer):
-        # Automatically set the applicant to the logged-in user
-        serializer.save(applicant=self.request.user)
+        # Automatically set the applicant to the logged-in user;
+        # the employer's notification is queued in the same transaction
+        with transaction.atomic():
+            application = serializer.save(applicant=self.request.user)
+            record_application(application)
 
 # For Job Seekers - "My Applications"
-class MyApplicationHistoryViewset(viewsets.ReadOnlyModelViewSet):
+class MyApplicationHistoryViewset(GenerationETagMixin, viewsets.ReadOnlyModelViewSet):
     """
     For Job Seekers - "My Applications"
     - Only authenticated users can access
@@ -28,40 +42,96 @@ class MyApplicationHistoryViewset(viewsets.ReadOnlyModelViewSet):
     """
     serializer_class = ApplicantHistorySerializer
     permission_classes = [IsAuthenticated, IsApplicantOwner]
+    # Keyset pagination needs non-nullable ordering columns
+    ordering_fields = ['applied_on', 'status']
+    # ETag validators; job, company and location changes bump the generation
+    last_modified_fields = ['updated_on', 'job__updated_on']
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return ApplyJob.objects.none()
         
+        # Prefetch everything ApplicantHistorySerializer reads
         return ApplyJob.objects.filter(
             applicant=self.request.user
-        ).select_related('job', 'job__company').order_by('applied_on')
+        ).select_related('job', 'job__company').prefetch_related('job__location').order_by('applied_on')
+
+
+class AsyncMyApplicationHistoryViewset(AsyncViewSetMixin, MyApplicationHistoryViewset):
+    """MyApplicationHistoryViewset on the async ORM, served under /api/async/"""
+
+    async def list(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.alist, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.aretrieve, request, *args, **kwargs)
 
 
 # For Employers - "Applications to My Jobs"
-class JobApplicationsHistoryViewset(viewsets.ModelViewSet):
+class JobApplicationsHistoryViewset(GenerationETagMixin, viewsets.ModelViewSet):
     """
     For Employers - "Applications to My Jobs"
     - Only authenticated users can access
     - Employers can only see applications to jobs they posted
     - Employers can update application status obly
+    - ?ordering=match ranks applicants by their stored match_score;
+      combine with ?job=<id> to rank one job's applicants from an index
     """
     serializer_class = EmployerApplicationSerializer
     permission_classes = [IsAuthenticated, IsJobOwner]
     http_method_names = ['get', 'put', 'patch']
+    filter_backends = [DjangoFilterBackend, SearchFilter, AliasOrderingFilter]
+    filterset_fields = ['job', 'status']
+    ordering_fields = ['applied_on', 'status', 'match_score']
+    ordering_aliases = {'match': '-match_score'}
+    last_modified_fields = ['updated_on', 'job__updated_on']
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return ApplyJob.objects.none()
         
+        # Prefetch everything EmployerApplicationSerializer reads
         return ApplyJob.objects.filter(
             job__posted_by=self.request.user
-        ).select_related('job', 'applicant').order_by('-applied_on')
+        ).select_related('job', 'applicant').prefetch_related('job__location').order_by('-applied_on')
 
     def perform_update(self, serializer):
         # Automatically set reviewed_by and reviewed_at when status is updated
+        # and queue the applicant's notification in the same transaction
         from django.utils import timezone
-        serializer.save(
-            reviewed_by=self.request.user,
-            reviewed_at=timezone.now()
-        )
\ No newline at end of file
+        previous_status = serializer.instance.status
+        with transaction.atomic():
+            application = serializer.save(
+                reviewed_by=self.request.user,
+                reviewed_at=timezone.now()
+            )
+            if application.status != previous_status:
+                record_status_change(application, previous_status)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Download every application to the employer's jobs
+        - ?export_format=csv (default) or jsonl
+        - ?gzip=1 compresses the download on the fly
+        - Accepts the same filters and ordering as the list
+        - Rows are streamed as they are read, so memory use stays flat
+        """
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({"detail": f"export_format must be one of: {', '.join(EXPORT_FORMATS)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        # values() rows don't need the serializer's joins and prefetches
+        queryset = self.filter_queryset(self.get_queryset()).select_related(None).prefetch_related(None)
+        chunks = encode_rows(application_rows(queryset, request), export_format)
+        filename = f"applications.{export_format}"
+        content_type = EXPORT_FORMATS[export_format]
+        if request.query_params.get('gzip') in ('1', 'true'):
+            chunks = gzip_stream(chunks)
+            filename += '.gz'
+            content_type = 'application/gzip'
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
\ No newline at end of file
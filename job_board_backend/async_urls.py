@@ -0,0 +1,14 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from applications.views import AsyncMyApplicationHistoryViewset
+from jobs.views import AsyncAvailableJobsViewset
+
+# Async (ASGI) versions of the hot read endpoints, same paths as under /api/
+router = DefaultRouter()
+router.register(r'jobs/availablejobs', AsyncAvailableJobsViewset, basename='async-availablejobs')
+router.register(r'applications/my-applications-history', AsyncMyApplicationHistoryViewset,
+                basename='async-my-applications')
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
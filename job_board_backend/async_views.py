@@ -0,0 +1,93 @@
+import inspect
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.http import Http404
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.response import Response
+
+
+class AsyncViewSetMixin:
+    """
+    Serve a read-only ViewSet from an async view under ASGI
+    - Mix into the sync viewset, e.g. AsyncFooViewset(AsyncViewSetMixin, FooViewset),
+      to keep its queryset, filters, serializers, permissions and throttles
+    - Authentication, permissions, throttles, filter backends and serializers
+      are sync code and run in a worker thread; the page or object itself is
+      fetched with the async ORM, so the event loop serves other requests
+      while the database works
+    - alist() and aretrieve() replace list() and retrieve(); wrap them in
+      acached_response() / aconditional_response() where the sync view caches
+    """
+    http_method_names = ['get', 'head']
+    # Documented once, under the sync endpoints
+    swagger_schema = None
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+
+        async def async_view(request, *args, **kwargs):
+            # The sync wrapper returns the coroutine from dispatch()
+            return await view(request, *args, **kwargs)
+
+        async_view.__dict__.update(view.__dict__)
+        return csrf_exempt(async_view)
+
+    async def dispatch(self, request, *args, **kwargs):
+        """APIView.dispatch awaiting the handler"""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            method = request.method.lower()
+            if method in self.http_method_names:
+                handler = getattr(self, method, self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    async def list(self, request, *args, **kwargs):
+        return await self.alist(request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aretrieve(request, *args, **kwargs)
+
+    async def alist(self, request, *args, **kwargs):
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        page = None
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        if page is None:
+            instances = [instance async for instance in queryset]
+            return Response(await self.aserialize(instances, many=True))
+        return self.get_paginated_response(await self.aserialize(page, many=True))
+
+    async def aretrieve(self, request, *args, **kwargs):
+        instance = await self.aget_object()
+        return Response(await self.aserialize(instance))
+
+    async def aget_object(self):
+        """get_object() with the lookup on the async ORM"""
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+        await sync_to_async(self.check_object_permissions)(self.request, instance)
+        return instance
+
+    async def aserialize(self, instance, **kwargs):
+        # Fields may still touch lazy relations, which the ORM only allows off the event loop
+        return await sync_to_async(lambda: self.get_serializer(instance, **kwargs).data)()
@@ -0,0 +1,96 @@
+import hashlib
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified validators for list and retrieve
+    - get_validators() derives them from cheap queries before any rows are
+      serialized; a matching If-None-Match / If-Modified-Since returns 304
+    - Default validators: MAX() of last_modified_fields and COUNT(*) over the
+      filtered queryset, so edits, inserts and deletes all change the ETag
+    - The ETag also covers the user, the full query string (page, fields,
+      filters) and the negotiated media type
+    Responses are marked no-cache, so clients revalidate on every poll.
+    """
+    conditional_actions = ('list', 'retrieve')
+    last_modified_fields = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_response(super().retrieve, request, *args, **kwargs)
+
+    def conditional_response(self, handler, request, *args, **kwargs):
+        if self.action not in self.conditional_actions:
+            return handler(request, *args, **kwargs)
+
+        validators = self.get_validators(request, *args, **kwargs)
+        headers, not_modified = self.check_validators(request, *validators)
+        response = not_modified or handler(request, *args, **kwargs)
+        return self.add_validator_headers(request, response, headers)
+
+    async def aconditional_response(self, handler, request, *args, **kwargs):
+        """conditional_response for an async handler; validators run in a worker thread"""
+        if self.action not in self.conditional_actions:
+            return await handler(request, *args, **kwargs)
+
+        validators = await sync_to_async(self.get_validators)(request, *args, **kwargs)
+        headers, not_modified = self.check_validators(request, *validators)
+        response = not_modified or await handler(request, *args, **kwargs)
+        return self.add_validator_headers(request, response, headers)
+
+    def check_validators(self, request, etag, last_modified):
+        """(validator headers, 304 response or None)"""
+        headers = {}
+        if etag:
+            headers['ETag'] = f'W/"{self.digest(request, etag)}"'
+        if last_modified:
+            headers['Last-Modified'] = http_date(last_modified.timestamp())
+
+        not_modified = get_conditional_response(
+            request._request,
+            etag=headers.get('ETag'),
+            last_modified=int(last_modified.timestamp()) if last_modified else None,
+        )
+        return headers, not_modified
+
+    def add_validator_headers(self, request, response, headers):
+        if response.status_code in (200, 304):
+            for header, value in headers.items():
+                response[header] = value
+            patch_cache_control(response, no_cache=True)
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True)
+            patch_vary_headers(response, ['Accept', 'Authorization'])
+        return response
+
+    def digest(self, request, validator):
+        raw = '|'.join([
+            str(validator),
+            str(getattr(request.user, 'pk', '')),
+            request.get_full_path(),
+            str(getattr(request, 'accepted_media_type', '')),
+        ])
+        return hashlib.md5(raw.encode('utf-8')).hexdigest()
+
+    def get_validators(self, request, *args, **kwargs):
+        """(etag source, last modified datetime or None); (None, None) disables both"""
+        if not self.last_modified_fields:
+            return None, None
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.action == 'retrieve':
+            lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+
+        aggregates = {f"max_{index}": Max(field) for index, field in enumerate(self.last_modified_fields)}
+        values = queryset.order_by().aggregate(count=Count('pk'), **aggregates)
+        if not values['count']:
+            # Let the handler produce the empty page or the 404
+            return None, None
+        last_modified = max((value for key, value in values.items() if key != 'count' and value), default=None)
+        return f"{values['count']}:{last_modified}", last_modified
@@ -0,0 +1,139 @@
+import contextvars
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+PIN_KEY = 'db:pinned:{}'
+
+# Where the current request reads from: REPLICA, PRIMARY, or None outside
+# ReplicaMiddleware (commands, shell), which also means the primary
+_read_database = contextvars.ContextVar('read_database', default=None)
+
+
+def read_database():
+    return _read_database.get()
+
+
+def replica_configured():
+    """True when a replica distinct from the primary is configured"""
+    if REPLICA not in connections.settings:
+        return False
+    # The test runner's MIRROR points the replica at the primary's database
+    return connections[REPLICA].settings_dict['NAME'] != connections[PRIMARY].settings_dict['NAME']
+
+
+def pin_to_primary(user_id):
+    """Send the user's reads to the primary until the replica has caught up"""
+    cache.set(PIN_KEY.format(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user_id):
+    return cache.get(PIN_KEY.format(user_id)) is not None
+
+
+def request_user_id(request):
+    """
+    Id of the requesting user without a database query
+    Taken from a valid JWT access token, or from the session for the admin.
+    """
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header is not None:
+        try:
+            raw_token = authentication.get_raw_token(header)
+            if raw_token is None:
+                return None
+            return authentication.get_validated_token(raw_token).get(jwt_settings.USER_ID_CLAIM)
+        except AuthenticationFailed:
+            return None
+    if settings.SESSION_COOKIE_NAME in request.COOKIES and request.user.is_authenticated:
+        return request.user.pk
+    return None
+
+
+class ReplicaRouter:
+    """
+    Reads go where ReplicaMiddleware pointed the request, writes and
+    migrations to the primary
+    A write during a GET moves the rest of that request's reads to the primary.
+    """
+    def db_for_read(self, model, **hints):
+        return _read_database.get() or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        if _read_database.get() == REPLICA:
+            _read_database.set(PRIMARY)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReplicaMiddleware:
+    """
+    Route each request's reads: GET, HEAD and OPTIONS go to the replica,
+    everything else to the primary
+    - After a user writes (any other method, or a write during a GET) their
+      reads stay on the primary for REPLICA_PIN_SECONDS, so they always see
+      their own changes despite replication lag
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not replica_configured():
+            # No replica, or the test runner's MIRROR: keep test transactions visible
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        user_id, use_replica = self.route(request)
+        token = _read_database.set(REPLICA if use_replica else PRIMARY)
+        try:
+            response = self.get_response(request)
+            wrote = self.wrote(request, use_replica)
+        finally:
+            _read_database.reset(token)
+        if wrote and user_id is not None:
+            pin_to_primary(user_id)
+        return response
+
+    async def __acall__(self, request):
+        # Token checks and pins use the cache (and the session for the admin)
+        user_id, use_replica = await sync_to_async(self.route)(request)
+        token = _read_database.set(REPLICA if use_replica else PRIMARY)
+        try:
+            response = await self.get_response(request)
+            wrote = self.wrote(request, use_replica)
+        finally:
+            _read_database.reset(token)
+        if wrote and user_id is not None:
+            await sync_to_async(pin_to_primary)(user_id)
+        return response
+
+    def route(self, request):
+        """(user id or None, whether the request reads from the replica)"""
+        user_id = request_user_id(request)
+        use_replica = (request.method in SAFE_METHODS
+                       and not (user_id is not None and is_pinned(user_id)))
+        return user_id, use_replica
+
+    def wrote(self, request, use_replica):
+        return request.method not in SAFE_METHODS or (
+            use_replica and _read_database.get() == PRIMARY)
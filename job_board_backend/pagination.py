@@ -0,0 +1,166 @@
+import datetime
+import decimal
+import json
+import uuid
+from base64 import b64decode, b64encode
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import F, OrderBy, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a composite key
+    - Keyed on the queryset's ordering (e.g. -posted_on, -applied_on) plus the
+      primary key as a tiebreak, so every row has a unique position
+    - Each page is a single indexed range query (no OFFSET), so deep pages cost
+      the same as the first one and rows inserted meanwhile never shift a page
+    - Ordering fields must be non-nullable columns or annotations
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-pk',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset for async views; the page is fetched with the async ORM"""
+        queryset = self.page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([instance async for instance in queryset])
+
+    def page_queryset(self, queryset, request, view=None):
+        """The unevaluated query for the requested page plus one row, or None if unpaginated"""
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.position, self.reverse = self.decode_cursor(request)
+
+        ordering = self._flip(self.ordering) if self.reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self._after(ordering, self.position))
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, results):
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_previous, self.has_next = has_more, self.position is not None
+        else:
+            self.has_previous, self.has_next = self.position is not None, has_more
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Use the ordering already applied by the view or OrderingFilter, else the
+        model's default ordering; always finish with the primary key
+        """
+        ordering = queryset.query.order_by or queryset.query.get_meta().ordering or self.ordering
+        ordering = [self._field_name(term) for term in ordering]
+
+        pk_name = queryset.model._meta.pk.name
+        if not any(field.lstrip('-') in ('pk', pk_name) for field in ordering):
+            descending = ordering[-1].startswith('-')
+            ordering.append(f"-{pk_name}" if descending else pk_name)
+        return tuple(ordering)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            cursor = json.loads(b64decode(encoded.encode('ascii')).decode('utf-8'))
+            position, reverse = cursor['p'], bool(cursor.get('r', False))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def _link(self, instance, reverse):
+        position = [self._encode_value(self._value(instance, field)) for field in self.ordering]
+        cursor = {'p': position, 'r': True} if reverse else {'p': position}
+        encoded = b64encode(json.dumps(cursor, separators=(',', ':')).encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _after(self, ordering, position):
+        """
+        Rows strictly after the position in the given ordering:
+        (a > x) OR (a = x AND b > y) OR ...
+        A bound on the leading field keeps the lookup an index range scan.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+
+        first = ordering[0]
+        bound = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f"{first.lstrip('-')}__{bound}": position[0]}) & condition
+
+    @staticmethod
+    def _field_name(term):
+        """'field' or '-field' for an ordering term; only plain field references can key a cursor"""
+        if isinstance(term, str):
+            return term
+        if isinstance(term, F):
+            return term.name
+        if isinstance(term, OrderBy) and isinstance(term.expression, F):
+            return f"-{term.expression.name}" if term.descending else term.expression.name
+        raise ImproperlyConfigured(
+            f"KeysetPagination can't order by {term!r}; annotate the expression and order by its name.")
+
+    @staticmethod
+    def _flip(ordering):
+        return tuple(field[1:] if field.startswith('-') else f"-{field}" for field in ordering)
+
+    @staticmethod
+    def _value(instance, field):
+        value = instance
+        for attr in field.lstrip('-').split('__'):
+            value = getattr(value, attr)
+        return value
+
+    @staticmethod
+    def _encode_value(value):
+        # Full precision isoformat; DjangoJSONEncoder would drop microseconds
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, (uuid.UUID, decimal.Decimal)):
+            return str(value)
+        return value
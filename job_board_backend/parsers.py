@@ -0,0 +1,28 @@
+import codecs
+import io
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from .renderers import ORJSONRenderer, orjson
+
+
+class ORJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson when it is installed
+    - Bodies orjson rejects (invalid JSON, NaN with STRICT_JSON off, lone
+      surrogates) are parsed again by the stdlib parser, so results and
+      error messages stay the same
+    - Integers over 64 bits are read as floats, where the stdlib keeps ints
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != 'utf-8':
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
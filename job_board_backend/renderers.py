@@ -0,0 +1,39 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional; the stdlib renderer is used instead
+    orjson = None
+
+# JSON is a strict JavaScript subset only with these two escaped, as DRF does
+ESCAPES = (('\u2028'.encode(), b'\\u2028'), ('\u2029'.encode(), b'\\u2029'))
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed
+    - UUIDs, datetimes, dates and times are encoded natively; anything else
+      (Decimal, lazy strings, querysets, sets) goes through DRF's encoder
+    - Output matches the stdlib renderer byte for byte, except that floats
+      with an exponent are written in their shortest form (1e-7, not 1e-07)
+      and NaN is written as null
+    - Indented output (?format=api, "; indent=4"), ensure_ascii and anything
+      orjson refuses (e.g. integers over 64 bits) fall back to the stdlib renderer
+    """
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            # The stdlib renderer encodes it or raises its usual error
+            return super().render(data, accepted_media_type, renderer_context)
+        for raw, escaped in ESCAPES:
+            ret = ret.replace(raw, escaped)
+        return ret
@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 
 from pathlib import Path
 import os
+import tempfile
 from datetime import timedelta
 import dj_database_url
 from decouple import config, Csv
@@ -107,6 +108,77 @@ DATABASES = {
 
 DATABASES["default"] = dj_database_url.parse(config("DATABASE_URL"))
 
+# Optional read replica: GET/HEAD/OPTIONS requests read from it, and a user's
+# reads stay on the primary for REPLICA_PIN_SECONDS after they write
+REPLICA_DATABASE_URL = config('REPLICA_DATABASE_URL', default='')
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', default=10, cast=int)
+
+if REPLICA_DATABASE_URL:
+    DATABASES['replica'] = dj_database_url.parse(REPLICA_DATABASE_URL)
+    # Tests use a single database
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['job_board_backend.db_routers.ReplicaRouter']
+    MIDDLEWARE.append('job_board_backend.db_routers.ReplicaMiddleware')
+
+# Cache
+# Shared Redis cache when REDIS_URL is set, per-process memory otherwise
+
+REDIS_URL = config('REDIS_URL', default='')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Throttle counters live in Redis when REDIS_URL is set, else in this SQLite
+# file, which every worker of this project shares. Test runs use a fresh one.
+THROTTLE_DB_PATH = config('THROTTLE_DB_PATH', default=str(BASE_DIR / 'throttle.sqlite3'))
+
+TEST_RUNNER = 'job_board_backend.testing.JobBoardTestRunner'
+
+# Answer role checks from JWT claims instead of loading the user on every
+# request. Revocation (deactivation, role changes) reaches other workers
+# through the cache, so it is on by default only with Redis.
+JWT_CLAIMS_AUTHENTICATION = config('JWT_CLAIMS_AUTHENTICATION', default=bool(REDIS_URL), cast=bool)
+# Seconds a user's fields (not the password hash) are cached for it; dropped on save
+USER_CACHE_TIMEOUT = config('USER_CACHE_TIMEOUT', default=60, cast=int)
+
+# Refresh token blacklist checks go through a per-process Bloom filter and
+# only query the database on a possible match. Workers share recent
+# blacklistings through the cache, so it is on by default only with Redis.
+TOKEN_BLACKLIST_FILTER = config('TOKEN_BLACKLIST_FILTER', default=bool(REDIS_URL), cast=bool)
+TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS = config('TOKEN_BLACKLIST_FILTER_REBUILD_SECONDS', default=300, cast=int)
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = config('TOKEN_BLACKLIST_FILTER_ERROR_RATE', default=0.01, cast=float)
+
+# Email; e.g. EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend
+# with EMAIL_FILE_PATH writes messages to files instead of sending them
+EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = config('EMAIL_FILE_PATH', default=os.path.join(tempfile.gettempdir(), 'job_board_emails'))
+EMAIL_HOST = config('EMAIL_HOST', default='localhost')
+EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
+DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='Job Board <noreply@localhost>')
+
+# Notification digests: minutes a pending notification waits for others to
+# join its email, and digests sent per SMTP connection
+DIGEST_WINDOW_MINUTES = config('DIGEST_WINDOW_MINUTES', default=60, cast=int)
+DIGEST_BATCH_SIZE = config('DIGEST_BATCH_SIZE', default=100, cast=int)
+
+# Seconds a cached public job listing response is kept
+JOBS_LISTING_CACHE_TIMEOUT = config('JOBS_LISTING_CACHE_TIMEOUT', default=300, cast=int)
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -146,7 +218,9 @@ STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
 STORAGES = {
-    # ...
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
     "staticfiles": {
         "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
     },
@@ -167,20 +241,35 @@ AUTH_USER_MODEL = config('AUTH_USER_MODEL', default='accounts.User')
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication answering role checks from token claims, no User query
+        'accounts.authentication.ClaimsJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
         'rest_framework.filters.OrderingFilter',
     ],
+    # orjson-backed JSON (falls back to the stdlib when orjson isn't installed)
+    'DEFAULT_RENDERER_CLASSES': [
+        'job_board_backend.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'job_board_backend.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'job_board_backend.pagination.KeysetPagination',
+    'PAGE_SIZE': 20,
+    # Sliding-window counters shared by all workers (job_board_backend.throttling)
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle',
+        'job_board_backend.throttling.AnonRateThrottle',
+        'job_board_backend.throttling.UserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'anon': '30/hr',   # unauthenticated users
         'user': '60/hr',  # authenticated users
+        'bulk_jobs': '20/hr',  # POST /api/jobs/postjobs/bulk/, up to 500 jobs each
     }
 }
 
@@ -218,8 +307,8 @@ SIMPLE_JWT = {
     "SLIDING_TOKEN_LIFETIME": timedelta(minutes=5),
     "SLIDING_TOKEN_REFRESH_LIFETIME": timedelta(days=1),
 
-    "TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainPairSerializer",
-    "TOKEN_REFRESH_SERIALIZER": "rest_framework_simplejwt.serializers.TokenRefreshSerializer",
+    "TOKEN_OBTAIN_SERIALIZER": "accounts.serializers.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "accounts.serializers.RoleTokenRefreshSerializer",
     "TOKEN_VERIFY_SERIALIZER": "rest_framework_simplejwt.serializers.TokenVerifySerializer",
     "TOKEN_BLACKLIST_SERIALIZER": "rest_framework_simplejwt.serializers.TokenBlacklistSerializer",
     "SLIDING_TOKEN_OBTAIN_SERIALIZER": "rest_framework_simplejwt.serializers.TokenObtainSlidingSerializer",
@@ -0,0 +1,95 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+
+
+class SparseFieldsetMixin:
+    """
+    ?fields=a,b keeps only those fields, ?omit=a,b drops them (list and retrieve)
+    - The serializer drops the other fields
+    - The queryset selects only the columns the kept fields read, plus the
+      primary key and the ordering columns keyset pagination needs, and
+      skips prefetches of dropped relations
+    Without either parameter the queryset is still narrowed to the fields
+    the action's serializer renders.
+    """
+    fields_param = 'fields'
+    omit_param = 'omit'
+    sparse_actions = ('list', 'retrieve')
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        names = self.get_sparse_field_names()
+        if names is not None:
+            fields = getattr(serializer, 'child', serializer).fields
+            for name in list(fields):
+                if name not in names:
+                    fields.pop(name)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        names = self.get_sparse_field_names()
+        if names is None:
+            return queryset
+        return self.narrow_queryset(queryset, names)
+
+    def get_sparse_field_names(self):
+        """Serializer field names to render, or None outside sparse_actions"""
+        if self.action not in self.sparse_actions:
+            return None
+        if not hasattr(self, '_sparse_field_names'):
+            available = list(self.get_serializer_class()().fields)
+            names = self.parse_field_names(self.fields_param, available) or available
+            omitted = self.parse_field_names(self.omit_param, available)
+            self._sparse_field_names = [name for name in names if name not in omitted]
+        return self._sparse_field_names
+
+    def parse_field_names(self, param, available):
+        value = self.request.query_params.get(param, '')
+        names = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValidationError({param: [f"Unknown field(s): {', '.join(unknown)}."]})
+        return names
+
+    def narrow_queryset(self, queryset, names):
+        """only() the columns behind the kept fields; leaves the queryset alone if unsure"""
+        if queryset.query.select_related:
+            # only() can't defer a column select_related follows
+            return queryset
+        model = queryset.model
+        serializer_fields = self.get_serializer_class()().fields
+        columns = {model._meta.pk.name}
+        relations = set()
+        for name in names:
+            source = serializer_fields[name].source
+            if source == '*' or '.' in source:
+                return queryset
+            try:
+                field = model._meta.get_field(source)
+            except FieldDoesNotExist:
+                if hasattr(model, source):
+                    # Property or method; it may read any column
+                    return queryset
+                continue  # Annotation or attribute set by the view
+            if field.many_to_many or field.one_to_many:
+                relations.add(source)
+            elif field.concrete:
+                columns.add(field.name)
+
+        ordering = queryset.query.order_by or model._meta.ordering
+        for term in ordering:
+            name = str(term).lstrip('-')
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.concrete:
+                columns.add(field.name)
+
+        lookups = queryset._prefetch_related_lookups
+        kept = [lookup for lookup in lookups
+                if str(getattr(lookup, 'prefetch_to', lookup)).split('__')[0] in relations]
+        if len(kept) != len(lookups):
+            queryset = queryset.prefetch_related(None).prefetch_related(*kept)
+        return queryset.only(*columns)
@@ -0,0 +1,141 @@
+import datetime
+import itertools
+import os
+import tempfile
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.test.runner import DiscoverRunner
+from django.test.utils import CaptureQueriesContext
+from accounts.models import User
+from applications.models import ApplyJob
+from jobs.models import Industry, Location, Company, Job
+from .throttling import counters
+
+
+class JobBoardTestRunner(DiscoverRunner):
+    """
+    DiscoverRunner that counts throttle hits in a fresh SQLite file per run,
+    so tests neither see nor clear the counters of a running server
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.throttle_dir = tempfile.TemporaryDirectory()
+        settings.THROTTLE_DB_PATH = os.path.join(self.throttle_dir.name, 'throttle.sqlite3')
+        counters.cache_clear()
+
+    def teardown_test_environment(self, **kwargs):
+        super().teardown_test_environment(**kwargs)
+        counters.cache_clear()
+        self.throttle_dir.cleanup()
+
+
+# Maximum queries per list page; must not depend on the page size
+QUERY_BUDGETS = {
+    '/api/jobs/availablejobs/': 2,  # jobs + locations
+    '/api/jobs/postjobs/': 2,  # jobs + locations
+    '/api/jobs/companies/': 2,  # companies + locations
+    '/api/jobs/locations/': 1,
+    '/api/jobs/industries/': 1,
+    '/api/applications/my-applications-history/': 3,  # validators + applications + job locations
+    '/api/applications/job-applications-history/': 3,  # validators + applications + job locations
+    '/api/notifications/': 1,
+}
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin for list endpoint query budgets
+    assertQueryBudget requests a small page and a large page and fails when
+    - the large page runs more queries than the small one (an N+1), or
+    - either page runs more queries than the endpoint's QUERY_BUDGETS entry
+    """
+    small_page = 2
+    large_page = 10
+
+    def count_queries(self, url):
+        # Cached responses would hide queries
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {'page_size': self.large_page})
+        self.assertEqual(response.status_code, 200, getattr(response, 'data', response))
+        return len(context.captured_queries), context
+
+    def assertQueryBudget(self, url, create_row):
+        """create_row() must add one row that the endpoint lists"""
+        budget = QUERY_BUDGETS[url]
+        for _ in range(self.small_page):
+            create_row()
+        small, _ = self.count_queries(url)
+
+        for _ in range(self.large_page - self.small_page):
+            create_row()
+        large, context = self.count_queries(url)
+
+        queries = '\n'.join(query['sql'] for query in context.captured_queries)
+        self.assertEqual(
+            small, large,
+            f"{url} ran {small} queries for {self.small_page} rows but {large} "
+            f"for {self.large_page} rows:\n{queries}")
+        self.assertLessEqual(
+            large, budget,
+            f"{url} ran {large} queries, over its budget of {budget}:\n{queries}")
+
+
+class JobBoardTestMixin:
+    """
+    TestCase mixin with an employer, an applicant, and an industry, location and
+    company; the create_*() builders add more rows with unique names
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Listing responses are cached across requests
+        cache.clear()
+        self.counter = itertools.count()
+        self.employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='pass1234',
+            first_name='Em', last_name='Ployer', role='employer')
+        self.applicant = self.create_applicant()
+        self.industry = self.create_industry(name='Technology')
+        self.location = self.create_location()
+        self.company = self.create_company()
+
+    def create_applicant(self):
+        number = next(self.counter)
+        return User.objects.create_user(
+            username=f'seeker{number}', email=f'seeker{number}@example.com',
+            password='pass1234', first_name='Job', last_name='Seeker', role='job_seeker')
+
+    def create_industry(self, **fields):
+        fields = {'name': f'Industry {next(self.counter)}', 'description': 'Jobs', **fields}
+        return Industry.objects.create(**fields)
+
+    def create_location(self, **fields):
+        fields = {'country': 'Kenya', 'city': f'City {next(self.counter)}', 'region': 'Region', **fields}
+        return Location.objects.create(created_by=self.employer, **fields)
+
+    def create_company(self):
+        company = Company.objects.create(name=f'Company {next(self.counter)}', description='Ltd',
+                                         industry=self.industry, created_by=self.employer)
+        company.locations.set([self.location, self.create_location()])
+        return company
+
+    def create_job(self, locations=None, **fields):
+        fields = {
+            'title': f'Engineer {next(self.counter)}', 'company': self.company, 'industry': self.industry,
+            'description': 'Build APIs', 'requirements': 'Python', 'responsibilities': 'APIs',
+            'skills_required': 'Python', 'posted_by': self.employer,
+            'application_deadline': datetime.date.today() + datetime.timedelta(days=30),
+            **fields,
+        }
+        job = Job.objects.create(**fields)
+        job.location.set(locations or [self.location])
+        return job
+
+    def create_application(self, applicant=None, job=None):
+        return ApplyJob.objects.create(
+            job=job or self.create_job(), applicant=applicant or self.applicant, cover_letter='Hello',
+            resume='resume.pdf', expected_salary=50000,
+            availability_date=datetime.date.today())
@@ -0,0 +1,90 @@
+import asyncio
+import time
+from unittest import mock
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import User
+from .db_routers import PRIMARY, REPLICA, ReplicaMiddleware, ReplicaRouter, is_pinned, read_database
+
+
+class ReplicaRoutingTests(TestCase):
+    """Reads follow ReplicaMiddleware, writes go to the primary and pin the writer there"""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.user = User.objects.create_user(
+            username='employer', email='employer@example.com', password='pass1234',
+            first_name='Em', last_name='Ployer', role='employer')
+        self.seen = []
+
+    def middleware(self, write=False):
+        def get_response(request):
+            if write:
+                self.router.db_for_write(User)
+            self.seen.append(self.router.db_for_read(User))
+            return HttpResponse()
+
+        with mock.patch('job_board_backend.db_routers.replica_configured', return_value=True):
+            return ReplicaMiddleware(get_response)
+
+    def request(self, method='get', user=None, write=False):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(user)}'} if user else {}
+        self.middleware(write)(getattr(self.factory, method)('/api/jobs/availablejobs/', **headers))
+        return self.seen[-1]
+
+    def test_router_outside_requests(self):
+        self.assertIsNone(read_database())
+        self.assertEqual(self.router.db_for_read(User), PRIMARY)
+        self.assertEqual(self.router.db_for_write(User), PRIMARY)
+        self.assertTrue(self.router.allow_migrate(PRIMARY, 'jobs'))
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'jobs'))
+
+    def test_reads_and_writes(self):
+        self.assertEqual(self.request(), REPLICA)
+        self.assertEqual(self.request('head'), REPLICA)
+        self.assertEqual(self.request('post'), PRIMARY)
+        # A write during a GET moves the rest of the request to the primary
+        self.assertEqual(self.request(write=True), PRIMARY)
+        self.assertIsNone(read_database())
+
+    @override_settings(REPLICA_PIN_SECONDS=1)
+    def test_writers_are_pinned_to_the_primary(self):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass1234',
+            first_name='Ot', last_name='Her', role='employer')
+        self.assertEqual(self.request(user=self.user), REPLICA)
+        self.assertEqual(self.request('patch', user=self.user), PRIMARY)
+        self.assertTrue(is_pinned(self.user.pk))
+        self.assertEqual(self.request(user=self.user), PRIMARY)
+        self.assertEqual(self.request(user=other), REPLICA)
+        # Anonymous writes can't be pinned
+        self.assertEqual(self.request('post'), PRIMARY)
+        self.assertEqual(self.request(), REPLICA)
+
+        time.sleep(1.1)
+        self.assertEqual(self.request(user=self.user), REPLICA)
+
+    def test_write_during_get_pins(self):
+        self.request(user=self.user, write=True)
+        self.assertTrue(is_pinned(self.user.pk))
+
+    def test_async_requests(self):
+        async def get_response(request):
+            self.seen.append(read_database())
+            return HttpResponse()
+
+        with mock.patch('job_board_backend.db_routers.replica_configured', return_value=True):
+            middleware = ReplicaMiddleware(get_response)
+        asyncio.run(middleware(self.factory.get('/api/async/jobs/')))
+        asyncio.run(middleware(self.factory.post('/api/async/jobs/')))
+        self.assertEqual(self.seen, [REPLICA, PRIMARY])
+
+    def test_unused_without_a_replica(self):
+        # The test settings configure no replica
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaMiddleware(lambda request: HttpResponse())
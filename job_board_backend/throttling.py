@@ -0,0 +1,140 @@
+import functools
+import random
+import sqlite3
+import threading
+import time
+from django.conf import settings
+from rest_framework import throttling
+
+KEY_PREFIX = 'throttle:'
+# Share of SQLite hits that also delete expired counters
+PURGE_PROBABILITY = 0.01
+
+
+class RedisCounters:
+    """Counters in Redis; a hit is INCR + EXPIRE + GET in one MULTI round trip"""
+
+    def __init__(self, url):
+        import redis
+        self.client = redis.Redis.from_url(url)
+
+    def hit(self, key, previous_key, timeout):
+        """Count a hit; (current window count, previous window count)"""
+        pipeline = self.client.pipeline()
+        pipeline.incr(key)
+        pipeline.expire(key, timeout)
+        pipeline.get(previous_key)
+        current, _, previous = pipeline.execute()
+        return current, int(previous or 0)
+
+    def undo(self, key):
+        self.client.decr(key)
+
+    def clear(self):
+        for key in self.client.scan_iter(match=f"{KEY_PREFIX}*"):
+            self.client.delete(key)
+
+
+class SQLiteCounters:
+    """
+    Counters in a local SQLite file, for deployments without Redis
+    Shared by every worker on the host (but not across hosts); a hit is one
+    atomic upsert plus a primary key lookup.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.local = threading.local()
+
+    @property
+    def connection(self):
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('CREATE TABLE IF NOT EXISTS counters ('
+                               'key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires REAL NOT NULL)')
+            self.local.connection = connection
+        return connection
+
+    def hit(self, key, previous_key, timeout):
+        now = time.time()
+        (current,) = self.connection.execute(
+            'INSERT INTO counters VALUES (?, 1, ?) '
+            'ON CONFLICT (key) DO UPDATE SET count = count + 1 RETURNING count',
+            (key, now + timeout)).fetchone()
+        row = self.connection.execute(
+            'SELECT count FROM counters WHERE key = ? AND expires > ?', (previous_key, now)).fetchone()
+        if random.random() < PURGE_PROBABILITY:
+            self.connection.execute('DELETE FROM counters WHERE expires <= ?', (now,))
+        return current, row[0] if row else 0
+
+    def undo(self, key):
+        self.connection.execute('UPDATE counters SET count = count - 1 WHERE key = ?', (key,))
+
+    def clear(self):
+        self.connection.execute('DELETE FROM counters')
+
+
+@functools.cache
+def counters():
+    """The shared counter store: Redis when REDIS_URL is set, else THROTTLE_DB_PATH"""
+    if settings.REDIS_URL:
+        return RedisCounters(settings.REDIS_URL)
+    return SQLiteCounters(settings.THROTTLE_DB_PATH)
+
+
+class SlidingWindowThrottle(throttling.SimpleRateThrottle):
+    """
+    SimpleRateThrottle on a sliding window of two fixed-window counters
+    - A request is one atomic increment of the current window's counter plus a
+      read of the previous one, in a store every worker shares, instead of
+      rewriting a list of timestamps in the (per-process) default cache
+    - Requests over the last period are estimated as
+      previous count * share of the previous window still in the period + current count
+    - Rejected requests are taken off the counter again, so retries while
+      throttled don't extend the wait
+    """
+    cache_format = KEY_PREFIX + '%(scope)s:%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, offset = divmod(self.now, self.duration)
+        self.elapsed = offset / self.duration
+        # The duration keeps throttles of one scope with different rates apart
+        key = f"{self.key}:{self.duration}:{int(window)}"
+        previous_key = f"{self.key}:{self.duration}:{int(window) - 1}"
+        self.current, self.previous = counters().hit(key, previous_key, self.duration * 2)
+
+        if self.previous * (1 - self.elapsed) + self.current > self.num_requests:
+            counters().undo(key)
+            self.current -= 1
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until one more request fits, if no others arrive meanwhile"""
+        if self.current < self.num_requests and self.previous:
+            # Fits in this window once enough of the previous one slides out
+            needed = 1 - (self.num_requests - self.current - 1) / self.previous
+            return max(needed - self.elapsed, 0) * self.duration
+        # Wait for the next window, where this window's count slides out
+        needed = 1 - (self.num_requests - 1) / max(self.current, 1)
+        return (1 - self.elapsed + max(needed, 0)) * self.duration
+
+
+class AnonRateThrottle(SlidingWindowThrottle, throttling.AnonRateThrottle):
+    """DRF's AnonRateThrottle (scope 'anon', keyed on the client IP) on shared counters"""
+
+
+class UserRateThrottle(SlidingWindowThrottle, throttling.UserRateThrottle):
+    """DRF's UserRateThrottle (scope 'user', keyed on the user id) on shared counters"""
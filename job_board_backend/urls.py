@@ -40,7 +40,8 @@ urlpatterns = [
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('api/jobs/', include('jobs.urls')),
     path('api/applications/', include('applications.urls')),
-    # path('notifications/', include('notifications.urls')),
+    path('api/async/', include('job_board_backend.async_urls')),
+    path('api/notifications/', include('notifications.urls')),
 
     # Swagger urls
     path('api/docs/.<format>/', schema_view.without_ui(cache_timeout=0), name='schema-json'),
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Industry, Location, Company, Job
+from .models import Industry, Location, Company, Job, Skill, SkillAlias
 
 class IndustryAdmin(admin.ModelAdmin):
     list_display = ['name', 'description', 'is_active', 'created_at', 'updated_at']
@@ -11,8 +11,21 @@ admin.site.register(Location, LocationAdmin)
 
 class CompanyAdmin(admin.ModelAdmin):
     list_display = ['name','industry',  'is_verified', 'website_url', 'created_at']
+    list_select_related = ['industry']
 admin.site.register(Company, CompanyAdmin)
 
 class JobAdmin(admin.ModelAdmin):
     list_display = ['title', 'job_type', 'is_active', 'posted_on']
-admin.site.register(Job, JobAdmin)
\ No newline at end of file
+    # Job.__str__ reads company.name, which action confirmations render per row
+    list_select_related = ['company']
+admin.site.register(Job, JobAdmin)
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+
+class SkillAdmin(admin.ModelAdmin):
+    list_display = ['name', 'normalized_name', 'created_at']
+    search_fields = ['name', 'normalized_name', 'aliases__alias']
+    inlines = [SkillAliasInline]
+admin.site.register(Skill, SkillAdmin)
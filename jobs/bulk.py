@@ -0,0 +1,50 @@
+from django.db import IntegrityError, transaction
+from .cache import bump_generation_on_commit
+from .models import Job
+from .search import update_search_vectors
+from .skills import index_new_job_skills
+from .slugs import assign_unique_slugs
+
+# Most jobs accepted by one POST /api/jobs/postjobs/bulk/ request
+MAX_BULK_JOBS = 500
+BATCH_SIZE = 500
+
+
+def insert_jobs(jobs, location_ids, batch_size=BATCH_SIZE):
+    """
+    bulk_create unsaved jobs and everything post_save would have done for them
+    - jobs need company, industry and posted_by set
+    - location_ids maps job.pk to the location ids to link
+    Run inside a transaction.
+    """
+    Job.objects.bulk_create(jobs, batch_size=batch_size)
+    links = Job.location.through
+    links.objects.bulk_create(
+        [links(job_id=job.pk, location_id=location_id)
+         for job in jobs for location_id in location_ids.get(job.pk, ())],
+        batch_size=batch_size,
+    )
+    index_new_job_skills(jobs)
+    update_search_vectors(Job.objects.filter(pk__in=[job.pk for job in jobs]))
+    # bulk_create skips post_save, so invalidate cached listings here
+    bump_generation_on_commit()
+    return jobs
+
+
+def create_jobs(jobs, location_ids, batch_size=BATCH_SIZE, attempts=3):
+    """
+    Insert jobs in one transaction, giving each job without a slug a unique one
+    A concurrent insert taking one of the slugs rolls the batch back and it
+    is retried with fresh slugs, like UniqueSlugMixin.save.
+    """
+    unslugged = [job for job in jobs if not job.slug]
+    for attempt in range(attempts):
+        assign_unique_slugs(Job, unslugged, Job.get_slug_text)
+        try:
+            with transaction.atomic():
+                return insert_jobs(jobs, location_ids, batch_size)
+        except IntegrityError:
+            for job in unslugged:
+                job.slug = ''
+            if attempt == attempts - 1:
+                raise
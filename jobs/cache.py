@@ -0,0 +1,163 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.response import Response
+from job_board_backend.conditional import ConditionalGetMixin
+from job_board_backend.db_routers import PRIMARY, REPLICA, read_database
+
+# Every cached listing key embeds the current generation; bumping it orphans
+# all previously cached responses at once
+GENERATION_KEY = 'jobs:listings:generation'
+CHANGED_AT_KEY = 'jobs:listings:changed_at'
+HITS_KEY = 'jobs:listings:hits'
+MISSES_KEY = 'jobs:listings:misses'
+
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Start from the clock so a lost counter never reuses old generations
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+    cache.set(CHANGED_AT_KEY, time.time(), timeout=settings.REPLICA_PIN_SECONDS)
+
+
+def replica_may_lag():
+    """True while the last listing change may not have reached the read replica"""
+    return read_database() is not None and cache.get(CHANGED_AT_KEY) is not None
+
+
+def bump_generation_on_commit():
+    """Invalidate once the change is visible to other connections"""
+    transaction.on_commit(bump_generation)
+
+
+def normalised_query(request):
+    """Query string with sorted keys and values and without empty parameters"""
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values if value != ''
+    )
+    return urlencode(params)
+
+
+def listing_cache_key(prefix, request, generation=None):
+    generation = get_generation() if generation is None else generation
+    raw = f"{request.path}?{normalised_query(request)}"
+    digest = hashlib.md5(raw.encode('utf-8')).hexdigest()
+    return f"jobs:listings:{prefix}:{generation}:{digest}"
+
+
+def record(hit):
+    key = HITS_KEY if hit else MISSES_KEY
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_stats():
+    stats = cache.get_many([HITS_KEY, MISSES_KEY])
+    return {'hits': stats.get(HITS_KEY, 0), 'misses': stats.get(MISSES_KEY, 0)}
+
+
+class CachedListingMixin:
+    """
+    Cache list/retrieve responses of public job listings
+    - Keyed on the path, the normalised query string and the listing generation
+    - jobs.signals bumps the generation whenever a Job, Company, Location or
+      Industry changes, so stale entries are never served
+    - Responses don't depend on the user, so one entry serves every client
+    - X-Cache and X-Cache-Stats headers report the outcome and running totals
+    """
+    cached_actions = ('list', 'retrieve')
+    cache_timeout = getattr(settings, 'JOBS_LISTING_CACHE_TIMEOUT', 300)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        key, lagging, hit = self.cache_lookup(request)
+        if hit is not None:
+            return hit
+        return self.cache_miss(key, lagging, handler(request, *args, **kwargs))
+
+    async def acached_response(self, handler, request, *args, **kwargs):
+        """cached_response for an async handler; cache calls run in a worker thread"""
+        key, lagging, hit = await sync_to_async(self.cache_lookup)(request)
+        if hit is not None:
+            return hit
+        response = await handler(request, *args, **kwargs)
+        return await sync_to_async(self.cache_miss)(key, lagging, response)
+
+    def cache_lookup(self, request):
+        """(key, lagging, cached response or None)"""
+        key = listing_cache_key(self.action, request)
+        lagging = replica_may_lag()
+        # Users pinned to the primary after a write skip entries the replica may have staled
+        data = None if lagging and read_database() == PRIMARY else cache.get(key)
+        if data is None:
+            return key, lagging, None
+        record(hit=True)
+        response = Response(data)
+        self.add_cache_headers(response, 'HIT')
+        return key, lagging, response
+
+    def cache_miss(self, key, lagging, response):
+        record(hit=False)
+        if response.status_code == 200:
+            # Replica reads right after a change expire once the replica caught up
+            timeout = settings.REPLICA_PIN_SECONDS if lagging and read_database() == REPLICA else self.cache_timeout
+            cache.set(key, response.data, timeout)
+        self.add_cache_headers(response, 'MISS')
+        return response
+
+    def add_cache_headers(self, response, outcome):
+        stats = get_stats()
+        response['X-Cache'] = outcome
+        response['X-Cache-Stats'] = f"hits={stats['hits']}; misses={stats['misses']}"
+
+
+class GenerationConditionalMixin(ConditionalGetMixin):
+    """
+    Conditional GET validated by the listing generation instead of a query
+    Every Job, Company, Location and Industry change bumps the generation,
+    and the date covers jobs whose deadline passed, so a 304 costs one cache read.
+    No ETag is sent for replica reads the last change may not have reached.
+    """
+    def get_validators(self, request, *args, **kwargs):
+        if read_database() == REPLICA and replica_may_lag():
+            return None, None
+        return f"{get_generation()}:{timezone.localdate()}", None
+
+
+class GenerationETagMixin(ConditionalGetMixin):
+    """
+    Query validators for rows that render job, company or location fields
+    Locations carry no timestamp, so the ETag also covers the listing
+    generation, which every change to them bumps. No Last-Modified is sent,
+    since it could not reflect those changes.
+    """
+    def get_validators(self, request, *args, **kwargs):
+        etag, last_modified = super().get_validators(request, *args, **kwargs)
+        if etag is None or (read_database() == REPLICA and replica_may_lag()):
+            return None, None
+        return f"{etag}:{get_generation()}", None
@@ -0,0 +1,100 @@
+from collections import Counter
+from django.db.models import Case, Count, Exists, OuterRef, Value, When, CharField
+from django.db.models.functions import Coalesce
+from .models import Job
+
+# (key, label, lower bound inclusive, upper bound exclusive) on salary_min,
+# or salary_max when no minimum is given
+SALARY_BUCKETS = [
+    ('under_50k', 'Under 50,000', None, 50000),
+    ('50k_100k', '50,000 - 100,000', 50000, 100000),
+    ('100k_200k', '100,000 - 200,000', 100000, 200000),
+    ('200k_plus', '200,000+', 200000, None),
+]
+NOT_SPECIFIED = ('not_specified', 'Not specified')
+
+
+def salary_bucket():
+    whens = []
+    for key, _, low, high in SALARY_BUCKETS:
+        bounds = {}
+        if low is not None:
+            bounds['salary_ref__gte'] = low
+        if high is not None:
+            bounds['salary_ref__lt'] = high
+        whens.append(When(then=Value(key), **bounds))
+    return Case(*whens, default=Value(NOT_SPECIFIED[0]), output_field=CharField())
+
+
+def has_remote_location():
+    return Exists(
+        Job.location.through.objects.filter(job_id=OuterRef('pk'), location__is_remote=True)
+    )
+
+
+def compute_facets(queryset):
+    """
+    Facet counts for the jobs matched by queryset
+    A single GROUP BY over every facet dimension returns the populated cells;
+    each facet is then rolled up from those cells in Python, so the database
+    scans the matching jobs once instead of once per facet.
+    """
+    return roll_up_facets(facet_cells(queryset))
+
+
+async def acompute_facets(queryset):
+    """compute_facets with the cells fetched through the async ORM"""
+    return roll_up_facets([cell async for cell in facet_cells(queryset)])
+
+
+def facet_cells(queryset):
+    # Re-select by primary key so joins used by the filters can't duplicate rows
+    jobs = Job.objects.filter(pk__in=queryset.order_by().values('pk'))
+    return (
+        jobs
+        .annotate(salary_ref=Coalesce('salary_min', 'salary_max'))
+        .annotate(remote=has_remote_location(), salary_bucket=salary_bucket())
+        .values('industry__slug', 'industry__name', 'job_type',
+                'experience_level', 'remote', 'salary_bucket')
+        .annotate(count=Count('pk'))
+        .order_by()
+    )
+
+
+def roll_up_facets(cells):
+    total = 0
+    industries = Counter()
+    industry_names = {}
+    job_types = Counter()
+    experience_levels = Counter()
+    remote = Counter()
+    salaries = Counter()
+    for cell in cells:
+        count = cell['count']
+        total += count
+        industries[cell['industry__slug']] += count
+        industry_names[cell['industry__slug']] = cell['industry__name']
+        job_types[cell['job_type']] += count
+        experience_levels[cell['experience_level']] += count
+        remote[bool(cell['remote'])] += count
+        salaries[cell['salary_bucket']] += count
+
+    salary_labels = [(key, label) for key, label, _, _ in SALARY_BUCKETS] + [NOT_SPECIFIED]
+    return {
+        'total': total,
+        'industry': sorted(
+            ({'value': slug, 'label': industry_names[slug], 'count': count}
+             for slug, count in industries.items()),
+            key=lambda item: (-item['count'], item['label']),
+        ),
+        'job_type': _choice_counts(Job.job_type_choices, job_types),
+        'experience_level': _choice_counts(Job.experience_level_choices, experience_levels),
+        'is_remote': _choice_counts([(True, 'Remote'), (False, 'On-site')], remote),
+        'salary': _choice_counts(salary_labels, salaries),
+    }
+
+
+def _choice_counts(choices, counts):
+    """Every choice in declaration order, including the empty ones"""
+    return [{'value': value, 'label': label, 'count': counts.get(value, 0)}
+            for value, label in choices]
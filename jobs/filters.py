@@ -0,0 +1,179 @@
+import django_filters
+from django.db.models import Count, OuterRef, Subquery
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+from .geo import bounding_box_q, distance_km
+from .models import Job, JobSkill
+from .search import is_full_text_supported, search_jobs
+from .skills import lookup_skill_ids
+
+
+class JobFilterSet(django_filters.FilterSet):
+    """
+    Structured filters for job listings, e.g.
+    ?experience_level=senior&job_type=full_time&location__is_remote=true
+    &industry__slug=technology&application_deadline__gte=2025-12-01
+    - exact and comma-separated __in on job_type, experience_level,
+      industry__slug and company__slug
+    - ranges on salary_min, salary_max and application_deadline
+    Each combination is served by an index on jobs_job (see Job.Meta.indexes).
+    """
+    location__is_remote = django_filters.BooleanFilter(method='filter_is_remote')
+
+    class Meta:
+        model = Job
+        fields = {
+            'job_type': ['exact', 'in'],
+            'experience_level': ['exact', 'in'],
+            'industry__slug': ['exact', 'in'],
+            'company__slug': ['exact', 'in'],
+            'salary_min': ['gte', 'lte'],
+            'salary_max': ['gte', 'lte'],
+            'application_deadline': ['gte', 'lte'],
+        }
+
+    def filter_is_remote(self, queryset, name, value):
+        # IN instead of a join so jobs with several locations appear once.
+        # is_remote__in renders "is_remote IN (true)" rather than a bare column,
+        # which lets SQLite drive the subquery from the Location.is_remote index too.
+        remote_jobs = Job.location.through.objects.filter(
+            location__is_remote__in=[True]
+        ).values('job_id')
+        return queryset.filter(pk__in=remote_jobs) if value else queryset.exclude(pk__in=remote_jobs)
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    Ranked keyword search through ?q=
+    - PostgreSQL: matches the stored search_vector (GIN indexed) and orders by rank
+    - Other databases: same behaviour as ?search= over the view's search_fields
+    """
+    search_param = 'q'
+    search_description = 'Full-text search over title, skills, description, industry and locations.'
+
+    def filter_queryset(self, request, queryset, view):
+        if not is_full_text_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        terms = request.query_params.get(self.search_param, '').replace('\x00', '').strip()
+        if not terms:
+            return queryset
+        return search_jobs(queryset, terms)
+
+
+class SkillFilter(BaseFilterBackend):
+    """
+    ?skills=python,django filter backed by the JobSkill (skill, job) index
+    - ?skills_match=any (default): jobs requiring at least one of the skills
+    - ?skills_match=all: jobs requiring every listed skill
+    Names are normalized and aliases resolved the same way as job skills.
+    """
+    skills_param = 'skills'
+    match_param = 'skills_match'
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.skills_param, '')
+        if not text.strip():
+            return queryset
+
+        skill_ids, unknown = lookup_skill_ids(text)
+        match_all = request.query_params.get(self.match_param, 'any').lower() == 'all'
+        if not skill_ids or (match_all and unknown):
+            # Unknown skills can't match anything
+            return queryset.none()
+
+        matches = JobSkill.objects.filter(skill_id__in=skill_ids)
+        if match_all:
+            matches = (matches.values('job_id')
+                       .annotate(matched=Count('skill_id'))
+                       .filter(matched=len(skill_ids)))
+        return queryset.filter(pk__in=matches.values('job_id'))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.skills_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Comma-separated skills, e.g. python,django',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.match_param,
+                'required': False,
+                'in': 'query',
+                'description': 'any (default) or all',
+                'schema': {'type': 'string', 'enum': ['any', 'all']},
+            },
+        ]
+
+
+class ProximityFilter(BaseFilterBackend):
+    """
+    ?near=-1.2864,36.8172&radius_km=25 keeps jobs with a location within the radius
+    - Locations are first pruned to the bounding box through the
+      (latitude, longitude) index; the exact haversine distance is only
+      computed for the jobs linked to them
+    - Adds distance_km (nearest matching location) and, unless ?ordering=
+      is given, sorts nearest first
+    Works on PostgreSQL and SQLite without PostGIS.
+    """
+    near_param = 'near'
+    radius_param = 'radius_km'
+    default_radius_km = 25
+    max_radius_km = 1000
+
+    def filter_queryset(self, request, queryset, view):
+        near = request.query_params.get(self.near_param, '').strip()
+        if not near:
+            return queryset
+        latitude, longitude, radius = self.parse(near, request.query_params.get(self.radius_param))
+
+        links = Job.location.through.objects.filter(
+            bounding_box_q(latitude, longitude, radius, prefix='location__'))
+        nearest = (
+            links.filter(job_id=OuterRef('pk'))
+            .annotate(distance=distance_km(latitude, longitude, prefix='location__'))
+            .filter(distance__lte=radius)
+            .order_by('distance')
+            .values('distance')[:1]
+        )
+        queryset = (queryset.filter(pk__in=links.values('job_id'))
+                    .annotate(distance_km=Subquery(nearest))
+                    .filter(distance_km__isnull=False))
+        if not request.query_params.get('ordering'):
+            queryset = queryset.order_by('distance_km', '-posted_on')
+        return queryset
+
+    def parse(self, near, radius):
+        try:
+            latitude, longitude = (float(part) for part in near.split(','))
+        except ValueError:
+            raise ValidationError({self.near_param: ["Expected latitude,longitude."]})
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            raise ValidationError({self.near_param: ["Latitude or longitude out of range."]})
+        try:
+            radius = float(radius) if radius else self.default_radius_km
+        except ValueError:
+            raise ValidationError({self.radius_param: ["A number is required."]})
+        if not 0 < radius <= self.max_radius_km:
+            raise ValidationError({self.radius_param: [f"Must be between 0 and {self.max_radius_km}."]})
+        return latitude, longitude, radius
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.near_param,
+                'required': False,
+                'in': 'query',
+                'description': 'latitude,longitude, e.g. -1.2864,36.8172',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.radius_param,
+                'required': False,
+                'in': 'query',
+                'description': f'Search radius in km (default {self.default_radius_km})',
+                'schema': {'type': 'number'},
+            },
+        ]
@@ -0,0 +1,53 @@
+import math
+from django.db.models import F, Q, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = 111.195
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Latitude range and longitude ranges enclosing the circle around a point
+    Two longitude ranges are returned when the box crosses the antimeridian,
+    and the full range when it reaches a pole.
+    """
+    delta_latitude = radius_km / KM_PER_DEGREE_LATITUDE
+    min_latitude, max_latitude = latitude - delta_latitude, latitude + delta_latitude
+    if min_latitude <= -90 or max_latitude >= 90:
+        return max(min_latitude, -90), min(max_latitude, 90), [(-180, 180)]
+
+    delta_longitude = delta_latitude / math.cos(math.radians(latitude))
+    if delta_longitude >= 180:
+        return min_latitude, max_latitude, [(-180, 180)]
+    west, east = longitude - delta_longitude, longitude + delta_longitude
+    if west < -180:
+        ranges = [(west + 360, 180), (-180, east)]
+    elif east > 180:
+        ranges = [(west, 180), (-180, east - 360)]
+    else:
+        ranges = [(west, east)]
+    return min_latitude, max_latitude, ranges
+
+
+def bounding_box_q(latitude, longitude, radius_km, prefix=''):
+    """Q over the (latitude, longitude) index selecting the bounding box"""
+    min_latitude, max_latitude, ranges = bounding_box(latitude, longitude, radius_km)
+    longitudes = Q()
+    for west, east in ranges:
+        longitudes |= Q(**{f"{prefix}longitude__gte": west, f"{prefix}longitude__lte": east})
+    return Q(**{f"{prefix}latitude__gte": min_latitude, f"{prefix}latitude__lte": max_latitude}) & longitudes
+
+
+def distance_km(latitude, longitude, prefix=''):
+    """
+    Great-circle (haversine) distance in km from a point, as a database
+    expression; uses only functions PostgreSQL and SQLite both provide
+    """
+    row_latitude = Radians(F(f"{prefix}latitude"))
+    half_delta_latitude = (row_latitude - Value(math.radians(latitude))) / 2
+    half_delta_longitude = (Radians(F(f"{prefix}longitude")) - Value(math.radians(longitude))) / 2
+    a = (Power(Sin(half_delta_latitude), 2)
+         + Value(math.cos(math.radians(latitude))) * Cos(row_latitude) * Power(Sin(half_delta_longitude), 2))
+    # Least guards ASIN against rounding just above 1 for antipodal points
+    return 2 * EARTH_RADIUS_KM * ASin(Least(Sqrt(a), Value(1.0)))
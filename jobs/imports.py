@@ -0,0 +1,208 @@
+import csv
+import json
+from django.db import transaction
+from .bulk import create_jobs, BATCH_SIZE
+from .models import Company, Industry, Job, Location
+from .serializers import BulkPostJobSerializer, CompanySerializer, IndustrySerializer, LocationSerializer
+
+# Columns handed to PostJobSerializer as they are
+JOB_FIELDS = ('title', 'job_type', 'experience_level', 'description', 'requirements',
+              'responsibilities', 'skills_required', 'salary_min', 'salary_max',
+              'salary_currency', 'is_salary_visible', 'is_active', 'application_deadline')
+REMOTE_SUFFIX = ' - Remote'
+
+
+class ImportRowError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+def read_rows(path, file_format=None):
+    """Yield rows of a CSV or JSONL file one at a time; unparsable JSON lines yield None"""
+    if file_format is None:
+        file_format = 'jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv'
+    with open(path, newline='', encoding='utf-8-sig') as handle:
+        if file_format == 'csv':
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield row if isinstance(row, dict) else None
+
+
+def parse_locations(value):
+    """
+    Locations of a row as LocationSerializer data
+    CSV cells hold "Country, City, Region" entries separated by ";" (the
+    format Location.__str__ prints, " - Remote" included); JSONL rows may
+    also give a list of those strings or of location objects.
+    """
+    if not value:
+        return []
+    entries = value.split(';') if isinstance(value, str) else value
+    locations = []
+    for entry in entries:
+        if isinstance(entry, dict):
+            locations.append(entry)
+            continue
+        entry = entry.strip()
+        is_remote = entry.endswith(REMOTE_SUFFIX)
+        if is_remote:
+            entry = entry[:-len(REMOTE_SUFFIX)]
+        parts = [part.strip() for part in entry.split(',')]
+        if entry:
+            country, city, region = (parts + ['', ''])[:3]
+            locations.append({'country': country, 'city': city, 'region': region, 'is_remote': is_remote})
+    return locations
+
+
+class JobImporter:
+    """
+    Imports job rows in batches
+    - Industries, the owner's locations and companies seen so far are kept in
+      lookup maps, so each batch looks up only company names it hasn't seen;
+      rows only ever use companies the owner created
+    - Each batch, including the industries, companies and locations it
+      creates, is one transaction
+    - Missing industries, companies and locations are created through their
+      serializers; jobs go through BulkPostJobSerializer and jobs.bulk, so they
+      end up like jobs posted through the API (industry and locations
+      copied from the company)
+    - Invalid rows are collected in errors and skipped
+    """
+    def __init__(self, owner, batch_size=BATCH_SIZE):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.errors = []  # (row number, errors)
+        self.load_lookups()
+
+    def load_lookups(self):
+        self.industries = {industry.name.lower(): industry for industry in Industry.objects.all()}
+        self.locations = {
+            self.location_key(location): location.pk
+            for location in Location.objects.filter(created_by=self.owner)
+        }
+        self.companies = {}  # name -> the owner's Company
+        self.company_locations = {}  # company id -> {location ids}
+        self.new_links = []  # (company id, location id) to insert with the batch
+
+    @staticmethod
+    def location_key(location):
+        if isinstance(location, Location):
+            location = vars(location)
+        return tuple(str(location.get(field, '')).strip().lower()
+                     for field in ('country', 'city', 'region', 'is_remote'))
+
+    def import_batch(self, rows, before_commit=None):
+        """
+        Import [(row number, row)] in one transaction; returns the number of jobs created
+        before_commit(jobs) runs inside the transaction once the batch is
+        built, e.g. to record which batch is about to commit.
+        """
+        try:
+            with transaction.atomic():
+                self.load_companies({str(row.get('company') or '').strip() for _, row in rows if row})
+                self.new_links = []
+                jobs = []
+                errors = []
+                for number, row in rows:
+                    try:
+                        jobs.append(self.build_job(row))
+                    except ImportRowError as error:
+                        errors.append((number, error.errors))
+
+                if before_commit is not None:
+                    before_commit(jobs)
+                links = Company.locations.through
+                links.objects.bulk_create(
+                    [links(company_id=company_id, location_id=location_id)
+                     for company_id, location_id in self.new_links],
+                    ignore_conflicts=True,
+                )
+                if jobs:
+                    create_jobs(jobs, {job.pk: sorted(self.company_locations[job.company_id], key=str)
+                                       for job in jobs}, self.batch_size)
+        except Exception:
+            # The lookup maps may hold rows that were rolled back
+            self.load_lookups()
+            raise
+        self.errors.extend(errors)
+        return len(jobs)
+
+    def load_companies(self, names):
+        missing = {name for name in names if name and name not in self.companies}
+        if not missing:
+            return
+        # Only the owner's companies, as in PostJobViewset.bulk_companies
+        found = Company.objects.filter(name__in=missing, created_by=self.owner).in_bulk()
+        for company in found.values():
+            self.companies[company.name] = company
+            self.company_locations[company.pk] = set()
+        for company_id, location_id in Company.locations.through.objects.filter(
+                company_id__in=found).values_list('company_id', 'location_id'):
+            self.company_locations[company_id].add(location_id)
+
+    def build_job(self, row):
+        if row is None:
+            raise ImportRowError({'non_field_errors': ["Row is not a JSON object."]})
+        company = self.resolve_company(row)
+        data = {field: row[field] for field in JOB_FIELDS if row.get(field) not in (None, '')}
+        data['company'] = company.pk
+        serializer = BulkPostJobSerializer(data=data, context={'companies': {company.pk: company}})
+        if not serializer.is_valid():
+            raise ImportRowError(serializer.errors)
+        return Job(**serializer.validated_data, posted_by=self.owner, industry_id=company.industry_id)
+
+    def resolve_company(self, row):
+        location_ids = [self.resolve_location(location) for location in parse_locations(row.get('locations'))]
+        name = str(row.get('company') or '').strip()
+        company = self.companies.get(name)
+        if company is None:
+            serializer = CompanySerializer(data={
+                'name': name,
+                'description': row.get('company_description') or name,
+                'website_url': row.get('company_website') or None,
+                'industry': self.resolve_industry(row).pk,
+                'locations': location_ids,
+            })
+            if not serializer.is_valid():
+                raise ImportRowError({'company': serializer.errors})
+            company = serializer.save(created_by=self.owner)
+            self.companies[company.name] = company
+            self.company_locations[company.pk] = set(location_ids)
+            return company
+
+        linked = self.company_locations[company.pk]
+        for location_id in location_ids:
+            if location_id not in linked:
+                linked.add(location_id)
+                self.new_links.append((company.pk, location_id))
+        return company
+
+    def resolve_industry(self, row):
+        name = str(row.get('industry') or '').strip()
+        industry = self.industries.get(name.lower())
+        if industry is None:
+            serializer = IndustrySerializer(data={
+                'name': name, 'description': row.get('industry_description') or name,
+            })
+            if not serializer.is_valid():
+                raise ImportRowError({'industry': serializer.errors})
+            industry = serializer.save()
+            self.industries[name.lower()] = industry
+        return industry
+
+    def resolve_location(self, location):
+        serializer = LocationSerializer(data=location)
+        if not serializer.is_valid():
+            raise ImportRowError({'locations': serializer.errors})
+        key = self.location_key(serializer.validated_data)
+        if key not in self.locations:
+            self.locations[key] = serializer.save(created_by=self.owner).pk
+        return self.locations[key]
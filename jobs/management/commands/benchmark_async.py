@@ -0,0 +1,82 @@
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+from django.core.management.base import BaseCommand
+
+# (name, sync path, async path)
+ENDPOINTS = [
+    ('available jobs', '/api/jobs/availablejobs/', '/api/async/jobs/availablejobs/'),
+    ('facets', '/api/jobs/availablejobs/facets/', '/api/async/jobs/availablejobs/facets/'),
+    ('my applications', '/api/applications/my-applications-history/',
+     '/api/async/applications/my-applications-history/'),
+]
+AUTHENTICATED = {'my applications'}
+
+
+class Command(BaseCommand):
+    help = ("Load-test the sync and async read endpoints of a running server and compare "
+            "throughput and latency (e.g. gunicorn with uvicorn workers serving both)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000',
+                            help="Server to test")
+        parser.add_argument('--requests', type=int, default=200,
+                            help="Requests per endpoint and path")
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help="Requests in flight at once")
+        parser.add_argument('--token',
+                            help="JWT access token of a job seeker; my applications is skipped without it")
+        parser.add_argument('--query', default='',
+                            help="Query string added to every request, e.g. 'page_size=50'")
+        parser.add_argument('--no-cache', action='store_true',
+                            help="Make every URL unique so listing cache hits don't hide database time")
+
+    def handle(self, *args, **options):
+        headers = {'Accept': 'application/json'}
+        if options['token']:
+            headers['Authorization'] = f"Bearer {options['token']}"
+
+        self.stdout.write(f"{options['requests']} requests per path, {options['concurrency']} concurrent")
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            for name, sync_path, async_path in ENDPOINTS:
+                if name in AUTHENTICATED and not options['token']:
+                    self.stdout.write(f"\n{name}: skipped (needs --token)")
+                    continue
+                self.stdout.write(f"\n{name}")
+                for label, path in (('sync', sync_path), ('async', async_path)):
+                    urls = [self.url(options, path, index) for index in range(options['requests'])]
+                    start = time.perf_counter()
+                    results = list(pool.map(lambda url: self.fetch(url, headers), urls))
+                    self.report(label, results, time.perf_counter() - start)
+
+    def url(self, options, path, index):
+        params = [options['query']] if options['query'] else []
+        if options['no_cache']:
+            params.append(f"nocache={index}")
+        return f"{options['base_url'].rstrip('/')}{path}" + (f"?{'&'.join(params)}" if params else '')
+
+    def fetch(self, url, headers):
+        start = time.perf_counter()
+        try:
+            with urlopen(Request(url, headers=headers), timeout=60) as response:
+                response.read()
+                status = response.status
+        except HTTPError as error:
+            status = error.code
+        except URLError:
+            status = 'error'
+        return status, time.perf_counter() - start
+
+    def report(self, label, results, elapsed):
+        latencies = sorted(seconds * 1000 for _, seconds in results)
+        statuses = Counter(status for status, _ in results)
+        p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+        self.stdout.write(
+            f"  {label:<6} {len(results) / elapsed:>8.1f} req/s   p50 {statistics.median(latencies):>7.1f} ms"
+            f"   p95 {p95:>7.1f} ms   {dict(statuses)}")
+        if statuses.get(429):
+            self.stdout.write(self.style.WARNING(
+                "  Throttled responses; raise DEFAULT_THROTTLE_RATES on the server under test."))
@@ -0,0 +1,70 @@
+import io
+import time
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from job_board_backend.parsers import ORJSONParser
+from job_board_backend.renderers import ORJSONRenderer, orjson
+from jobs.models import Job
+from jobs.serializers import AvailableJobsSerializer, JobListSerializer
+
+
+class Command(BaseCommand):
+    help = ("Compare the stdlib and orjson JSON renderers and parsers on /availablejobs/ "
+            "payloads built from the live jobs in the database")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=100,
+                            help="Jobs per payload (the API allows at most 100 per page)")
+        parser.add_argument('--iterations', type=int, default=200,
+                            help="Renders and parses timed per payload and implementation")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            raise CommandError("orjson is not installed.")
+        jobs = list(Job.objects.available().prefetch_related('location')
+                    .order_by('-posted_on', '-pk')[:options['page_size']])
+        if not jobs:
+            raise CommandError("No available jobs to benchmark; import or post some first.")
+
+        request = Request(APIRequestFactory().get('/api/jobs/availablejobs/'))
+        context = {'request': request}
+        payloads = {
+            # What the endpoints render: serializer output inside a page
+            'list page': {'next': None, 'previous': None,
+                          'results': JobListSerializer(jobs, many=True, context=context).data},
+            'detail': AvailableJobsSerializer(jobs[0], context=context).data,
+            # Raw UUID / Decimal / datetime values, as in facets and exports
+            'values() rows': list(Job.objects.available().values(
+                'id', 'title', 'salary_min', 'salary_max', 'posted_on', 'updated_on',
+                'application_deadline')[:options['page_size']]),
+        }
+
+        self.stdout.write(f"{len(jobs)} jobs, {options['iterations']} iterations per measurement")
+        for name, data in payloads.items():
+            self.compare(name, data, options['iterations'])
+
+    def compare(self, name, data, iterations):
+        stdlib_bytes = JSONRenderer().render(data)
+        orjson_bytes = ORJSONRenderer().render(data)
+        same = 'identical output' if stdlib_bytes == orjson_bytes else 'OUTPUT DIFFERS'
+        self.stdout.write(f"\n{name} ({len(stdlib_bytes) / 1024:.1f} KiB, {same})")
+
+        timings = {
+            'render': [self.time(lambda: renderer.render(data), iterations)
+                       for renderer in (JSONRenderer(), ORJSONRenderer())],
+            'parse': [self.time(lambda: parser.parse(io.BytesIO(stdlib_bytes)), iterations)
+                      for parser in (JSONParser(), ORJSONParser())],
+        }
+        for step, (stdlib, fast) in timings.items():
+            self.stdout.write(
+                f"  {step:<7} stdlib {iterations / stdlib:>9.0f}/s   orjson {iterations / fast:>9.0f}/s"
+                f"   {stdlib / fast:.1f}x")
+
+    def time(self, func, iterations):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return time.perf_counter() - start
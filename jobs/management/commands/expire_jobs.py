@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from jobs.cache import bump_generation
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Deactivate jobs whose application deadline has passed (run daily, e.g. from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000,
+                            help="Number of jobs deactivated per UPDATE statement")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many jobs would be deactivated")
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = Job.objects.expired().count()
+            self.stdout.write(f"{count} jobs would be deactivated.")
+            return
+
+        chunk_size = options['chunk_size']
+        expired = 0
+        while True:
+            # Short UPDATEs keep row locks brief on a busy jobs table
+            pks = list(Job.objects.expired().values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                break
+            # update() skips auto_now, so set updated_on explicitly
+            expired += Job.objects.filter(pk__in=pks, is_active=True).update(
+                is_active=False, updated_on=timezone.now()
+            )
+            self.stdout.write(f"Deactivated {expired} jobs...")
+
+        if expired:
+            # Bulk UPDATEs bypass post_save, so invalidate cached listings here
+            bump_generation()
+        self.stdout.write(self.style.SUCCESS(f"{expired} expired jobs deactivated."))
@@ -0,0 +1,104 @@
+import json
+import os
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from jobs.bulk import BATCH_SIZE
+from jobs.imports import JobImporter, read_rows
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = ("Import jobs from a CSV or JSONL file, creating missing industries, companies "
+            "and locations. Columns: title, company, industry, locations "
+            "(\"Country, City, Region; ...\"), the other PostJobSerializer fields and optional "
+            "company_description, company_website, industry_description")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file")
+        parser.add_argument('--owner', required=True,
+                            help="Username that posts the jobs and owns created companies and locations")
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help="File format (default: from the file extension)")
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help="Rows validated and inserted per transaction")
+        parser.add_argument('--checkpoint',
+                            help="Progress file (default: <path>.checkpoint)")
+        parser.add_argument('--resume', action='store_true',
+                            help="Skip rows committed by a previous run, as recorded in the checkpoint")
+
+    def handle(self, *args, **options):
+        path = os.path.abspath(options['path'])
+        checkpoint = options['checkpoint'] or f"{path}.checkpoint"
+        try:
+            owner = get_user_model().objects.get(username=options['owner'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User {options['owner']!r} does not exist.")
+
+        self.committed = self.read_checkpoint(checkpoint, path) if options['resume'] else 0
+        skip = self.committed
+        if skip:
+            self.stdout.write(f"Resuming after row {skip}.")
+
+        importer = JobImporter(owner, options['batch_size'])
+        self.started = time.monotonic()
+        self.processed = self.created = 0
+        batch = []
+        for number, row in enumerate(read_rows(path, options['format']), start=1):
+            if number <= skip:
+                continue
+            batch.append((number, row))
+            if len(batch) == options['batch_size']:
+                self.flush(importer, batch, checkpoint, path)
+                batch = []
+        if batch:
+            self.flush(importer, batch, checkpoint, path)
+
+        if os.path.exists(checkpoint):
+            os.remove(checkpoint)
+        self.stdout.write(self.style.SUCCESS(
+            f"{self.created} jobs imported, {len(importer.errors)} rows skipped "
+            f"({self.rate()} rows/s)."))
+
+    def flush(self, importer, batch, checkpoint, path):
+        errors = len(importer.errors)
+        last = batch[-1][0]
+
+        def before_commit(jobs):
+            # Names a job of the batch about to commit, so a crash between the
+            # commit and the checkpoint below can be told from one before it
+            if jobs:
+                self.write_checkpoint(checkpoint, path, self.committed,
+                                      pending={'rows': last, 'job': str(jobs[0].pk)})
+
+        self.created += importer.import_batch(batch, before_commit)
+        self.processed += len(batch)
+        self.committed = last
+        self.write_checkpoint(checkpoint, path, last)
+        for number, row_errors in importer.errors[errors:]:
+            self.stderr.write(f"Row {number} skipped: {json.dumps(row_errors)}")
+        self.stdout.write(f"Imported {self.created} jobs from {self.processed} rows ({self.rate()} rows/s)...")
+
+    def rate(self):
+        elapsed = time.monotonic() - self.started
+        return round(self.processed / elapsed) if elapsed else self.processed
+
+    def read_checkpoint(self, checkpoint, path):
+        if not os.path.exists(checkpoint):
+            return 0
+        with open(checkpoint) as handle:
+            state = json.load(handle)
+        if state.get('source') != path:
+            raise CommandError(f"Checkpoint {checkpoint} belongs to {state.get('source')}.")
+        pending = state.get('pending')
+        if pending and Job.objects.filter(pk=pending['job']).exists():
+            # The pending batch committed before the run stopped
+            return pending['rows']
+        return state['rows']
+
+    def write_checkpoint(self, checkpoint, path, rows, pending=None):
+        # Write then rename so a crash never leaves a half-written checkpoint
+        temporary = f"{checkpoint}.tmp"
+        with open(temporary, 'w') as handle:
+            json.dump({'source': path, 'rows': rows, 'pending': pending}, handle)
+        os.replace(temporary, checkpoint)
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand, CommandError
+from jobs.models import Skill
+from jobs.skills import merge_skills, normalize_skill
+
+
+class Command(BaseCommand):
+    help = "Merge duplicate skills into a canonical skill and keep their names as aliases"
+
+    def add_arguments(self, parser):
+        parser.add_argument('canonical', help="Skill to keep, e.g. javascript")
+        parser.add_argument('duplicates', nargs='+', help="Skills folded into the canonical one")
+
+    def handle(self, *args, **options):
+        try:
+            canonical = Skill.objects.get(normalized_name=normalize_skill(options['canonical']))
+        except Skill.DoesNotExist:
+            raise CommandError(f"Skill '{options['canonical']}' does not exist")
+
+        names = [normalize_skill(name) for name in options['duplicates']]
+        duplicates = list(Skill.objects.filter(normalized_name__in=names))
+        missing = set(names) - {skill.normalized_name for skill in duplicates}
+        if missing:
+            raise CommandError(f"Unknown skills: {', '.join(sorted(missing))}")
+
+        merge_skills(canonical, duplicates)
+        self.stdout.write(self.style.SUCCESS(
+            f"Merged {len(duplicates)} skill(s) into '{canonical.name}'."))
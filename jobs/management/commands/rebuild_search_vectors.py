@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from jobs.models import Job
+from jobs.search import is_full_text_supported, update_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Backfill Job.search_vector for full-text search (PostgreSQL only)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help="Number of jobs updated per UPDATE statement")
+        parser.add_argument('--only-missing', action='store_true',
+                            help="Only fill jobs whose search_vector is empty")
+
+    def handle(self, *args, **options):
+        if not is_full_text_supported():
+            self.stdout.write(self.style.WARNING(
+                "Full-text search needs PostgreSQL; nothing to backfill."))
+            return
+
+        batch_size = options['batch_size']
+        jobs = Job.objects.order_by('pk')
+        if options['only_missing']:
+            jobs = jobs.filter(search_vector__isnull=True)
+
+        updated = 0
+        last_pk = None
+        while True:
+            batch = jobs if last_pk is None else jobs.filter(pk__gt=last_pk)
+            pks = list(batch.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            updated += update_search_vectors(Job.objects.filter(pk__in=pks))
+            last_pk = pks[-1]
+            self.stdout.write(f"Updated {updated} jobs...")
+
+        self.stdout.write(self.style.SUCCESS(f"Search vectors rebuilt for {updated} jobs."))
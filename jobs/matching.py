@@ -0,0 +1,68 @@
+"""
+Scoring rules shared by job recommendations and applicant ranking
+
+A match score is a weighted sum of
+- skill fit: share of the job's skills the candidate has (0..1)
+- experience fit: 1 inside the job level's year range, decaying outside it
+- salary fit (applicants only): 1 up to the job's salary_max, decaying above it
+"""
+from decimal import Decimal
+
+# Years of experience expected for each Job.experience_level (upper bound exclusive)
+EXPERIENCE_YEARS = {
+    'entry': (0, 2),
+    'mid_level': (2, 5),
+    'senior': (5, 8),
+    'lead': (8, 12),
+    'executive': (12, None),
+}
+
+SKILL_WEIGHT = 0.7
+EXPERIENCE_WEIGHT = 0.3
+
+# Applicants also state an expected salary
+APPLICANT_SKILL_WEIGHT = 0.6
+APPLICANT_EXPERIENCE_WEIGHT = 0.25
+APPLICANT_SALARY_WEIGHT = 0.15
+
+# Fit lost per year of experience below / above the expected range
+UNDER_EXPERIENCE_PENALTY = 0.25
+OVER_EXPERIENCE_PENALTY = 0.1
+# Fit lost per 10% asked above salary_max (or above salary_min when there is no max)
+OVER_SALARY_PENALTY = 0.2
+
+
+def experience_range(level):
+    return EXPERIENCE_YEARS.get(level, (0, None))
+
+
+def experience_fit(years, level):
+    low, high = experience_range(level)
+    if years < low:
+        return max(0.0, 1 - (low - years) * UNDER_EXPERIENCE_PENALTY)
+    if high is not None and years >= high:
+        return max(0.0, 1 - (years - high + 1) * OVER_EXPERIENCE_PENALTY)
+    return 1.0
+
+
+def skill_fit(job_skill_ids, candidate_skill_ids):
+    job_skill_ids = set(job_skill_ids)
+    if not job_skill_ids:
+        return 0.0
+    return len(job_skill_ids & set(candidate_skill_ids)) / len(job_skill_ids)
+
+
+def salary_fit(expected_salary, salary_min=None, salary_max=None):
+    ceiling = salary_max if salary_max is not None else salary_min
+    if expected_salary is None or not ceiling or expected_salary <= ceiling:
+        return 1.0
+    overshoot = (Decimal(expected_salary) - Decimal(ceiling)) / Decimal(ceiling)
+    return max(0.0, 1 - float(overshoot) * 10 * OVER_SALARY_PENALTY)
+
+
+def applicant_score(job_skill_ids, candidate_skill_ids, years, level,
+                    expected_salary, salary_min=None, salary_max=None):
+    score = (APPLICANT_SKILL_WEIGHT * skill_fit(job_skill_ids, candidate_skill_ids)
+             + APPLICANT_EXPERIENCE_WEIGHT * experience_fit(years, level)
+             + APPLICANT_SALARY_WEIGHT * salary_fit(expected_salary, salary_min, salary_max))
+    return round(score, 4)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:07
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+# GIN indexes only exist on PostgreSQL, so the index is created conditionally
+# and left out of the model state.
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS jobs_job_search_vector_gin '
+            'ON jobs_job USING gin (search_vector)'
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS jobs_job_search_vector_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0009_remove_job_jobs_job_categor_24d294_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
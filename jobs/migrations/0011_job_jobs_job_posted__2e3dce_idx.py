@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_job_search_vector'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-posted_on', '-id'], name='jobs_job_posted__2e3dce_idx'),
+        ),
+    ]
@@ -0,0 +1,159 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:10
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+# Skill normalization of jobs.skills as of this migration, copied so later
+# changes to it don't alter what the backfill computes
+MAX_SKILL_LENGTH = 100
+
+DEFAULT_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+    'drf': 'django rest framework',
+    'ml': 'machine learning',
+}
+
+
+def normalize_skill(name):
+    return ' '.join(str(name).split()).lower().rstrip('.;')[:MAX_SKILL_LENGTH]
+
+
+def display_skill(name):
+    return ' '.join(str(name).split()).rstrip('.;')[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    """Unique (display, normalized) pairs from a comma-separated skills string"""
+    seen = {}
+    for part in (text or '').split(','):
+        normalized = normalize_skill(part)
+        if normalized and normalized not in seen:
+            seen[normalized] = display_skill(part)
+    return [(display, normalized) for normalized, display in seen.items()]
+
+
+def resolve_skill_ids(pairs, Skill, SkillAlias):
+    """{normalized: skill id} for the pairs, through aliases, creating unknown skills"""
+    names = {normalized: display for display, normalized in pairs}
+    if not names:
+        return {}
+    resolved = dict(SkillAlias.objects.filter(alias__in=names).values_list('alias', 'skill_id'))
+    pending = [name for name in names if name not in resolved]
+    resolved.update(Skill.objects.filter(normalized_name__in=pending).values_list('normalized_name', 'id'))
+    missing = [name for name in pending if name not in resolved]
+    if missing:
+        Skill.objects.bulk_create([Skill(name=names[name], normalized_name=name) for name in missing],
+                                  ignore_conflicts=True)
+        resolved.update(Skill.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'id'))
+    return resolved
+
+
+def seed_aliases(apps, schema_editor):
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+    canonical = [(display_skill(name), normalize_skill(name)) for name in set(DEFAULT_ALIASES.values())]
+    skill_ids = resolve_skill_ids(canonical, Skill, SkillAlias)
+    SkillAlias.objects.bulk_create(
+        [SkillAlias(alias=alias, skill_id=skill_ids[name]) for alias, name in DEFAULT_ALIASES.items()],
+        ignore_conflicts=True,
+    )
+
+
+def backfill_job_skills(apps, schema_editor):
+    Job = apps.get_model('jobs', 'Job')
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+    JobSkill = apps.get_model('jobs', 'JobSkill')
+
+    jobs = Job.objects.order_by('pk')
+    last_pk = None
+    while True:
+        batch = jobs if last_pk is None else jobs.filter(pk__gt=last_pk)
+        rows = list(batch.values_list('pk', 'skills_required')[:BATCH_SIZE])
+        if not rows:
+            break
+        parsed = {pk: parse_skills(text) for pk, text in rows}
+        skill_ids = resolve_skill_ids([pair for pairs in parsed.values() for pair in pairs], Skill, SkillAlias)
+        JobSkill.objects.bulk_create(
+            [JobSkill(job_id=pk, skill_id=skill_ids[name])
+             for pk, pairs in parsed.items() for _, name in pairs],
+            ignore_conflicts=True,
+        )
+        last_pk = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_job_jobs_job_posted__2e3dce_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False, unique=True)),
+                ('name', models.CharField(max_length=100)),
+                ('normalized_name', models.CharField(help_text='Lowercased name with collapsed whitespace', max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Skill',
+                'verbose_name_plural': 'Skills',
+                'ordering': ['normalized_name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='jobs.job')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_skills', to='jobs.skill')),
+            ],
+            options={
+                'verbose_name': 'Job Skill',
+                'verbose_name_plural': 'Job Skills',
+            },
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='normalized_skills',
+            field=models.ManyToManyField(blank=True, related_name='jobs', through='jobs.JobSkill', to='jobs.skill'),
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(help_text='Normalized alternative name', max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.skill')),
+            ],
+            options={
+                'verbose_name': 'Skill Alias',
+                'verbose_name_plural': 'Skill Aliases',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobskill',
+            index=models.Index(fields=['skill', 'job'], name='jobs_jobski_skill_i_1a433c_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobskill',
+            constraint=models.UniqueConstraint(fields=('job', 'skill'), name='unique_job_skill'),
+        ),
+        migrations.RunPython(seed_aliases, migrations.RunPython.noop),
+        migrations.RunPython(backfill_job_skills, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_skill_jobskill_job_normalized_skills_skillalias_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['job_type', 'experience_level'], name='jobs_job_job_typ_33354c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['industry', 'job_type', 'experience_level'], name='jobs_job_industr_65ac18_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['company', 'job_type'], name='jobs_job_company_dd831e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_min', 'salary_max'], name='jobs_job_salary__2892b4_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['salary_max'], name='jobs_job_salary__7e8c2f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['application_deadline'], name='jobs_job_applica_af0dc4_idx'),
+        ),
+    ]
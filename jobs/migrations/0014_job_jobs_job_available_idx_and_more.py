@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_job_jobs_job_job_typ_33354c_idx_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['is_active', 'application_deadline'], name='jobs_job_available_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-posted_on', '-id'], name='jobs_job_available_posted_idx'),
+        ),
+    ]
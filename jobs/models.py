@@ -1,13 +1,14 @@
 from django.db import models
 import uuid
 from django.conf import settings
-from django.utils.text import slugify
 from django.utils import timezone
-import random, string
 from django.core.cache import cache
+from django.core.validators import MinValueValidator, MaxValueValidator
+from django.contrib.postgres.search import SearchVectorField
+from .slugs import UniqueSlugMixin
 
 # Create your models here.
-class Industry(models.Model):
+class Industry(UniqueSlugMixin, models.Model):
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -25,16 +26,8 @@ class Industry(models.Model):
         verbose_name = 'Industry'
         verbose_name_plural = 'Industries'
     
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(self.name)
-            slug = base_slug
-            # Handle duplicate slugs
-            while Industry.objects.filter(slug=slug).exists():
-                random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
-                slug = f"{base_slug}-{random_str}"
-            self.slug = slug
-        super().save(*args, **kwargs)
+    def get_slug_text(self):
+        return self.name
 
     def __str__(self):
         return self.name
@@ -51,6 +44,12 @@ class Location(models.Model):
     city = models.CharField(max_length=100, null=False, blank=False)
     region = models.CharField(max_length=100, null=False, blank=False)
     is_remote = models.BooleanField(default=False)
+    latitude = models.FloatField(
+        blank=True, null=True,
+        validators=[MinValueValidator(-90), MaxValueValidator(90)])
+    longitude = models.FloatField(
+        blank=True, null=True,
+        validators=[MinValueValidator(-180), MaxValueValidator(180)])
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
@@ -64,6 +63,8 @@ class Location(models.Model):
         indexes = [
             models.Index(fields=['country', 'city', 'region']),
             models.Index(fields=['is_remote']),
+            # Bounding-box pruning for ?near= (see jobs.geo)
+            models.Index(fields=['latitude', 'longitude']),
         ]
 
     def __str__(self):
@@ -76,7 +77,7 @@ class Location(models.Model):
         return location_str
 
 
-class Company(models.Model):
+class Company(UniqueSlugMixin, models.Model):
     id = models.UUIDField(
         primary_key=True,
         default=uuid.uuid4,
@@ -113,23 +114,60 @@ class Company(models.Model):
             models.Index(fields=['industry']),
         ]
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            # Use name + first 30 chars of description
-            base_slug = slugify(self.name)
-            slug = base_slug
-            # Handle duplicate slugs
-            while Company.objects.filter(slug=slug).exists():
-                random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
-                slug = f"{base_slug}-{random_str}"
-            self.slug = slug
-        super().save(*args, **kwargs)
+    def get_slug_text(self):
+        return self.name
+
+    def __str__(self):
+        return self.name
+
+
+class Skill(models.Model):
+    """Canonical skill shared by jobs and user profiles"""
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+    )
+    name = models.CharField(max_length=100)
+    normalized_name = models.CharField(max_length=100, unique=True,
+                                       help_text="Lowercased name with collapsed whitespace")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Skill'
+        verbose_name_plural = 'Skills'
+        ordering = ['normalized_name']
 
     def __str__(self):
         return self.name
 
 
-class Job(models.Model):
+class SkillAlias(models.Model):
+    """Alternative spelling that resolves to a canonical skill (e.g. js -> javascript)"""
+    alias = models.CharField(max_length=100, unique=True,
+                             help_text="Normalized alternative name")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name = 'Skill Alias'
+        verbose_name_plural = 'Skill Aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill}"
+
+
+class JobQuerySet(models.QuerySet):
+    def available(self):
+        """Active jobs that are still accepting applications"""
+        return self.filter(is_active=True, application_deadline__gte=timezone.localdate())
+
+    def expired(self):
+        """Jobs still marked active although their deadline has passed"""
+        return self.filter(is_active=True, application_deadline__lt=timezone.localdate())
+
+
+class Job(UniqueSlugMixin, models.Model):
     job_type_choices = [
         ('full_time', 'Full Time'),
         ('part_time', 'Part Time'),
@@ -168,6 +206,9 @@ class Job(models.Model):
     requirements = models.TextField(help_text="Comma-separated skills")
     responsibilities = models.TextField(help_text="Comma-separated skills")
     skills_required = models.TextField(help_text="Comma-separated skills")
+    # Inverted index of skills_required, kept in sync by jobs.signals
+    normalized_skills = models.ManyToManyField(Skill, through='JobSkill',
+                                               related_name='jobs', blank=True)
     salary_min = models.DecimalField(max_digits=10, decimal_places=2,
                                      blank=True, null=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2,
@@ -179,6 +220,10 @@ class Job(models.Model):
     application_deadline = models.DateField()
     posted_on = models.DateTimeField(auto_now_add=True)
     updated_on = models.DateTimeField(auto_now=True)
+    # Weighted full-text document maintained by jobs.signals (PostgreSQL only)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    objects = JobQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Job'
@@ -192,24 +237,33 @@ class Job(models.Model):
             models.Index(fields=['company']),
             models.Index(fields=['is_active']),
             models.Index(fields=['is_active', 'industry']),
+            # Keyset pagination over the default ordering
+            models.Index(fields=['-posted_on', '-id']),
+            # JobFilterSet combinations
+            models.Index(fields=['job_type', 'experience_level']),
+            models.Index(fields=['industry', 'job_type', 'experience_level']),
+            models.Index(fields=['company', 'job_type']),
+            models.Index(fields=['salary_min', 'salary_max']),
+            models.Index(fields=['salary_max']),
+            models.Index(fields=['application_deadline']),
+            # Partial indexes over live postings only (Job.objects.available())
+            models.Index(fields=['is_active', 'application_deadline'],
+                         condition=models.Q(is_active=True),
+                         name='jobs_job_available_idx'),
+            models.Index(fields=['-posted_on', '-id'],
+                         condition=models.Q(is_active=True),
+                         name='jobs_job_available_posted_idx'),
         ]
 
-    def save(self, *args, **kwargs):
-        if not self.slug:
-            base_slug = slugify(f"{self.title}-{self.company.name}")
-            slug = base_slug[:50]
-            # Handle duplicate slugs
-            while Job.objects.filter(slug=slug).exists():
-                random_str = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
-                slug = f"{base_slug}-{random_str}"
-            self.slug = slug
-        super().save(*args, **kwargs)
-        
+    def get_slug_text(self):
+        # The title is shortened first when both don't fit the slug column
+        return self.title, self.company.name
+
     @property
     def is_expired(self):
+        # application_deadline is a date, so compare it with today's date
         if self.application_deadline:
-            from django.utils import timezone
-            return timezone.now() > self.application_deadline
+            return timezone.localdate() > self.application_deadline
         return False
     
     @property
@@ -228,4 +282,26 @@ class Job(models.Model):
         return []
 
     def __str__(self):
-        return f"{self.company.name} - {self.title}. Deadline is on {self.application_deadline}"
\ No newline at end of file
+        return f"{self.company.name} - {self.title}. Deadline is on {self.application_deadline}"
+
+
+class JobSkill(models.Model):
+    """Job <-> Skill link; the (skill, job) index serves ?skills= lookups"""
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='job_skills')
+
+    class Meta:
+        verbose_name = 'Job Skill'
+        verbose_name_plural = 'Job Skills'
+        indexes = [
+            models.Index(fields=['skill', 'job']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'skill'],
+                name='unique_job_skill'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.skill_id}"
@@ -30,6 +30,15 @@ class IsEmployer(BasePermission):
             request.user.role == 'employer') 
 
 
+class IsJobSeeker(BasePermission):
+    # Only authenticated users with 'job_seeker' role can access
+    def has_permission(self, request, view):
+        return (
+            request.user and
+            request.user.is_authenticated and
+            request.user.role == 'job_seeker')
+
+
 class IsLocationOwner(BasePermission):
     """
     Only employers can create locations
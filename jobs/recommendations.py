@@ -0,0 +1,140 @@
+import datetime
+import threading
+from collections import namedtuple
+import numpy as np
+from scipy import sparse
+from django.core.cache import cache
+from django.utils import timezone
+from .cache import get_generation
+from .matching import (EXPERIENCE_YEARS, SKILL_WEIGHT, EXPERIENCE_WEIGHT,
+                       UNDER_EXPERIENCE_PENALTY, OVER_EXPERIENCE_PENALTY)
+from .models import Job, JobSkill
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+RECOMMENDATION_CACHE_TIMEOUT = 60 * 15
+# Rows updated this long before the last refresh are re-read, covering
+# transactions that committed after that refresh started
+WATERMARK_SLACK = datetime.timedelta(minutes=1)
+# Safety net for changes that never touch Job.updated_on (e.g. merge_skills)
+FULL_REBUILD_INTERVAL = datetime.timedelta(hours=1)
+
+# Immutable view of the matrix; refresh swaps in a new one in one assignment
+Snapshot = namedtuple('Snapshot', ['job_ids', 'columns', 'matrix', 'skill_counts', 'low', 'high'])
+
+
+def experience_fit_array(years, low, high):
+    """Vectorised matching.experience_fit over arrays of range bounds"""
+    under = np.maximum(0.0, 1 - (low - years) * UNDER_EXPERIENCE_PENALTY)
+    over = np.maximum(0.0, 1 - (years - high + 1) * OVER_EXPERIENCE_PENALTY)
+    return np.where(years < low, under, np.where(years >= high, over, 1.0))
+
+
+class SkillMatrix:
+    """
+    Sparse live-job x skill matrix held in process memory
+    - One row per available job, one column per Skill, 1 where the job needs the skill
+    - refresh() runs when the listing generation or the date changes; it drops
+      jobs that are no longer live and re-reads only jobs updated since the
+      previous refresh, then rebuilds the CSR arrays from the cached rows
+    - Every worker process keeps its own copy
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.version = None
+        self.synced_at = None
+        self.rebuilt_at = None
+        self.rows = {}  # job id -> (skill column array, experience level)
+        self.columns = {}  # skill id -> column
+        self.snapshot = self.build_snapshot()
+
+    def refresh(self):
+        version = (get_generation(), timezone.localdate())
+        if version == self.version:
+            return
+        with self.lock:
+            if version == self.version:
+                return
+            started = timezone.now()
+            full = self.rebuilt_at is None or started - self.rebuilt_at > FULL_REBUILD_INTERVAL
+            live = Job.objects.available()
+            if full:
+                self.rows, self.columns, changed = {}, {}, live
+            else:
+                changed = live.filter(updated_on__gte=self.synced_at - WATERMARK_SLACK)
+                live_ids = set(live.values_list('pk', flat=True))
+                self.rows = {pk: row for pk, row in self.rows.items() if pk in live_ids}
+            self.load_rows(changed)
+            self.snapshot = self.build_snapshot()
+            self.synced_at = started
+            if full:
+                self.rebuilt_at = started
+            self.version = version
+
+    def load_rows(self, jobs):
+        skills = {}
+        for job_id, skill_id in JobSkill.objects.filter(job__in=jobs).values_list('job_id', 'skill_id'):
+            column = self.columns.setdefault(skill_id, len(self.columns))
+            skills.setdefault(job_id, []).append(column)
+        for job_id, level in jobs.values_list('pk', 'experience_level'):
+            self.rows[job_id] = (np.array(skills.get(job_id, ()), dtype=np.int32), level)
+
+    def build_snapshot(self):
+        job_ids = list(self.rows)
+        columns = [self.rows[pk][0] for pk in job_ids]
+        counts = np.array([len(column) for column in columns], dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(counts)))
+        indices = np.concatenate(columns) if columns else np.array([], dtype=np.int32)
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, indptr),
+            shape=(len(job_ids), len(self.columns)))
+
+        bounds = [EXPERIENCE_YEARS.get(self.rows[pk][1], (0, None)) for pk in job_ids]
+        low = np.array([low for low, _ in bounds], dtype=float)
+        high = np.array([np.inf if high is None else high for _, high in bounds], dtype=float)
+        return Snapshot(job_ids, dict(self.columns), matrix, counts, low, high)
+
+    def top_jobs(self, skill_ids, experience_years, limit=DEFAULT_LIMIT):
+        """[(job id, score)] best first, for jobs sharing at least one skill"""
+        self.refresh()
+        snapshot = self.snapshot
+        columns = [snapshot.columns[skill_id] for skill_id in skill_ids if skill_id in snapshot.columns]
+        if not columns or not snapshot.job_ids:
+            return []
+
+        candidate = np.zeros(snapshot.matrix.shape[1])
+        candidate[columns] = 1
+        overlap = snapshot.matrix @ candidate
+        scores = (SKILL_WEIGHT * overlap / np.maximum(snapshot.skill_counts, 1)
+                  + EXPERIENCE_WEIGHT * experience_fit_array(experience_years, snapshot.low, snapshot.high))
+
+        matches = np.flatnonzero(overlap)
+        if len(matches) > limit:
+            matches = matches[np.argpartition(-scores[matches], limit - 1)[:limit]]
+        ranked = matches[np.argsort(-scores[matches], kind='stable')]
+        return [(snapshot.job_ids[row], float(scores[row])) for row in ranked]
+
+
+skill_matrix = SkillMatrix()
+
+
+def recommend_jobs(user, limit=DEFAULT_LIMIT):
+    """
+    Top live jobs for a job seeker, cached per user until the listing
+    generation or the user's profile changes
+    """
+    from accounts.models import UserProfile
+
+    profile = UserProfile.objects.filter(user=user).values('pk', 'updated_at', 'experience_years').first()
+    if profile is None:
+        return []
+
+    key = (f"jobs:recommended:{get_generation()}:{timezone.localdate()}:{user.pk}:"
+           f"{profile['updated_at'].timestamp()}:{limit}")
+    ranked = cache.get(key)
+    if ranked is None:
+        skill_ids = UserProfile.normalized_skills.through.objects.filter(
+            userprofile_id=profile['pk']).values_list('skill_id', flat=True)
+        ranked = skill_matrix.top_jobs(list(skill_ids), profile['experience_years'], limit)
+        cache.set(key, ranked, RECOMMENDATION_CACHE_TIMEOUT)
+    return ranked
@@ -0,0 +1,67 @@
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Concat
+
+# Text search configuration used for both the stored vector and the query
+SEARCH_CONFIG = 'english'
+
+
+def is_full_text_supported(using='default'):
+    """Full-text search needs PostgreSQL; other backends fall back to SearchFilter"""
+    return connections[using].vendor == 'postgresql'
+
+
+def job_search_vector():
+    """
+    Weighted search document for a job row:
+    - A: title
+    - B: skills_required
+    - C: description, requirements, responsibilities
+    - D: industry name and location names
+    Related names are pulled in through subqueries so the expression
+    can be used in a single UPDATE over many jobs.
+    """
+    from .models import Industry, Job
+
+    industry_name = Industry.objects.filter(pk=OuterRef('industry_id')).values('name')[:1]
+    location_names = (
+        Job.location.through.objects
+        .filter(job_id=OuterRef('pk'))
+        .values('job_id')
+        .annotate(names=StringAgg(
+            Concat('location__country', Value(' '), 'location__city',
+                   Value(' '), 'location__region'),
+            delimiter=' ',
+        ))
+        .values('names')
+    )
+    return (
+        SearchVector('title', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('skills_required', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', 'requirements', 'responsibilities',
+                       weight='C', config=SEARCH_CONFIG)
+        + SearchVector(Subquery(industry_name), Subquery(location_names),
+                       weight='D', config=SEARCH_CONFIG)
+    )
+
+
+def update_search_vectors(queryset):
+    """Recompute search_vector for every job in the queryset with one UPDATE"""
+    if not is_full_text_supported(queryset.db):
+        return 0
+    return queryset.update(search_vector=job_search_vector())
+
+
+def search_jobs(queryset, terms):
+    """Filter jobs matching the terms and order them by rank, best first"""
+    query = SearchQuery(terms, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        queryset
+        .filter(search_vector=query)
+        # real widened to double precision so the rank survives a round trip
+        # through a pagination cursor and still compares equal
+        .annotate(search_rank=Cast(SearchRank(F('search_vector'), query), FloatField()))
+        .order_by('-search_rank', '-posted_on')
+    )
@@ -1,3 +1,4 @@
+import uuid
 from rest_framework import serializers
 from .models import Industry, Location, Company, Job
 
@@ -10,7 +11,7 @@ class IndustrySerializer(serializers.ModelSerializer):
 class LocationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Location
-        fields = ['id', 'country', 'city', 'region', 'is_remote', 'created_at']
+        fields = ['id', 'country', 'city', 'region', 'is_remote', 'latitude', 'longitude', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 class CompanySerializer(serializers.ModelSerializer):
@@ -22,10 +23,45 @@ class CompanySerializer(serializers.ModelSerializer):
 class PostJobSerializer(serializers.ModelSerializer):
     class Meta:
         model = Job
-        fields = '__all__'
+        exclude = ['search_vector', 'normalized_skills']
         read_only_fields = ['id', 'slug', 'industry', 'location', 'posted_by', 'posted_on', 'updated_on']
 
+class ContextCompanyField(serializers.PrimaryKeyRelatedField):
+    """Looks companies up in context['companies'] instead of one query per item"""
+    def to_internal_value(self, data):
+        try:
+            pk = uuid.UUID(str(data))
+        except ValueError:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        company = self.context['companies'].get(pk)
+        if company is None:
+            self.fail('does_not_exist', pk_value=data)
+        return company
+
+class BulkPostJobSerializer(PostJobSerializer):
+    # Only companies owned by the poster, preloaded by the bulk view
+    company = ContextCompanyField(queryset=Company.objects.all())
+
+class JobListSerializer(serializers.ModelSerializer):
+    """Compact job for list endpoints; the long text fields are left to retrieve"""
+    # Only present when the list is filtered with ?near=
+    distance_km = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'slug', 'company', 'industry', 'location', 'job_type',
+                  'experience_level', 'skills_required', 'salary_min', 'salary_max',
+                  'salary_currency', 'is_salary_visible', 'is_active', 'application_deadline',
+                  'posted_by', 'posted_on', 'updated_on', 'distance_km']
+
 class AvailableJobsSerializer(serializers.ModelSerializer):
+    # Only present when the list is filtered with ?near=
+    distance_km = serializers.FloatField(read_only=True)
+
     class Meta:
         model = Job
-        fields = '__all__'
\ No newline at end of file
+        exclude = ['search_vector', 'normalized_skills']
+
+class RecommendedJobSerializer(AvailableJobsSerializer):
+    # Set by the view from jobs.recommendations
+    match_score = serializers.FloatField(read_only=True)
@@ -0,0 +1,84 @@
+from django.db.models.signals import post_init, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from .models import Industry, Location, Company, Job
+from .search import update_search_vectors
+from .cache import bump_generation_on_commit
+from .skills import sync_job_skills
+from applications.models import ApplyJob
+from applications.scoring import rescore_applications
+
+
+# Keep Job.search_vector in sync with the job and the rows it pulls text from
+@receiver(post_save, sender=Job)
+def refresh_job_search_vector(sender, instance, **kwargs):
+    update_search_vectors(Job.objects.filter(pk=instance.pk))
+
+@receiver(m2m_changed, sender=Job.location.through)
+def refresh_job_locations_search_vector(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse and action == 'pre_clear':
+        # instance is a Location; remember its jobs before the links disappear
+        instance._cleared_job_pks = list(Job.objects.filter(location=instance).values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if reverse:
+        if action == 'post_clear':
+            pk_set = getattr(instance, '_cleared_job_pks', [])
+        jobs = Job.objects.filter(pk__in=pk_set)
+    else:
+        jobs = Job.objects.filter(pk=instance.pk)
+    update_search_vectors(jobs)
+
+@receiver(post_save, sender=Location)
+def refresh_location_jobs_search_vector(sender, instance, created, **kwargs):
+    if not created:
+        update_search_vectors(Job.objects.filter(location=instance))
+
+@receiver(post_save, sender=Industry)
+def refresh_industry_jobs_search_vector(sender, instance, created, **kwargs):
+    if not created:
+        update_search_vectors(Job.objects.filter(industry=instance))
+
+
+# Any change to what the public listings show invalidates the listing cache
+def invalidate_listing_cache(sender, **kwargs):
+    if kwargs.get('action', 'post_').startswith('post_'):
+        bump_generation_on_commit()
+
+for model in (Job, Company, Location, Industry):
+    post_save.connect(invalidate_listing_cache, sender=model,
+                      dispatch_uid=f'listing_cache_save_{model.__name__}')
+    post_delete.connect(invalidate_listing_cache, sender=model,
+                        dispatch_uid=f'listing_cache_delete_{model.__name__}')
+
+for through in (Job.location.through, Company.locations.through):
+    m2m_changed.connect(invalidate_listing_cache, sender=through,
+                        dispatch_uid=f'listing_cache_m2m_{through.__name__}')
+
+
+# Keep the JobSkill index in sync with skills_required, and rescore applications
+# against the job's skills, level and salary band, only when those changed
+JOB_SCORE_FIELDS = ('skills_required', 'experience_level', 'salary_min', 'salary_max')
+
+def job_score_inputs(job):
+    # __dict__ lookup so deferred fields are not fetched
+    return tuple(job.__dict__.get(field) for field in JOB_SCORE_FIELDS)
+
+@receiver(post_init, sender=Job)
+def remember_job_inputs(sender, instance, **kwargs):
+    instance._synced_skills = instance.__dict__.get('skills_required')
+    instance._scored_inputs = job_score_inputs(instance)
+
+@receiver(post_save, sender=Job)
+def sync_job_skill_index(sender, instance, created, **kwargs):
+    if created or instance.skills_required != instance._synced_skills:
+        sync_job_skills(instance)
+        instance._synced_skills = instance.skills_required
+
+# Runs after the JobSkill sync above, so scores see the new skills
+@receiver(post_save, sender=Job)
+def rescore_job_applications(sender, instance, created, **kwargs):
+    inputs = job_score_inputs(instance)
+    if not created and inputs != instance._scored_inputs:
+        rescore_applications(ApplyJob.objects.filter(job=instance), touch=True)
+    instance._scored_inputs = inputs
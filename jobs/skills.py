@@ -0,0 +1,140 @@
+from django.db import transaction
+from accounts.models import UserProfile
+from .models import JobSkill, Skill, SkillAlias
+
+# Matches Skill.name / Skill.normalized_name / SkillAlias.alias max_length
+MAX_SKILL_LENGTH = 100
+
+# Common spellings folded into one canonical skill (seeded as SkillAlias rows)
+DEFAULT_ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'postgres': 'postgresql',
+    'psql': 'postgresql',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+    'drf': 'django rest framework',
+    'ml': 'machine learning',
+}
+
+
+def normalize_skill(name):
+    """Lowercase, collapse inner whitespace and drop trailing punctuation"""
+    return ' '.join(str(name).split()).lower().rstrip('.;')[:MAX_SKILL_LENGTH]
+
+
+def display_skill(name):
+    return ' '.join(str(name).split()).rstrip('.;')[:MAX_SKILL_LENGTH]
+
+
+def parse_skills(text):
+    """Split a comma-separated skills string into unique (display, normalized) pairs"""
+    seen = {}
+    for part in (text or '').split(','):
+        normalized = normalize_skill(part)
+        if normalized and normalized not in seen:
+            seen[normalized] = display_skill(part)
+    return [(display, normalized) for normalized, display in seen.items()]
+
+
+def resolve_skill_ids(pairs, create=True):
+    """
+    Map (display, normalized) pairs to canonical Skill ids
+    - Aliases resolve to the skill they were merged into
+    - With create=True unknown skills are inserted in one bulk query
+    Returns {normalized: skill_id} for every pair that resolved.
+    """
+    names = {normalized: display for display, normalized in pairs}
+    if not names:
+        return {}
+
+    resolved = dict(
+        SkillAlias.objects.filter(alias__in=names).values_list('alias', 'skill_id')
+    )
+    pending = [name for name in names if name not in resolved]
+    resolved.update(
+        Skill.objects.filter(normalized_name__in=pending).values_list('normalized_name', 'id')
+    )
+
+    missing = [name for name in pending if name not in resolved]
+    if missing and create:
+        Skill.objects.bulk_create(
+            [Skill(name=names[name], normalized_name=name) for name in missing],
+            ignore_conflicts=True,
+        )
+        resolved.update(
+            Skill.objects.filter(normalized_name__in=missing).values_list('normalized_name', 'id')
+        )
+    return resolved
+
+
+def sync_job_skills(job):
+    """Rebuild the job's JobSkill rows from skills_required"""
+    skill_ids = set(resolve_skill_ids(parse_skills(job.skills_required)).values())
+    current = set(JobSkill.objects.filter(job=job).values_list('skill_id', flat=True))
+    with transaction.atomic():
+        if current - skill_ids:
+            JobSkill.objects.filter(job=job, skill_id__in=current - skill_ids).delete()
+        JobSkill.objects.bulk_create(
+            [JobSkill(job=job, skill_id=skill_id) for skill_id in skill_ids - current],
+            ignore_conflicts=True,
+        )
+
+
+def index_new_job_skills(jobs):
+    """JobSkill rows for freshly inserted jobs, e.g. after bulk_create, in one resolve and one insert"""
+    parsed = {job.pk: parse_skills(job.skills_required) for job in jobs}
+    skill_ids = resolve_skill_ids([pair for pairs in parsed.values() for pair in pairs])
+    JobSkill.objects.bulk_create(
+        [JobSkill(job_id=pk, skill_id=skill_ids[name]) for pk, pairs in parsed.items() for _, name in pairs],
+        ignore_conflicts=True,
+    )
+
+
+def sync_profile_skills(profile):
+    """Point the profile's normalized_skills at the skills listed in UserProfile.skills"""
+    skill_ids = set(resolve_skill_ids(parse_skills(profile.skills)).values())
+    profile.normalized_skills.set(skill_ids)
+
+
+def lookup_skill_ids(text):
+    """
+    Canonical skill ids for a comma-separated query, without creating skills
+    Returns (skill_ids, unknown_names).
+    """
+    pairs = parse_skills(text)
+    resolved = resolve_skill_ids(pairs, create=False)
+    unknown = [normalized for _, normalized in pairs if normalized not in resolved]
+    return set(resolved.values()), unknown
+
+
+@transaction.atomic
+def merge_skills(canonical, duplicates):
+    """
+    Fold duplicate skills into the canonical one
+    - Jobs and profiles are repointed to the canonical skill
+    - Each duplicate's name becomes an alias so future text resolves to it
+    """
+    profile_links = UserProfile.normalized_skills.through
+    for skill in duplicates:
+        if skill.pk == canonical.pk:
+            continue
+        JobSkill.objects.bulk_create(
+            [JobSkill(job_id=job_id, skill=canonical)
+             for job_id in JobSkill.objects.filter(skill=skill).values_list('job_id', flat=True)],
+            ignore_conflicts=True,
+        )
+        profile_links.objects.bulk_create(
+            [profile_links(userprofile_id=profile_id, skill_id=canonical.pk)
+             for profile_id in profile_links.objects.filter(skill=skill).values_list('userprofile_id', flat=True)],
+            ignore_conflicts=True,
+        )
+        SkillAlias.objects.filter(skill=skill).update(skill=canonical)
+        SkillAlias.objects.update_or_create(alias=skill.normalized_name, defaults={'skill': canonical})
+        skill.delete()
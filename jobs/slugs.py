@@ -0,0 +1,109 @@
+import re
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+# Room kept at the end of the slug for a "-<n>" suffix
+SUFFIX_ROOM = 7
+# Bases per prefix query when allocating in bulk
+PREFIX_QUERY_CHUNK = 200
+
+
+def slug_base(model, text, field='slug'):
+    """
+    Slugified text truncated so that base + suffix fits the slug column
+    text may be a tuple of parts joined with '-'; the first part is cut
+    first, so a long job title still leaves room for the company name.
+    """
+    max_length = model._meta.get_field(field).max_length - SUFFIX_ROOM
+    parts = [slugify(part) for part in (text if isinstance(text, tuple) else (text,))]
+    head, tail = parts[0], '-'.join(part for part in parts[1:] if part)[:max_length].strip('-')
+    if tail:
+        head = head[:max(max_length - len(tail) - 1, 0)].strip('-')
+    else:
+        head = head[:max_length].strip('-')
+    base = '-'.join(part for part in (head, tail) if part)
+    return base or model._meta.model_name
+
+
+class SlugAllocator:
+    """
+    Hands out free slugs given the slugs already taken
+    The first instance of a base gets the bare base, the next ones base-2,
+    base-3, ... without re-querying the database.
+    """
+    def __init__(self, taken):
+        self.taken = set(taken)
+        self.next_suffix = {}
+
+    def allocate(self, base):
+        slug = base
+        suffix = self.next_suffix.get(base, 2)
+        while slug in self.taken:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        self.next_suffix[base] = suffix
+        self.taken.add(slug)
+        return slug
+
+
+def taken_slugs(model, bases, field='slug'):
+    """Existing slugs starting with any of the bases, one query per chunk of bases"""
+    bases = sorted(set(bases))
+    taken = set()
+    for start in range(0, len(bases), PREFIX_QUERY_CHUNK):
+        prefixes = Q()
+        for base in bases[start:start + PREFIX_QUERY_CHUNK]:
+            prefixes |= Q(**{f"{field}__startswith": base})
+        taken.update(model._default_manager.filter(prefixes).values_list(field, flat=True))
+    return taken
+
+
+def unique_slug(model, text, field='slug'):
+    """Free slug for text, found with a single prefix query"""
+    base = slug_base(model, text, field)
+    pattern = re.compile(rf"^{re.escape(base)}(-\d+)?$")
+    taken = [slug for slug in taken_slugs(model, [base], field) if pattern.match(slug)]
+    return SlugAllocator(taken).allocate(base)
+
+
+def assign_unique_slugs(model, instances, get_text, field='slug'):
+    """
+    Give every unsaved instance without a slug a unique one, e.g. before
+    bulk_create; slugs are unique among the instances and the table
+    """
+    pending = [instance for instance in instances if not getattr(instance, field)]
+    bases = {id(instance): slug_base(model, get_text(instance), field) for instance in pending}
+    allocator = SlugAllocator(taken_slugs(model, bases.values(), field))
+    for instance in pending:
+        setattr(instance, field, allocator.allocate(bases[id(instance)]))
+    return instances
+
+
+class UniqueSlugMixin:
+    """
+    Fill an empty slug on save
+    The free slug comes from one prefix query; if a concurrent insert takes it
+    first, the unique constraint fails and the save retries with a new slug.
+    """
+    slug_save_attempts = 3
+
+    def get_slug_text(self):
+        raise NotImplementedError
+
+    def save(self, *args, **kwargs):
+        if self.slug:
+            return super().save(*args, **kwargs)
+
+        model = type(self)
+        for attempt in range(self.slug_save_attempts):
+            self.slug = unique_slug(model, self.get_slug_text())
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                last_attempt = attempt == self.slug_save_attempts - 1
+                if last_attempt or not model._default_manager.filter(slug=self.slug).exists():
+                    # Out of attempts, or another unique field failed
+                    self.slug = ''
+                    raise
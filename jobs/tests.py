@@ -1,3 +1,925 @@
-from django.test import TestCase
+import datetime
+import decimal
+import io
+import json
+import os
+import tempfile
+import uuid
+from unittest import mock, skipUnless
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import User
+from job_board_backend.pagination import KeysetPagination
+from job_board_backend.parsers import ORJSONParser
+from job_board_backend.renderers import ORJSONRenderer
+from job_board_backend.testing import JobBoardTestMixin, QueryBudgetMixin
+from .bulk import create_jobs
+from .cache import bump_generation, get_generation
+from .facets import SALARY_BUCKETS
+from .filters import JobFilterSet
+from .geo import bounding_box
+from .management.commands.import_jobs import Command as ImportCommand
+from .models import Industry, Location, Company, Job, JobSkill, Skill
+from .recommendations import FULL_REBUILD_INTERVAL, SkillMatrix
+from .skills import parse_skills
+from .slugs import SUFFIX_ROOM, SlugAllocator, assign_unique_slugs, slug_base
 
-# Create your tests here.
+
+class JobFilterSetIndexTests(TestCase):
+    """Every supported JobFilterSet combination must be answered from an index"""
+
+    combinations = [
+        {'job_type': 'full_time'},
+        {'job_type__in': 'full_time,contract'},
+        {'experience_level': 'senior'},
+        {'experience_level__in': 'senior,lead'},
+        {'job_type': 'full_time', 'experience_level': 'senior'},
+        {'industry__slug': 'technology'},
+        {'industry__slug__in': 'technology,finance'},
+        {'industry__slug': 'technology', 'job_type': 'full_time', 'experience_level': 'senior'},
+        {'company__slug': 'acme'},
+        {'company__slug__in': 'acme,globex', 'job_type': 'contract'},
+        {'location__is_remote': 'true'},
+        {'location__is_remote': 'true', 'job_type': 'full_time'},
+        {'salary_min__gte': '50000'},
+        {'salary_min__gte': '50000', 'salary_max__lte': '150000'},
+        {'salary_max__lte': '150000'},
+        {'application_deadline__gte': '2030-01-01'},
+        {'application_deadline__gte': '2030-01-01', 'application_deadline__lte': '2030-12-31'},
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(
+            username='employer', email='employer@example.com', password='pass1234',
+            first_name='Em', last_name='Ployer', role='employer')
+        industry = Industry.objects.create(name='Technology', description='Tech jobs')
+        location = Location.objects.create(country='Kenya', city='Nairobi', region='Nairobi',
+                                           is_remote=True, created_by=employer)
+        company = Company.objects.create(name='Acme', description='Acme Ltd',
+                                         industry=industry, created_by=employer)
+        job = Job.objects.create(
+            title='Backend Engineer', company=company, industry=industry,
+            job_type='full_time', experience_level='senior', description='Build APIs',
+            requirements='Python', responsibilities='APIs', skills_required='Python, Django',
+            salary_min=60000, salary_max=120000, posted_by=employer,
+            application_deadline=datetime.date(2030, 6, 1))
+        job.location.set([location])
+
+    def assertUsesIndex(self, queryset):
+        # Ordering is left out so only the filter's access path is checked
+        queryset = queryset.order_by()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+            self.assertNotIn('Seq Scan', plan, plan)
+        else:
+            plan = queryset.explain()
+            self.assertNotRegex(plan, r'\bSCAN\b', plan)
+
+    def test_filter_combinations_use_indexes(self):
+        for params in self.combinations:
+            with self.subTest(params=params):
+                filterset = JobFilterSet(params, queryset=Job.objects.all())
+                self.assertTrue(filterset.is_valid(), filterset.errors)
+                self.assertUsesIndex(filterset.qs)
+
+    def test_filters_match_expected_jobs(self):
+        matching = {'job_type': 'full_time', 'experience_level': 'senior',
+                    'industry__slug': 'technology', 'location__is_remote': 'true',
+                    'salary_min__gte': '50000', 'application_deadline__gte': '2030-01-01'}
+        self.assertEqual(JobFilterSet(matching, queryset=Job.objects.all()).qs.count(), 1)
+
+        excluded = {'job_type': 'contract', 'location__is_remote': 'false'}
+        self.assertEqual(JobFilterSet(excluded, queryset=Job.objects.all()).qs.count(), 0)
+
+
+class JobTestMixin(JobBoardTestMixin):
+    """JobBoardTestMixin signed in as the employer"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.employer)
+
+    def list_titles(self, url='/api/jobs/availablejobs/', **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [job['title'] for job in response.data['results']]
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, JobTestMixin, APITestCase):
+    """List endpoints must run a constant number of queries per page"""
+
+    def test_available_jobs(self):
+        url = '/api/jobs/availablejobs/'
+        self.assertQueryBudget(url, self.create_job)
+
+    def test_posted_jobs(self):
+        url = '/api/jobs/postjobs/'
+        self.assertQueryBudget(url, self.create_job)
+
+    def test_companies(self):
+        url = '/api/jobs/companies/'
+        self.assertQueryBudget(url, self.create_company)
+
+    def test_locations(self):
+        url = '/api/jobs/locations/'
+        self.assertQueryBudget(url, self.create_location)
+
+    def test_industries(self):
+        url = '/api/jobs/industries/'
+        self.assertQueryBudget(url, self.create_industry)
+
+
+class SkillTests(JobTestMixin, APITestCase):
+    """Skills text is normalized into canonical skills that ?skills= filters on"""
+
+    def test_parse_skills_normalizes_and_dedupes(self):
+        self.assertEqual(
+            parse_skills(' Python , python., Django  REST   Framework;,, '),
+            [('Python', 'python'), ('Django REST Framework', 'django rest framework')])
+        self.assertEqual(parse_skills(''), [])
+
+    def test_aliases_resolve_to_canonical_skills(self):
+        job = self.create_job(skills_required='JS, ReactJS, k8s, Go')
+        other = self.create_job(skills_required='javascript, golang')
+        self.assertEqual(sorted(job.normalized_skills.values_list('normalized_name', flat=True)),
+                         ['go', 'javascript', 'kubernetes', 'react'])
+        self.assertEqual(set(other.normalized_skills.all()), set(job.normalized_skills.filter(
+            normalized_name__in=['javascript', 'go'])))
+
+        job.skills_required = 'Python'
+        job.save()
+        self.assertEqual(list(job.normalized_skills.values_list('normalized_name', flat=True)), ['python'])
+
+    def test_profile_skills_are_normalized(self):
+        profile = self.employer.userprofile
+        profile.skills = 'Node, Postgres'
+        profile.save()
+        self.assertEqual(sorted(profile.normalized_skills.values_list('normalized_name', flat=True)),
+                         ['node.js', 'postgresql'])
+
+    def test_skills_match(self):
+        self.create_job(title='Django', skills_required='Python, Django')
+        self.create_job(title='Python', skills_required='Python')
+        self.create_job(title='Go', skills_required='Go')
+
+        self.assertEqual(sorted(self.list_titles(skills='python')), ['Django', 'Python'])
+        self.assertEqual(sorted(self.list_titles(skills='PYTHON, golang')), ['Django', 'Go', 'Python'])
+        self.assertEqual(self.list_titles(skills='python,django', skills_match='all'), ['Django'])
+        # Unknown skills match nothing when all are required, and are ignored otherwise
+        self.assertEqual(self.list_titles(skills='python,cobol', skills_match='all'), [])
+        self.assertEqual(sorted(self.list_titles(skills='python,cobol')), ['Django', 'Python'])
+        self.assertEqual(self.list_titles(skills='cobol'), [])
+
+    def test_normalized_skills_are_not_serialized(self):
+        self.create_job()
+        for url in ('/api/jobs/availablejobs/', '/api/jobs/postjobs/'):
+            job = self.client.get(url).data['results'][0]
+            self.assertIn('skills_required', job)
+            self.assertNotIn('normalized_skills', job)
+
+
+class KeysetPaginationTests(JobTestMixin, APITestCase):
+    """Cursor links walk every row once in both directions, whatever is inserted meanwhile"""
+    url = '/api/jobs/availablejobs/'
+
+    def setUp(self):
+        super().setUp()
+        for _ in range(5):
+            self.create_job()
+        self.expected = list(Job.objects.order_by('-posted_on', '-pk').values_list('title', flat=True))
+
+    def page(self, url, **params):
+        # Links carry their own query string
+        response = self.client.get(url, params or None)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [job['title'] for job in response.data['results']], response.data
+
+    def test_round_trip(self):
+        titles, data = self.page(self.url, page_size=2)
+        pages = [titles]
+        while data['next']:
+            titles, data = self.page(data['next'])
+            pages.append(titles)
+        self.assertEqual(pages, [self.expected[0:2], self.expected[2:4], self.expected[4:]])
+        self.assertIsNone(data['next'])
+
+        # previous links lead back over the same pages
+        for expected in reversed(pages[:-1]):
+            titles, data = self.page(data['previous'])
+            self.assertEqual(titles, expected)
+        self.assertIsNone(data['previous'])
+
+    def test_inserts_do_not_shift_pages(self):
+        first, data = self.page(self.url, page_size=2)
+        self.create_job(title='Newest')
+        # A row sharing the first page's last posted_on sorts by pk on either side of it
+        last = Job.objects.get(title=first[-1])
+        self.create_job(title='Same time')
+        Job.objects.filter(title='Same time').update(posted_on=last.posted_on)
+
+        rest = []
+        while data['next']:
+            titles, data = self.page(data['next'])
+            rest += titles
+        # Every row after the cursor comes once, in order; rows inserted before it stay behind
+        self.assertEqual([title for title in rest if title in self.expected], self.expected[2:])
+        self.assertEqual(len(rest), len(set(rest)))
+        self.assertNotIn('Newest', rest)
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get(self.url, {'cursor': 'not-a-cursor'}).status_code, 404)
+
+    def test_ordering_terms(self):
+        pagination = KeysetPagination()
+        self.assertEqual(pagination.get_ordering(None, Job.objects.order_by(F('posted_on').desc()), None),
+                         ('-posted_on', '-id'))
+        self.assertEqual(pagination.get_ordering(None, Job.objects.all(), None), ('-posted_on', '-id'))
+        with self.assertRaises(ImproperlyConfigured):
+            pagination.get_ordering(None, Job.objects.order_by(Lower('title')), None)
+
+    def test_search_fallback(self):
+        for _ in range(3):
+            self.create_job(title='Django developer')
+        self.create_job(title='Backend', skills_required='Python, Django')
+        self.client.force_authenticate(None)
+
+        # Without full-text support ?q= searches the view's search_fields
+        with mock.patch('jobs.filters.is_full_text_supported', return_value=False):
+            titles, data = self.page(self.url, q='django', page_size=2)
+            pages = [titles]
+            while data['next']:
+                titles, data = self.page(data['next'])
+                pages.append(titles)
+        self.assertEqual([len(page) for page in pages], [2, 2])
+        titles = [title for page in pages for title in page]
+        self.assertEqual(sorted(titles), ['Backend'] + ['Django developer'] * 3)
+
+    @skipUnless(connection.vendor == 'postgresql', "?q= ranks results on PostgreSQL only")
+    def test_search_rank_ordering(self):
+        self.create_job(title='Django Django', skills_required='Django')
+        self.create_job(title='Python', skills_required='Django')
+        for _ in range(3):
+            self.create_job(title='Django developer')
+        self.client.force_authenticate(None)
+
+        titles, data = self.page(self.url, q='django', page_size=2)
+        while data['next']:
+            page, data = self.page(data['next'])
+            titles += page
+        self.assertEqual(titles[0], 'Django Django')
+        self.assertEqual(len(titles), len(set(titles)))
+        self.assertEqual(len(titles), 5)
+
+
+class BulkPostJobTests(JobTestMixin, APITestCase):
+    """POST /postjobs/bulk/ saves every job with its slug, locations and skills, or none"""
+    url = '/api/jobs/postjobs/bulk/'
+
+    def item(self, **fields):
+        return {
+            'title': 'Backend Engineer', 'company': str(self.company.pk), 'description': 'Build APIs',
+            'requirements': 'Python', 'responsibilities': 'APIs', 'skills_required': 'Python, Django',
+            'application_deadline': str(datetime.date.today() + datetime.timedelta(days=30)),
+            **fields,
+        }
+
+    def test_creates_jobs(self):
+        items = [self.item(), self.item(), self.item(title='Data Engineer', skills_required='SQL')]
+        response = self.client.post(self.url, items, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['created'], 3)
+
+        jobs = Job.objects.filter(pk__in=[row['id'] for row in response.data['results']])
+        self.assertEqual(len({job.slug for job in jobs}), 3)
+        company_locations = set(self.company.locations.all())
+        for job in jobs:
+            self.assertTrue(job.slug)
+            self.assertEqual(job.posted_by, self.employer)
+            self.assertEqual(job.industry, self.company.industry)
+            self.assertEqual(set(job.location.all()), company_locations)
+        self.assertEqual(
+            sorted(JobSkill.objects.filter(job__in=jobs).values_list('skill__normalized_name', flat=True)),
+            ['django', 'django', 'python', 'python', 'sql'])
+
+    def test_invalid_item_saves_nothing(self):
+        response = self.client.post(self.url, [self.item(), self.item(title=''), self.item()], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertIn('title', response.data['errors'][0]['errors'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_other_users_companies_are_rejected(self):
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass1234',
+            first_name='Ot', last_name='Her', role='employer')
+        company = Company.objects.create(name='Globex', description='Globex Ltd',
+                                         industry=self.industry, created_by=other)
+        response = self.client.post(self.url, [self.item(), self.item(company=str(company.pk))], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertIn('company', response.data['errors'][0]['errors'])
+        self.assertFalse(Job.objects.exists())
+
+    def test_batch_size_limit(self):
+        with mock.patch('jobs.views.MAX_BULK_JOBS', 2):
+            response = self.client.post(self.url, [self.item() for _ in range(3)], format='json')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['detail'], 'At most 2 jobs per request.')
+            response = self.client.post(self.url, [self.item() for _ in range(2)], format='json')
+            self.assertEqual(response.status_code, 201)
+        for body in ([], {'title': 'Not a list'}):
+            self.assertEqual(self.client.post(self.url, body, format='json').status_code, 400)
+
+
+class SlugTests(JobTestMixin, APITestCase):
+    """Slugs take the first free base, base-2, base-3... and fit the slug column"""
+
+    def test_allocator_skips_taken_slugs(self):
+        allocator = SlugAllocator({'engineer', 'engineer-2', 'engineer-4'})
+        self.assertEqual([allocator.allocate('engineer') for _ in range(3)],
+                         ['engineer-3', 'engineer-5', 'engineer-6'])
+        self.assertEqual(allocator.allocate('designer'), 'designer')
+
+    def test_collisions_get_numbered_suffixes(self):
+        # A longer slug sharing the prefix is not a collision
+        self.create_job(title='Engineer Lead')
+        base = slug_base(Job, ('Engineer', self.company.name))
+        slugs = [self.create_job(title='Engineer').slug for _ in range(3)]
+        self.assertEqual(slugs, [base, f"{base}-2", f"{base}-3"])
+
+    def test_assign_unique_slugs_in_bulk(self):
+        existing = self.create_job(title='Engineer')
+        jobs = [Job(title='Engineer', company=self.company) for _ in range(2)]
+        jobs.append(Job(title='Engineer', company=self.company, slug='kept'))
+        assign_unique_slugs(Job, jobs, Job.get_slug_text)
+        self.assertEqual([job.slug for job in jobs], [f"{existing.slug}-2", f"{existing.slug}-3", 'kept'])
+
+    def test_long_titles_keep_the_company(self):
+        max_length = Job._meta.get_field('slug').max_length
+        job = self.create_job(title='x' * 200)
+        self.assertLessEqual(len(job.slug), max_length - SUFFIX_ROOM)
+        self.assertEqual(job.slug, f"{'x' * (max_length - SUFFIX_ROOM - len(self.company.slug) - 1)}-{self.company.slug}")
+        # Suffixes still fit
+        self.assertEqual(self.create_job(title='x' * 200).slug, f"{job.slug}-2")
+
+        company = Company.objects.create(name='y' * 100, description='Ltd', industry=self.industry,
+                                         created_by=self.employer)
+        self.assertEqual(len(company.slug), max_length - SUFFIX_ROOM)
+        self.assertEqual(self.create_job(title='Engineer', company=company).slug, 'y' * (max_length - SUFFIX_ROOM))
+        self.assertEqual(slug_base(Job, ('!!!', '???')), 'job')
+
+    def test_save_retries_after_a_concurrent_insert(self):
+        taken = self.create_job(title='Engineer').slug
+        # The prefix query missed the row a concurrent request just inserted
+        with mock.patch('jobs.slugs.unique_slug', side_effect=[taken, f"{taken}-2"]) as allocate:
+            job = self.create_job(title='Engineer')
+        self.assertEqual(job.slug, f"{taken}-2")
+        self.assertEqual(allocate.call_count, 2)
+
+    def test_bulk_insert_retries_after_a_concurrent_insert(self):
+        taken = self.create_job(title='Engineer').slug
+        calls = []
+
+        def allocate(model, instances, get_text):
+            calls.append([instance.slug for instance in instances])
+            if len(calls) == 1:
+                for instance in instances:
+                    instance.slug = taken
+                return instances
+            return assign_unique_slugs(model, instances, get_text)
+
+        jobs = [Job(title='Engineer', company=self.company, industry=self.industry, posted_by=self.employer,
+                    application_deadline=datetime.date.today())]
+        with mock.patch('jobs.bulk.assign_unique_slugs', side_effect=allocate):
+            create_jobs(jobs, {})
+        self.assertEqual(calls, [[''], ['']])
+        self.assertEqual(Job.objects.get(pk=jobs[0].pk).slug, f"{taken}-2")
+
+
+class SkillMatrixTests(JobTestMixin, APITestCase):
+    """In-memory recommendations rank live jobs and pick up job changes incrementally"""
+
+    def setUp(self):
+        super().setUp()
+        self.full = self.create_job(title='Full', skills_required='Python, Django', experience_level='mid_level')
+        self.half = self.create_job(title='Half', skills_required='Python, Go', experience_level='mid_level')
+        self.senior = self.create_job(title='Senior', skills_required='Python, Django', experience_level='executive')
+        self.create_job(title='Other', skills_required='Go', experience_level='mid_level')
+        self.create_job(title='Expired', skills_required='Python', experience_level='mid_level',
+                        application_deadline=datetime.date.today() - datetime.timedelta(days=1))
+        self.python, self.django, self.go = (Skill.objects.get(normalized_name=name)
+                                             for name in ('python', 'django', 'go'))
+        # Older than the refresh watermark, so only rows saved later are re-read
+        Job.objects.update(updated_on=timezone.now() - datetime.timedelta(hours=1))
+        self.matrix = SkillMatrix()
+
+    def top(self, limit=10):
+        return [(Job.objects.get(pk=pk).title, round(score, 4))
+                for pk, score in self.matrix.top_jobs([self.python.pk, self.django.pk], 3, limit)]
+
+    def test_ranking(self):
+        self.assertEqual(self.top(), [('Full', 1.0), ('Senior', 0.7), ('Half', 0.65)])
+        self.assertEqual(self.top(limit=2), [('Full', 1.0), ('Senior', 0.7)])
+        self.assertEqual(self.matrix.top_jobs([uuid.uuid4()], 3), [])
+
+    def test_incremental_refresh(self):
+        self.top()
+        rebuilt_at = self.matrix.rebuilt_at
+
+        self.half.skills_required = 'Python, Django'
+        self.half.save()
+        self.full.is_active = False
+        self.full.save()
+        # Nothing is re-read until the listing generation moves
+        self.assertEqual([title for title, _ in self.top()], ['Full', 'Senior', 'Half'])
+
+        bump_generation()
+        with mock.patch.object(self.matrix, 'load_rows', wraps=self.matrix.load_rows) as load_rows:
+            self.assertEqual(self.top(), [('Half', 1.0), ('Senior', 0.7)])
+        self.assertEqual(list(load_rows.call_args.args[0].values_list('pk', flat=True)), [self.half.pk])
+        self.assertEqual(self.matrix.rebuilt_at, rebuilt_at)
+
+        self.create_job(title='New', skills_required='Django, Go', experience_level='mid_level')
+        bump_generation()
+        self.assertEqual(self.top(), [('Half', 1.0), ('Senior', 0.7), ('New', 0.65)])
+
+    def test_periodic_full_rebuild(self):
+        self.top()
+        self.matrix.rebuilt_at -= FULL_REBUILD_INTERVAL * 2
+        # A change that never touched updated_on, e.g. a skill merge
+        JobSkill.objects.filter(job=self.half, skill=self.go).update(skill=self.django)
+        bump_generation()
+        self.assertEqual(dict(self.top()), {'Full': 1.0, 'Half': 1.0, 'Senior': 0.7})
+
+
+class AsyncEndpointTests(JobTestMixin, APITestCase):
+    """/api/async/ serves the same listings, details and facets as the sync endpoints"""
+    url = '/api/async/jobs/availablejobs/'
+    sync_url = '/api/jobs/availablejobs/'
+
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job(title='Backend', job_type='full_time', salary_min=60000)
+        self.create_job(title='Frontend', job_type='contract')
+        self.expired = self.create_job(title='Expired',
+                                       application_deadline=datetime.date.today() - datetime.timedelta(days=1))
+        self.headers = {'Authorization': f'Bearer {AccessToken.for_user(self.employer)}'}
+
+    def get(self, url, **params):
+        return async_to_sync(self.async_client.get)(url, params, headers=self.headers)
+
+    def test_list(self):
+        response = self.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.client.get(self.sync_url).json())
+        self.assertEqual([job['title'] for job in self.get(self.url, job_type='contract').json()['results']],
+                         ['Frontend'])
+        self.assertEqual(self.get(self.url)['X-Cache'], 'HIT')
+
+    def test_retrieve(self):
+        response = self.get(f'{self.url}{self.job.pk}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.client.get(f'{self.sync_url}{self.job.pk}/').json())
+        etag = response['ETag']
+        response = async_to_sync(self.async_client.get)(
+            f'{self.url}{self.job.pk}/', headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_not_found(self):
+        for pk in (uuid.uuid4(), self.expired.pk):
+            self.assertEqual(self.get(f'{self.url}{pk}/').status_code, 404)
+        self.assertEqual(self.get(f'{self.url}not-a-uuid/').status_code, 404)
+
+    def test_facets(self):
+        response = self.get(f'{self.url}facets/', job_type='full_time')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), self.client.get(f'{self.sync_url}facets/', {'job_type': 'full_time'}).json())
+
+    def test_read_only(self):
+        response = async_to_sync(self.async_client.post)(self.url, {}, headers=self.headers)
+        self.assertEqual(response.status_code, 405)
+
+
+class ListingCacheTests(JobTestMixin, APITestCase):
+    """Any change to what the listings show invalidates cached listings and facets"""
+    urls = ['/api/jobs/availablejobs/', '/api/jobs/availablejobs/facets/']
+
+    def setUp(self):
+        super().setUp()
+        self.job = self.create_job(title='Backend')
+
+    def assertCached(self, outcome):
+        for url in self.urls:
+            self.assertEqual(self.client.get(url)['X-Cache'], outcome, url)
+
+    def change(self, update):
+        self.assertCached('HIT')
+        with self.captureOnCommitCallbacks(execute=True):
+            update()
+        self.assertCached('MISS')
+
+    def rename(self, instance, field, value):
+        def update():
+            setattr(instance, field, value)
+            instance.save()
+        return update
+
+    def test_changes_invalidate(self):
+        self.assertCached('MISS')
+        changes = [
+            self.rename(self.job, 'title', 'Backend Lead'),
+            self.rename(self.company, 'name', 'Renamed Ltd'),
+            self.rename(self.location, 'city', 'Kisumu'),
+            self.rename(self.industry, 'name', 'Software'),
+            lambda: self.job.location.add(self.create_location()),
+            lambda: self.company.locations.clear(),
+            lambda: self.create_job(title='Frontend'),
+            lambda: self.job.delete(),
+        ]
+        for update in changes:
+            self.change(update)
+
+        titles = [job['title'] for job in self.client.get(self.urls[0]).data['results']]
+        self.assertEqual(titles, ['Frontend'])
+        facets = self.client.get(self.urls[1]).data
+        self.assertIn('Software', json.dumps(facets))
+
+    def test_uncommitted_changes_keep_the_cache(self):
+        self.assertCached('MISS')
+        with self.captureOnCommitCallbacks(execute=False):
+            self.rename(self.job, 'title', 'Rolled back')()
+        self.assertCached('HIT')
+
+    def test_bulk_created_jobs_invalidate(self):
+        self.assertCached('MISS')
+        job = Job(title='Bulk', company=self.company, industry=self.industry, posted_by=self.employer,
+                  application_deadline=datetime.date.today() + datetime.timedelta(days=30))
+        with self.captureOnCommitCallbacks(execute=True):
+            create_jobs([job], {job.pk: [self.location.pk]})
+        self.assertCached('MISS')
+
+
+class FacetTests(JobTestMixin, APITestCase):
+    """Facet counts cover exactly the jobs the same filters list"""
+    url = '/api/jobs/availablejobs/facets/'
+
+    def setUp(self):
+        super().setUp()
+        finance = Industry.objects.create(name='Finance', description='Finance jobs')
+        remote = self.create_location(is_remote=True)
+        self.create_job(job_type='full_time', experience_level='senior', salary_min=60000, locations=[remote])
+        self.create_job(job_type='contract', experience_level='senior', salary_max=40000)
+        # Two locations, counted once
+        self.create_job(job_type='full_time', experience_level='entry', industry=finance,
+                        locations=[self.location, remote])
+        self.create_job(job_type='full_time', experience_level='entry', salary_min=250000,
+                        application_deadline=datetime.date.today() - datetime.timedelta(days=1))
+
+    def facets(self, **params):
+        cache.clear()
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        counts = {key: {item['value']: item['count'] for item in data[key] if item['count']}
+                  for key in ('industry', 'job_type', 'experience_level', 'is_remote', 'salary')}
+        return data['total'], counts
+
+    def test_unfiltered(self):
+        with self.assertNumQueries(1):
+            self.client.get(self.url)
+        total, counts = self.facets()
+        self.assertEqual(total, 3)
+        self.assertEqual(counts, {
+            'industry': {'technology': 2, 'finance': 1},
+            'job_type': {'full_time': 2, 'contract': 1},
+            'experience_level': {'senior': 2, 'entry': 1},
+            'is_remote': {True: 2, False: 1},
+            'salary': {'50k_100k': 1, 'under_50k': 1, 'not_specified': 1},
+        })
+
+    def test_filters_apply(self):
+        total, counts = self.facets(job_type='full_time')
+        self.assertEqual(total, 2)
+        self.assertEqual(counts['experience_level'], {'senior': 1, 'entry': 1})
+        self.assertEqual(counts['job_type'], {'full_time': 2})
+
+        total, counts = self.facets(location__is_remote='true')
+        self.assertEqual(total, 2)
+        self.assertEqual(counts['is_remote'], {True: 2})
+        self.assertEqual(counts['industry'], {'technology': 1, 'finance': 1})
+
+        total, counts = self.facets(industry__slug='technology', salary_min__gte=50000)
+        self.assertEqual((total, counts['salary']), (1, {'50k_100k': 1}))
+
+        total, counts = self.facets(job_type='part_time')
+        self.assertEqual(total, 0)
+        self.assertEqual(counts['job_type'], {})
+
+    def test_every_choice_is_listed(self):
+        data = self.client.get(self.url, {'job_type': 'part_time'}).data
+        self.assertEqual([item['value'] for item in data['job_type']], [value for value, _ in Job.job_type_choices])
+        self.assertEqual(len(data['salary']), len(SALARY_BUCKETS) + 1)
+
+
+class ProximityFilterTests(JobTestMixin, APITestCase):
+    """?near= keeps jobs within the radius, nearest first, across the antimeridian too"""
+    url = '/api/jobs/availablejobs/'
+    nairobi = '-1.2864,36.8172'
+
+    def located_job(self, title, *points):
+        locations = [self.create_location(city=f'{title} {number}', latitude=latitude, longitude=longitude)
+                     for number, (latitude, longitude) in enumerate(points)]
+        return self.create_job(title=title, locations=locations)
+
+    def near(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(job['title'], round(job['distance_km'])) for job in response.data['results']]
+
+    def test_radius_and_distance_order(self):
+        self.located_job('Thika', (-1.0333, 37.0693))
+        self.located_job('Westlands', (-1.2676, 36.8108))
+        self.located_job('CBD', (-1.2864, 36.8172))
+        # Nearest location counts, and the job appears once
+        self.located_job('Both', (-4.0435, 39.6682), (-1.3000, 36.8000))
+        self.located_job('Mombasa', (-4.0435, 39.6682))
+        self.create_job(title='Unlocated')
+
+        self.assertEqual(self.near(near=self.nairobi), [('CBD', 0), ('Westlands', 2), ('Both', 2)])
+        self.assertEqual([title for title, _ in self.near(near=self.nairobi, radius_km=50)],
+                         ['CBD', 'Westlands', 'Both', 'Thika'])
+        self.assertEqual(self.near(near=self.nairobi, radius_km=1000)[-1], ('Mombasa', 441))
+        # ?ordering= replaces the distance order
+        self.assertEqual([title for title, _ in self.near(near=self.nairobi, ordering='title')],
+                         ['Both', 'CBD', 'Westlands'])
+
+    def test_antimeridian(self):
+        min_latitude, max_latitude, ranges = bounding_box(0, 179.9, 30)
+        self.assertEqual(len(ranges), 2)
+        self.assertEqual((ranges[0][1], ranges[1][0]), (180, -180))
+
+        self.located_job('East', (0, -179.9))
+        self.located_job('West', (0, 179.8))
+        self.located_job('Far', (0, 178))
+        self.assertEqual(self.near(near='0,179.9', radius_km=30), [('West', 11), ('East', 22)])
+        self.assertEqual(self.near(near='0,-179.95', radius_km=30), [('East', 6), ('West', 28)])
+
+    def test_pole(self):
+        self.assertEqual(bounding_box(89.9, 0, 50)[2], [(-180, 180)])
+        self.located_job('Arctic', (89.8, 120))
+        self.assertEqual(self.near(near='89.9,-60', radius_km=50), [('Arctic', 33)])
+
+    def test_malformed_parameters(self):
+        for params in ({'near': 'nairobi'}, {'near': '1,2,3'}, {'near': '91,0'}, {'near': '0,181'},
+                       {'near': self.nairobi, 'radius_km': 'far'}, {'near': self.nairobi, 'radius_km': 0},
+                       {'near': self.nairobi, 'radius_km': 5000}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertTrue(set(response.data) & {'near', 'radius_km'}, response.data)
+
+
+class SparseFieldsetTests(JobTestMixin, APITestCase):
+    """?fields= and ?omit= narrow both the response and the columns read"""
+    url = '/api/jobs/availablejobs/'
+
+    def setUp(self):
+        super().setUp()
+        for _ in range(3):
+            self.job = self.create_job()
+
+    def fetch(self, url, **params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.data)
+        job_queries = [query['sql'] for query in context.captured_queries
+                       if 'FROM "jobs_job"' in query['sql'] and 'jobs_job_location' not in query['sql']]
+        self.assertEqual(len(job_queries), 1)
+        return response.data, job_queries[0], len(context.captured_queries)
+
+    def assertColumns(self, sql, selected=(), skipped=()):
+        select = sql.split(' FROM ')[0]
+        for column in selected:
+            self.assertIn(f'"jobs_job"."{column}"', select)
+        for column in skipped:
+            self.assertNotIn(f'"jobs_job"."{column}"', select)
+
+    def test_fields(self):
+        data, sql, queries = self.fetch(self.url, fields='id,title')
+        self.assertEqual([set(job) for job in data['results']], [{'id', 'title'}] * 3)
+        # posted_on is kept for the pagination cursor; locations aren't prefetched
+        self.assertColumns(sql, ['id', 'title', 'posted_on'], ['skills_required', 'salary_min', 'slug'])
+        self.assertEqual(queries, 1)
+
+    def test_omit(self):
+        data, sql, queries = self.fetch(self.url, omit='location,skills_required')
+        self.assertNotIn('location', data['results'][0])
+        self.assertNotIn('skills_required', data['results'][0])
+        self.assertIn('salary_min', data['results'][0])
+        self.assertColumns(sql, ['salary_min'], ['skills_required'])
+        self.assertEqual(queries, 1)
+
+    def test_list_and_retrieve_defaults(self):
+        data, sql, _ = self.fetch(self.url)
+        self.assertNotIn('description', data['results'][0])
+        self.assertColumns(sql, ['skills_required'], ['description', 'requirements', 'responsibilities'])
+
+        data, sql, _ = self.fetch(f'{self.url}{self.job.pk}/', fields='title,description')
+        self.assertEqual(set(data), {'title', 'description'})
+        self.assertColumns(sql, ['title', 'description'], ['requirements', 'responsibilities'])
+
+    def test_cursor_with_fields(self):
+        data, _, _ = self.fetch(self.url, fields='title', page_size=2)
+        response = self.client.get(data['next'])
+        self.assertEqual([set(job) for job in response.data['results']], [{'title'}])
+
+    def test_unknown_fields(self):
+        for params in ({'fields': 'title,salary'}, {'omit': 'bogus'}):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(list(response.data), list(params))
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    """The orjson renderer and parser must agree with DRF's stdlib ones"""
+
+    data = {
+        'id': uuid.uuid4(), 'salary_min': decimal.Decimal('50000.00'), 'posted_on': timezone.now(),
+        'application_deadline': datetime.date(2030, 1, 1), 'title': 'Ingénieur\u2028logiciel',
+        'tags': {'python'}, 'location': [{'city': 'Nairobi', 'is_remote': False}], 1: None,
+    }
+
+    def test_render_matches_stdlib(self):
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_indent_and_unsupported_values_fall_back(self):
+        data = {'count': 2 ** 70}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(ORJSONRenderer().render(data, 'application/json; indent=4'),
+                         JSONRenderer().render(data, 'application/json; indent=4'))
+
+    def test_parse_round_trip(self):
+        body = ORJSONRenderer().render(self.data)
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_parse_error_matches_stdlib(self):
+        errors = []
+        for parser in (JSONParser(), ORJSONParser()):
+            with self.assertRaises(ParseError) as context:
+                parser.parse(io.BytesIO(b'{"title": '))
+            errors.append(str(context.exception))
+        self.assertEqual(errors[0], errors[1])
+
+
+class ExpireJobsTests(JobTestMixin, APITestCase):
+    """expire_jobs deactivates jobs past their deadline; listings only show live jobs"""
+
+    def setUp(self):
+        super().setUp()
+        today = datetime.date.today()
+        self.live = self.create_job(title='Live')
+        self.due_today = self.create_job(title='Due today', application_deadline=today)
+        self.inactive = self.create_job(title='Inactive', is_active=False)
+        self.expired = [self.create_job(title=f'Expired {number}',
+                                        application_deadline=today - datetime.timedelta(days=number + 1))
+                        for number in range(5)]
+        self.stale = timezone.now() - datetime.timedelta(days=1)
+        Job.objects.update(updated_on=self.stale)
+
+    def test_available_jobs(self):
+        self.assertEqual(set(Job.objects.available()), {self.live, self.due_today})
+        self.assertEqual(sorted(self.list_titles()), ['Due today', 'Live'])
+        self.assertEqual(self.client.get(f'/api/jobs/availablejobs/{self.expired[0].pk}/').status_code, 404)
+        self.assertEqual(self.client.get(f'/api/jobs/availablejobs/{self.inactive.pk}/').status_code, 404)
+
+    def test_expire_in_chunks(self):
+        generation = get_generation()
+        out = io.StringIO()
+        with CaptureQueriesContext(connection) as context:
+            call_command('expire_jobs', chunk_size=2, stdout=out)
+
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 3)
+        self.assertIn('5 expired jobs deactivated.', out.getvalue())
+        self.assertFalse(Job.objects.expired().exists())
+        flipped = Job.objects.filter(pk__in=[job.pk for job in self.expired])
+        self.assertFalse(flipped.filter(is_active=True).exists())
+        self.assertFalse(flipped.filter(updated_on=self.stale).exists())
+        # Live jobs, including one due today, are left alone
+        self.assertEqual(set(Job.objects.filter(updated_on=self.stale)), {self.live, self.due_today, self.inactive})
+        self.assertTrue(Job.objects.get(pk=self.due_today.pk).is_active)
+        self.assertNotEqual(get_generation(), generation)
+
+    def test_nothing_to_expire(self):
+        call_command('expire_jobs', stdout=io.StringIO())
+        generation = get_generation()
+        out = io.StringIO()
+        call_command('expire_jobs', stdout=out)
+        self.assertIn('0 expired jobs deactivated.', out.getvalue())
+        self.assertEqual(get_generation(), generation)
+
+    def test_dry_run(self):
+        out = io.StringIO()
+        call_command('expire_jobs', dry_run=True, stdout=out)
+        self.assertIn('5 jobs would be deactivated.', out.getvalue())
+        self.assertEqual(Job.objects.expired().count(), 5)
+
+
+class ImportJobsTests(TestCase):
+    """import_jobs: owner-scoped companies, row errors and resuming"""
+    header = 'title,company,industry,locations,description,requirements,responsibilities,skills_required,application_deadline\n'
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.employer = User.objects.create_user(
+            username='emp', email='emp@example.com', password='pass1234',
+            first_name='Em', last_name='Ployer', role='employer')
+        self.other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass1234',
+            first_name='Ot', last_name='Her', role='employer')
+        industry = Industry.objects.create(name='Technology', description='Tech jobs')
+        self.nairobi = Location.objects.create(country='Kenya', city='Nairobi', region='Nairobi',
+                                               created_by=self.employer)
+        self.acme = Company.objects.create(name='Acme', description='Acme Ltd', industry=industry,
+                                           created_by=self.employer)
+        self.acme.locations.set([self.nairobi])
+
+    def write(self, *rows):
+        path = os.path.join(self.directory.name, 'jobs.csv')
+        deadline = (datetime.date.today() + datetime.timedelta(days=30)).isoformat()
+        with open(path, 'w') as handle:
+            handle.write(self.header)
+            for title, company, locations in rows:
+                handle.write(f'{title},{company},Technology,"{locations}",Build,Python,APIs,Python,{deadline}\n')
+        return path
+
+    def run_import(self, path, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command('import_jobs', path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_other_owners_companies_are_not_used(self):
+        path = self.write(('Engineer', 'Acme', 'Kenya, Mombasa, Coast'))
+        _, err = self.run_import(path, '--owner', 'other')
+
+        # Company names are unique, so the row can't get its own Acme either
+        self.assertIn('Row 1 skipped: {"company"', err)
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(list(self.acme.locations.all()), [self.nairobi])
+
+    def test_row_errors_are_reported_and_skipped(self):
+        path = self.write(('Engineer', 'Acme', 'Kenya, Nairobi, Nairobi'), ('', 'Acme', ''),
+                          ('Designer', 'Acme', ''))
+        out, err = self.run_import(path, '--owner', 'emp')
+
+        self.assertEqual(sorted(Job.objects.values_list('title', flat=True)), ['Designer', 'Engineer'])
+        self.assertIn('Row 2 skipped: {"title"', err)
+        self.assertIn('2 jobs imported, 1 rows skipped', out)
+
+    def test_resume_after_crash_between_commit_and_checkpoint(self):
+        path = self.write(*[(f'Engineer {number}', 'Acme', '') for number in range(3)])
+        write_checkpoint = ImportCommand.write_checkpoint
+
+        def crash_after_second_batch(command, checkpoint, source, rows, pending=None):
+            if rows == 2 and pending is None:
+                raise KeyboardInterrupt
+            write_checkpoint(command, checkpoint, source, rows, pending)
+
+        with mock.patch.object(ImportCommand, 'write_checkpoint', crash_after_second_batch):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_import(path, '--owner', 'emp', '--batch-size', '1')
+        self.assertEqual(Job.objects.count(), 2)
+
+        out, _ = self.run_import(path, '--owner', 'emp', '--batch-size', '1', '--resume')
+        self.assertIn('Resuming after row 2.', out)
+        self.assertEqual(sorted(Job.objects.values_list('title', flat=True)),
+                         ['Engineer 0', 'Engineer 1', 'Engineer 2'])
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+    def test_failed_batch_rolls_back_created_companies(self):
+        path = self.write(('Engineer', 'Globex', 'Kenya, Kisumu, Western'))
+        with mock.patch('jobs.imports.create_jobs', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, '--owner', 'emp')
+        self.assertFalse(Company.objects.filter(name='Globex').exists())
+        self.assertFalse(Location.objects.filter(city='Kisumu').exists())
+
+        self.run_import(path, '--owner', 'emp', '--resume')
+        self.assertEqual(Job.objects.get().company.name, 'Globex')
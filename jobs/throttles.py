@@ -1,4 +1,4 @@
-from rest_framework.throttling import UserRateThrottle
+from job_board_backend.throttling import UserRateThrottle
 from rest_framework.exceptions import Throttled
 
 class CustomUserThrottle(UserRateThrottle):
@@ -8,4 +8,13 @@ class CustomUserThrottle(UserRateThrottle):
         # Custom error message
         message = "Too many attempts. Please wait before trying again."
         # Raise custom message
-        raise Throttled(detail=message)
\ No newline at end of file
+        raise Throttled(detail=message)
+
+
+class BulkJobPostThrottle(UserRateThrottle):
+    # Own quota (DEFAULT_THROTTLE_RATES['bulk_jobs']), separate from the 5/minute single posts
+    scope = 'bulk_jobs'
+
+    def throttle_failure(self):
+        message = "Too many bulk uploads. Please wait before trying again."
+        raise Throttled(detail=message)
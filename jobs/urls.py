@@ -1,6 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import IndustryViewset, LocationViewset, CompanyViewset, PostJobViewset, AvailableJobsViewset
+from .views import IndustryViewset, LocationViewset, CompanyViewset, PostJobViewset, AvailableJobsViewset, RecommendedJobsViewset
 
 router = DefaultRouter()
 router.register(r'industries', IndustryViewset, basename='industries')
@@ -8,6 +8,7 @@ router.register(r'locations', LocationViewset, basename='locations')
 router.register(r'companies', CompanyViewset, basename='companies')
 router.register(r'postjobs', PostJobViewset, basename='postjobs')
 router.register(r'availablejobs', AvailableJobsViewset, basename='availablejobs')
+router.register(r'recommended', RecommendedJobsViewset, basename='recommended')
 
 urlpatterns = [
     path('', include(router.urls)),
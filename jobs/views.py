@@ -1,27 +1,40 @@
-from rest_framework import viewsets
-from .serializers import IndustrySerializer, LocationSerializer, CompanySerializer, PostJobSerializer, AvailableJobsSerializer
+import uuid
+from asgiref.sync import sync_to_async
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.filters import SearchFilter, OrderingFilter
+from django_filters.rest_framework import DjangoFilterBackend
+from .serializers import IndustrySerializer, LocationSerializer, CompanySerializer, PostJobSerializer, BulkPostJobSerializer, JobListSerializer, AvailableJobsSerializer, RecommendedJobSerializer
 from .models import Industry, Location, Company, Job
-from .permissions import IsAdminOrEmployer, IsEmployer, IsLocationOwner, IsCompanyOwner, IsJobOwner
-from .throttles import CustomUserThrottle
-from django.views.decorators.cache import cache_page
-from django.views.decorators.vary import vary_on_headers
-from django.utils.decorators import method_decorator
+from .permissions import IsAdminOrEmployer, IsEmployer, IsJobSeeker, IsLocationOwner, IsCompanyOwner, IsJobOwner
+from .throttles import CustomUserThrottle, BulkJobPostThrottle
+from .filters import JobFilterSet, FullTextSearchFilter, SkillFilter, ProximityFilter
+from .cache import CachedListingMixin, GenerationConditionalMixin
+from job_board_backend.sparse_fieldsets import SparseFieldsetMixin
+from job_board_backend.async_views import AsyncViewSetMixin
+from .facets import compute_facets, acompute_facets
+from .bulk import create_jobs, MAX_BULK_JOBS
+from .recommendations import recommend_jobs, DEFAULT_LIMIT, MAX_LIMIT
 
 # Create your views here.
-class IndustryViewset(viewsets.ModelViewSet):
+class IndustryViewset(GenerationConditionalMixin, viewsets.ModelViewSet):
     queryset = Industry.objects.all()
     serializer_class = IndustrySerializer
     permission_classes = [IsAdminOrEmployer]
     # For general keyword search
     search_fields = ['name', 'slug', 'description']
+    # Keyset pagination needs non-nullable ordering columns
+    ordering_fields = ['name', 'created_at', 'updated_at']
 
 
-class LocationViewset(viewsets.ModelViewSet):
+class LocationViewset(GenerationConditionalMixin, viewsets.ModelViewSet):
     queryset = Location.objects.all()
     serializer_class = LocationSerializer
     permission_classes = [IsEmployer, IsLocationOwner]
     # For general keyword search
     search_fields = ['country', 'city', 'region', 'is_remote']
+    ordering_fields = ['country', 'city', 'region', 'created_at']
 
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
@@ -35,7 +48,7 @@ class LocationViewset(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class CompanyViewset(viewsets.ModelViewSet):
+class CompanyViewset(GenerationConditionalMixin, viewsets.ModelViewSet):
     queryset = Company.objects.all()
     serializer_class = CompanySerializer
     permission_classes = [IsEmployer, IsCompanyOwner]
@@ -43,13 +56,14 @@ class CompanyViewset(viewsets.ModelViewSet):
     search_fields = ['name', 'slug', 'industry', 'location__country', 
                      'location__region', 'location__city', 'description', 
                      'website_url']
+    ordering_fields = ['name', 'created_at', 'updated_at']
     
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Company.objects.none()
         
         # Filter by created_by - only show user's own companies
-        return Company.objects.filter(created_by=self.request.user)
+        return Company.objects.filter(created_by=self.request.user).prefetch_related('locations')
     
     def perform_create(self, serializer):
         # Automatically set created_by
@@ -57,7 +71,7 @@ class CompanyViewset(viewsets.ModelViewSet):
         serializer.save(created_by=self.request.user)
 
 
-class PostJobViewset(viewsets.ModelViewSet):
+class PostJobViewset(GenerationConditionalMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = PostJobSerializer
     permission_classes = [IsEmployer, IsJobOwner]
@@ -66,13 +80,20 @@ class PostJobViewset(viewsets.ModelViewSet):
     search_fields = ['title', 'slug', 'industry__name', 'location__country', 
                      'location__region', 'description', 'experience_level', 
                      'requirements', 'responsibilities', 'skills_required']
+    ordering_fields = ['posted_on', 'updated_on', 'application_deadline', 'title']
     
     def get_queryset(self):
         if getattr(self, 'swagger_fake_view', False):
             return Job.objects.none()
         
         # Filter by posted_by - only show user's own jobs
-        return Job.objects.filter(posted_by=self.request.user)
+        return Job.objects.filter(posted_by=self.request.user).prefetch_related('location')
+
+    def get_serializer_class(self):
+        # Compact rows for lists; full job for retrieve and writes
+        if self.action == 'list':
+            return JobListSerializer
+        return PostJobSerializer
     
     def perform_create(self, serializer):
         company = serializer.validated_data.get("company")
@@ -86,11 +107,154 @@ class PostJobViewset(viewsets.ModelViewSet):
         # Assign locations AFTER saving
         job.location.set(locations)  # .set() works for ManyToMany
 
+    @action(detail=False, methods=['post'], throttle_classes=[BulkJobPostThrottle])
+    def bulk(self, request):
+        """
+        Post up to 500 jobs in one request
+        - Body is a list of job objects as accepted by POST /postjobs/
+        - Jobs may only reference companies the user created
+        - All or nothing: any invalid item returns 400 with errors listed
+          per item index and nothing is saved
+        """
+        items = request.data
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Expected a non-empty list of jobs."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > MAX_BULK_JOBS:
+            return Response({"detail": f"At most {MAX_BULK_JOBS} jobs per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        companies = self.bulk_companies(items)
+        context = {**self.get_serializer_context(), 'companies': companies}
+        validated, errors = [], []
+        for index, item in enumerate(items):
+            serializer = BulkPostJobSerializer(data=item, context=context)
+            if serializer.is_valid():
+                validated.append(serializer.validated_data)
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        location_ids = {}
+        for company_id, location_id in Company.locations.through.objects.filter(
+                company_id__in=companies).values_list('company_id', 'location_id'):
+            location_ids.setdefault(company_id, []).append(location_id)
+
+        jobs = [
+            # Same defaults perform_create applies to single posts
+            Job(**data, posted_by=request.user, industry_id=data['company'].industry_id)
+            for data in validated
+        ]
+        create_jobs(jobs, {job.pk: location_ids.get(job.company_id, []) for job in jobs})
+        return Response(
+            {'created': len(jobs),
+             'results': [{'id': job.pk, 'slug': job.slug, 'title': job.title} for job in jobs]},
+            status=status.HTTP_201_CREATED)
 
-class AvailableJobsViewset(viewsets.ReadOnlyModelViewSet):
+    def bulk_companies(self, items):
+        """{id: Company} for the user's companies referenced by the items, in one query"""
+        ids = set()
+        for item in items:
+            try:
+                ids.add(uuid.UUID(str(item['company'])))
+            except (TypeError, KeyError, ValueError):
+                continue  # reported by the serializer
+        return Company.objects.filter(pk__in=ids, created_by=self.request.user).in_bulk()
+
+
+class AvailableJobsViewset(GenerationConditionalMixin, CachedListingMixin, SparseFieldsetMixin,
+                           viewsets.ReadOnlyModelViewSet):
     queryset = Job.objects.all()
     serializer_class = AvailableJobsSerializer
+    # ?q= runs ranked full-text search; ?search= keeps the icontains search
+    # ?near= sorts by distance unless ?q= ranking or ?ordering= applies later
+    filter_backends = [DjangoFilterBackend, SkillFilter, ProximityFilter, SearchFilter,
+                       FullTextSearchFilter, OrderingFilter]
+    filterset_class = JobFilterSet
     # For general keyword sear
     search_fields = ['title', 'slug', 'industry__name', 'location__country', 
                      'location__region', 'description', 'experience_level', 
-                     'requirements', 'responsibilities', 'skills_required']
\ No newline at end of file
+                     'requirements', 'responsibilities', 'skills_required']
+    ordering_fields = ['posted_on', 'updated_on', 'application_deadline', 'title']
+
+    def get_queryset(self):
+        # Only live postings; the deadline is evaluated per request
+        return Job.objects.available().prefetch_related('location')
+
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return JobListSerializer
+        return AvailableJobsSerializer
+
+    @action(detail=False, methods=['get'], pagination_class=None)
+    def facets(self, request):
+        """
+        Sidebar counts for the current search
+        - Accepts the same filters as the list endpoint
+        - Counts per industry, job type, experience level, remote and salary bucket
+        - Cached per filter signature like the listings
+        """
+        return self.cached_response(self.facet_counts, request)
+
+    def facet_counts(self, request):
+        queryset = self.filter_queryset(self.get_queryset())
+        return Response(compute_facets(queryset))
+
+
+class AsyncAvailableJobsViewset(AsyncViewSetMixin, AvailableJobsViewset):
+    """
+    AvailableJobsViewset on the async ORM, served under /api/async/
+    Same filters, caching and conditional requests as the sync endpoints.
+    """
+    async def list(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.cached_list, request, *args, **kwargs)
+
+    async def retrieve(self, request, *args, **kwargs):
+        return await self.aconditional_response(self.cached_retrieve, request, *args, **kwargs)
+
+    async def cached_list(self, request, *args, **kwargs):
+        return await self.acached_response(self.alist, request, *args, **kwargs)
+
+    async def cached_retrieve(self, request, *args, **kwargs):
+        return await self.acached_response(self.aretrieve, request, *args, **kwargs)
+
+    @action(detail=False, methods=['get'], pagination_class=None)
+    async def facets(self, request):
+        return await self.acached_response(self.afacet_counts, request)
+
+    async def afacet_counts(self, request):
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        return Response(await acompute_facets(queryset))
+
+
+class RecommendedJobsViewset(viewsets.GenericViewSet):
+    """
+    Live jobs ranked for the logged-in job seeker
+    - Scored on profile skills and experience years against each job's
+      skills and experience level (see jobs.matching)
+    - Returns the top ?limit= jobs (default 20, at most 100), best first
+    """
+    serializer_class = RecommendedJobSerializer
+    permission_classes = [IsJobSeeker]
+    pagination_class = None
+
+    def get_queryset(self):
+        return Job.objects.available().prefetch_related('location')
+
+    def list(self, request):
+        try:
+            limit = min(max(int(request.query_params.get('limit', DEFAULT_LIMIT)), 1), MAX_LIMIT)
+        except ValueError:
+            limit = DEFAULT_LIMIT
+
+        ranked = recommend_jobs(request.user, limit)
+        jobs = self.get_queryset().in_bulk([job_id for job_id, _ in ranked])
+        results = []
+        for job_id, score in ranked:
+            # Skip jobs that closed since the ranking was cached
+            job = jobs.get(job_id)
+            if job is not None:
+                job.match_score = round(score, 4)
+                results.append(job)
+        return Response(self.get_serializer(results, many=True).data)
@@ -1,3 +1,21 @@
 from django.contrib import admin
+from .models import Notification, OutboxEvent, UnreadCounter
 
-# Register your models here.
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ['title', 'recipient', 'kind', 'is_read', 'created_at']
+    list_filter = ['kind', 'is_read']
+    list_select_related = ['recipient']
+    raw_id_fields = ['recipient', 'application']
+admin.site.register(Notification, NotificationAdmin)
+
+class OutboxEventAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'recipient', 'created_at']
+    list_select_related = ['recipient']
+    raw_id_fields = ['recipient', 'application']
+admin.site.register(OutboxEvent, OutboxEventAdmin)
+
+class UnreadCounterAdmin(admin.ModelAdmin):
+    list_display = ['user', 'count']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+admin.site.register(UnreadCounter, UnreadCounterAdmin)
@@ -0,0 +1,90 @@
+import datetime
+import functools
+import time
+from collections import namedtuple
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Min
+from django.template.loader import get_template
+from django.utils import timezone
+from .models import Notification
+
+# One sent batch: emails sent, notifications they covered, seconds spent
+Batch = namedtuple('Batch', ['messages', 'notifications', 'seconds'])
+
+
+@functools.cache
+def digest_templates():
+    """The text and HTML templates, parsed once per process and reused for every digest"""
+    return get_template('notifications/digest.txt'), get_template('notifications/digest.html')
+
+
+def due_recipients(window, now):
+    """Ids of users whose oldest notification not yet emailed is at least window old"""
+    return list(
+        Notification.objects
+        .filter(emailed_at__isnull=True, created_at__lte=now)
+        .values('recipient')
+        .annotate(oldest=Min('created_at'))
+        .filter(oldest__lte=now - window)
+        .order_by('recipient')
+        .values_list('recipient', flat=True)
+    )
+
+
+def build_digest(recipient, notifications):
+    text, html = digest_templates()
+    context = {
+        'name': recipient.first_name or recipient.username,
+        'notifications': notifications,
+        'count': len(notifications),
+    }
+    subject = (f"{notifications[0].title}" if len(notifications) == 1
+               else f"{len(notifications)} updates on your applications")
+    message = EmailMultiAlternatives(subject, text.render(context), settings.DEFAULT_FROM_EMAIL,
+                                     [recipient.email])
+    message.attach_alternative(html.render(context), 'text/html')
+    return message
+
+
+def send_digests(window=None, batch_size=None, now=None, connection=None):
+    """
+    Email every due recipient one digest of their pending notifications; yields a Batch per batch
+    - A recipient is due once their oldest pending notification is window
+      old, so everything that happened within the window shares one email
+    - Notifications read in the app meanwhile are left out of the email
+    - Each batch of batch_size digests goes out over one SMTP connection and
+      its notifications are then marked emailed; a failed batch raises and
+      is retried on the next run
+    """
+    window = window or datetime.timedelta(minutes=settings.DIGEST_WINDOW_MINUTES)
+    batch_size = batch_size or settings.DIGEST_BATCH_SIZE
+    now = now or timezone.now()
+    connection = connection or get_connection()
+    recipients = due_recipients(window, now)
+
+    for start in range(0, len(recipients), batch_size):
+        started = time.perf_counter()
+        pending = (Notification.objects
+                   .filter(recipient_id__in=recipients[start:start + batch_size],
+                           emailed_at__isnull=True, created_at__lte=now)
+                   .select_related('recipient')
+                   .order_by('recipient', 'created_at'))
+        by_recipient = {}
+        for notification in pending:
+            by_recipient.setdefault(notification.recipient, []).append(notification)
+
+        messages = []
+        for recipient, notifications in by_recipient.items():
+            unread = [notification for notification in notifications if not notification.is_read]
+            if unread and recipient.email:
+                messages.append(build_digest(recipient, unread))
+        if messages:
+            # send_messages() opens the connection once for the whole batch
+            with connection:
+                connection.send_messages(messages)
+
+        emailed = [notification.pk for notifications in by_recipient.values()
+                   for notification in notifications]
+        Notification.objects.filter(pk__in=emailed).update(emailed_at=timezone.now())
+        yield Batch(len(messages), len(emailed), time.perf_counter() - started)
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand
+from notifications.outbox import BATCH_SIZE, drain_batch
+
+
+class Command(BaseCommand):
+    help = ("Turn pending outbox events into in-app notifications; drains once, "
+            "or keeps polling with --loop (run as a worker process)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help="Number of events turned into notifications per transaction")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep draining, sleeping --interval seconds whenever the outbox is empty")
+        parser.add_argument('--interval', type=float, default=2,
+                            help="Seconds between polls of an empty outbox with --loop")
+
+    def handle(self, *args, **options):
+        while True:
+            start = time.perf_counter()
+            drained = 0
+            while batch := drain_batch(options['batch_size']):
+                drained += batch
+            if drained:
+                elapsed = time.perf_counter() - start
+                self.stdout.write(f"{drained} notifications created in {elapsed:.2f}s "
+                                  f"({drained / elapsed:.0f}/s)")
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS("Outbox drained."))
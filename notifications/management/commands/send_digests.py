@@ -0,0 +1,35 @@
+import datetime
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from notifications.digests import send_digests
+
+
+class Command(BaseCommand):
+    help = ("Email each user a digest of their notifications not yet emailed "
+            "(run every few minutes, e.g. from cron)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--window', type=int, default=settings.DIGEST_WINDOW_MINUTES,
+                            help="Minutes the oldest pending notification waits, so later ones join its digest")
+        parser.add_argument('--batch-size', type=int, default=settings.DIGEST_BATCH_SIZE,
+                            help="Digests sent over one SMTP connection")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        batch_sizes = []
+        notifications = 0
+        for batch in send_digests(datetime.timedelta(minutes=options['window']), options['batch_size']):
+            batch_sizes.append(batch.messages)
+            notifications += batch.notifications
+            rate = batch.messages / batch.seconds if batch.seconds else 0
+            self.stdout.write(f"Sent {batch.messages} digests ({batch.notifications} notifications) "
+                              f"in {batch.seconds:.2f}s, {rate:.1f} messages/s")
+
+        elapsed = time.perf_counter() - start
+        messages = sum(batch_sizes)
+        if batch_sizes:
+            self.stdout.write(
+                f"{len(batch_sizes)} batches, {messages / len(batch_sizes):.1f} digests per batch "
+                f"on average (largest {max(batch_sizes)}), {messages / elapsed:.1f} messages/s overall")
+        self.stdout.write(self.style.SUCCESS(f"{messages} digests sent for {notifications} notifications."))
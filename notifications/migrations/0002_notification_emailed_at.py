@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 20:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0011_applyjob_updated_on'),
+        ('notifications', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='emailed_at',
+            field=models.DateTimeField(blank=True, help_text='When the notification went out in an email digest', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(condition=models.Q(('emailed_at__isnull', True)), fields=['recipient', 'created_at'], name='notification_digest_pending'),
+        ),
+    ]
@@ -1,3 +1,82 @@
 from django.db import models
+import uuid
+from django.conf import settings
+from applications.models import ApplyJob
 
-# Create your models here.
+KIND_CHOICES = [
+    ('application_received', 'Application received'),
+    ('status_changed', 'Application status changed'),
+]
+
+
+class OutboxEvent(models.Model):
+    """
+    Event written in the same transaction as the change it reports
+    drain_outbox turns pending events into notifications in batches and
+    deletes them; an event exists only if its change was committed.
+    """
+    kind = models.CharField(choices=KIND_CHOICES, max_length=50)
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                  related_name='+')
+    application = models.ForeignKey(ApplyJob, on_delete=models.CASCADE, related_name='+')
+    payload = models.JSONField(default=dict, blank=True,
+                               help_text="Details as of the change, e.g. the previous and new status")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
+        # Drained oldest first, which is the primary key order
+
+    def __str__(self):
+        return f"{self.kind} for {self.recipient_id} ({self.created_at})"
+
+
+class Notification(models.Model):
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+    )
+    recipient = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                  related_name='notifications')
+    kind = models.CharField(choices=KIND_CHOICES, max_length=50)
+    application = models.ForeignKey(ApplyJob, on_delete=models.CASCADE, related_name='notifications')
+    title = models.CharField(max_length=200)
+    message = models.TextField()
+    is_read = models.BooleanField(default=False)
+    read_at = models.DateTimeField(blank=True, null=True)
+    emailed_at = models.DateTimeField(blank=True, null=True,
+                                      help_text="When the notification went out in an email digest")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Notification'
+        verbose_name_plural = 'Notifications'
+        ordering = ['-created_at']
+        indexes = [
+            # Keyset pagination over one user's notifications
+            models.Index(fields=['recipient', '-created_at', '-id']),
+            models.Index(fields=['recipient', 'is_read']),
+            # send_digests only reads notifications not yet emailed
+            models.Index(fields=['recipient', 'created_at'], condition=models.Q(emailed_at__isnull=True),
+                         name='notification_digest_pending'),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.recipient_id})"
+
+
+class UnreadCounter(models.Model):
+    """Unread notifications per user, kept in step so the badge count isn't a COUNT(*)"""
+    user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+                                primary_key=True, related_name='unread_counter')
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Unread Counter'
+        verbose_name_plural = 'Unread Counters'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.count} unread"
@@ -0,0 +1,99 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from applications.models import ApplyJob
+from .models import Notification, OutboxEvent, UnreadCounter
+
+BATCH_SIZE = 500
+STATUS_LABELS = dict(ApplyJob.status_choices)
+
+
+# Call these inside the transaction that saves the application, so an event
+# is recorded exactly when its change is committed
+
+def record_application(application):
+    """Tell the job's poster about a new application"""
+    OutboxEvent.objects.create(kind='application_received', recipient_id=application.job.posted_by_id,
+                               application=application)
+
+
+def record_status_change(application, previous_status):
+    """Tell the applicant their application moved from previous_status"""
+    OutboxEvent.objects.create(kind='status_changed', recipient_id=application.applicant_id,
+                               application=application,
+                               payload={'previous_status': previous_status, 'status': application.status})
+
+
+def build_notification(event):
+    application = event.application
+    job = application.job
+    if event.kind == 'application_received':
+        applicant = application.applicant
+        name = applicant.get_full_name() or applicant.username
+        title = f"New application for {job.title}"
+        message = f"{name} applied for {job.title}."
+    else:
+        previous = STATUS_LABELS.get(event.payload.get('previous_status'), 'Pending')
+        current = STATUS_LABELS.get(event.payload.get('status'), application.get_status_display())
+        title = f"Application update: {job.title}"
+        message = f"Your application for {job.title} at {job.company.name} moved from {previous} to {current}."
+    return Notification(recipient_id=event.recipient_id, kind=event.kind,
+                        application_id=event.application_id, title=title, message=message)
+
+
+def drain_batch(batch_size=BATCH_SIZE):
+    """
+    Turn up to batch_size outbox events into notifications; returns how many
+    One transaction per batch: the events are read with their applications,
+    the notifications inserted with one bulk_create, the unread counters
+    bumped and the events deleted. Workers running side by side skip each
+    other's locked rows (on databases with SKIP LOCKED).
+    """
+    with transaction.atomic():
+        events = list(
+            OutboxEvent.objects
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('application__job__company', 'application__applicant')
+            .order_by('pk')[:batch_size]
+        )
+        if not events:
+            return 0
+        Notification.objects.bulk_create([build_notification(event) for event in events])
+        unread = defaultdict(int)
+        for event in events:
+            unread[event.recipient_id] += 1
+        add_unread(unread)
+        OutboxEvent.objects.filter(pk__in=[event.pk for event in events]).delete()
+    return len(events)
+
+
+def add_unread(counts):
+    """Add {user_id: new notifications} to the counters, one UPDATE per distinct increment"""
+    UnreadCounter.objects.bulk_create([UnreadCounter(user_id=user_id) for user_id in counts],
+                                      ignore_conflicts=True)
+    users_by_increment = defaultdict(list)
+    for user_id, count in counts.items():
+        users_by_increment[count].append(user_id)
+    for count, user_ids in users_by_increment.items():
+        UnreadCounter.objects.filter(user_id__in=user_ids).update(count=F('count') + count)
+
+
+def remove_unread(user_id, count=1):
+    """Take count notifications off the user's counter, never below zero"""
+    UnreadCounter.objects.filter(user_id=user_id).update(count=Greatest(F('count') - count, 0))
+
+
+def mark_read(user, notifications):
+    """Mark the user's unread notifications among notifications read; returns how many"""
+    with transaction.atomic():
+        read = notifications.filter(recipient=user, is_read=False).update(
+            is_read=True, read_at=timezone.now())
+        if read:
+            remove_unread(user.pk, read)
+    return read
+
+
+def unread_count(user):
+    return UnreadCounter.objects.filter(user=user).values_list('count', flat=True).first() or 0
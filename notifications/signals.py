@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from .models import Notification
+from .outbox import remove_unread
+
+
+# Notifications deleted along with their application (or any other way)
+# must not stay in the unread count
+@receiver(post_delete, sender=Notification)
+def forget_deleted_notification(sender, instance, **kwargs):
+    if not instance.is_read:
+        remove_unread(instance.recipient_id)
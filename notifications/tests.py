@@ -1,3 +1,171 @@
-from django.test import TestCase
+import datetime
+from io import StringIO
+from unittest import mock
+from django.core import mail
+from django.core.mail import get_connection
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from accounts.models import User
+from job_board_backend.testing import JobBoardTestMixin, QueryBudgetMixin
+from .models import Notification, OutboxEvent, UnreadCounter
+from .digests import send_digests
+from .outbox import drain_batch
 
-# Create your tests here.
+
+class NotificationTestMixin(JobBoardTestMixin):
+    def notify(self):
+        application = self.create_application()
+        OutboxEvent.objects.create(kind='application_received', recipient=self.employer,
+                                   application=application)
+
+
+class OutboxTests(NotificationTestMixin, APITestCase):
+    """Application changes queue outbox events that drain into notifications"""
+
+    def test_status_change_is_queued_with_the_update(self):
+        application = self.create_application()
+        self.client.force_authenticate(self.employer)
+        response = self.client.patch(f'/api/applications/job-applications-history/{application.pk}/',
+                                     {'status': 'shortlisted'})
+        self.assertEqual(response.status_code, 200)
+        event = OutboxEvent.objects.get()
+        self.assertEqual(event.recipient, self.applicant)
+        self.assertEqual(event.payload, {'previous_status': 'pending', 'status': 'shortlisted'})
+
+        # Saving the same status again is not a change
+        self.client.patch(f'/api/applications/job-applications-history/{application.pk}/',
+                          {'status': 'shortlisted'})
+        self.assertEqual(OutboxEvent.objects.count(), 1)
+
+    def test_drain_batches_events(self):
+        for _ in range(5):
+            self.notify()
+        with CaptureQueriesContext(connection) as context:
+            self.assertEqual(drain_batch(batch_size=3), 3)
+        # events, notifications, counter insert and update, event delete
+        # (plus the savepoint on databases that use one)
+        self.assertLessEqual(len(context.captured_queries), 7)
+        call_command('drain_outbox', stdout=StringIO())
+
+        self.assertFalse(OutboxEvent.objects.exists())
+        self.assertEqual(Notification.objects.filter(recipient=self.employer).count(), 5)
+        self.assertEqual(UnreadCounter.objects.get(user=self.employer).count, 5)
+        notification = Notification.objects.first()
+        self.assertEqual(notification.message, f"Job Seeker applied for {notification.application.job.title}.")
+
+
+class NotificationEndpointTests(QueryBudgetMixin, NotificationTestMixin, APITestCase):
+    """Notification list, unread count and marking read"""
+    url = '/api/notifications/'
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.employer)
+
+    def create_notification(self):
+        self.notify()
+        drain_batch()
+
+    def test_list_query_budget(self):
+        self.assertQueryBudget(self.url, self.create_notification)
+
+    def test_unread_count_reads_the_counter(self):
+        for _ in range(3):
+            self.create_notification()
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(f'{self.url}unread-count/')
+        self.assertEqual(response.data, {'unread': 3})
+        self.assertEqual(len(context.captured_queries), 1)
+        self.assertNotIn('COUNT(', context.captured_queries[0]['sql'])
+
+    def test_mark_read(self):
+        for _ in range(3):
+            self.create_notification()
+        notification = Notification.objects.first()
+        response = self.client.post(f'{self.url}{notification.pk}/read/')
+        self.assertEqual(response.data, {'unread': 2})
+        # Marking it again changes nothing
+        response = self.client.post(f'{self.url}{notification.pk}/read/')
+        self.assertEqual(response.data, {'unread': 2})
+        response = self.client.post(f'{self.url}read-all/')
+        self.assertEqual(response.data, {'unread': 0})
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+
+    def test_deleted_notifications_leave_the_count(self):
+        for _ in range(3):
+            self.create_notification()
+        read, *unread = Notification.objects.all()
+        self.client.post(f'{self.url}{read.pk}/read/')
+
+        # Deleting an application cascades to its notifications
+        read.application.delete()
+        self.assertEqual(self.client.get(f'{self.url}unread-count/').data, {'unread': 2})
+        unread[0].application.delete()
+        self.assertEqual(self.client.get(f'{self.url}unread-count/').data, {'unread': 1})
+        Notification.objects.all().delete()
+        self.assertEqual(self.client.get(f'{self.url}unread-count/').data, {'unread': 0})
+
+    def test_other_users_notifications_are_hidden(self):
+        self.create_notification()
+        self.client.force_authenticate(self.applicant)
+        notification = Notification.objects.get()
+        self.assertEqual(self.client.get(self.url).data['results'], [])
+        self.assertEqual(self.client.post(f'{self.url}{notification.pk}/read/').status_code, 404)
+
+
+class DigestTests(NotificationTestMixin, APITestCase):
+    """Pending notifications go out as one email per recipient, in batches"""
+
+    def create_notifications(self, recipient, count, age=datetime.timedelta(hours=2)):
+        for _ in range(count):
+            application = self.create_application()
+            Notification.objects.create(recipient=recipient, kind='application_received',
+                                        application=application, title=f'Title {next(self.counter)}',
+                                        message="Job Seeker applied & more.")
+        Notification.objects.filter(recipient=recipient).update(created_at=timezone.now() - age)
+
+    def test_one_digest_per_recipient(self):
+        self.create_notifications(self.employer, 3)
+        self.create_notifications(self.applicant, 1, age=datetime.timedelta(minutes=5))
+        batches = list(send_digests(datetime.timedelta(hours=1)))
+
+        self.assertEqual([(batch.messages, batch.notifications) for batch in batches], [(1, 3)])
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['employer@example.com'])
+        self.assertEqual(mail.outbox[0].body.count('Job Seeker applied & more.'), 3)
+        self.assertIn('&amp;', mail.outbox[0].alternatives[0][0])
+        # Still inside its window
+        self.assertTrue(Notification.objects.filter(recipient=self.applicant, emailed_at__isnull=True).exists())
+
+        list(send_digests(datetime.timedelta(hours=1)))
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_read_notifications_are_left_out(self):
+        self.create_notifications(self.employer, 2)
+        Notification.objects.filter(pk=Notification.objects.first().pk).update(is_read=True)
+        list(send_digests(datetime.timedelta(hours=1)))
+        self.assertEqual(mail.outbox[0].subject, Notification.objects.get(is_read=False).title)
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=True).exists())
+
+    def test_one_connection_per_batch(self):
+        for number in range(3):
+            recipient = User.objects.create_user(
+                username=f'employer{number}', email=f'employer{number}@example.com',
+                password='pass1234', first_name='Em', last_name='Ployer', role='employer')
+            self.create_notifications(recipient, 2)
+        connection = get_connection()
+        with mock.patch.object(connection, 'open', wraps=connection.open) as opened:
+            batches = list(send_digests(datetime.timedelta(hours=1), batch_size=2, connection=connection))
+        self.assertEqual([batch.messages for batch in batches], [2, 1])
+        self.assertEqual(opened.call_count, 2)
+        self.assertEqual(len(mail.outbox), 3)
+
+    def test_command_reports_throughput(self):
+        self.create_notifications(self.employer, 2)
+        out = StringIO()
+        call_command('send_digests', stdout=out)
+        self.assertIn('messages/s', out.getvalue())
+        self.assertIn('1 digests sent for 2 notifications.', out.getvalue())
@@ -1,5 +1,10 @@
-from django.urls import path
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import NotificationViewset
+
+router = DefaultRouter()
+router.register(r'', NotificationViewset, basename='notifications')
 
 urlpatterns = [
-    
+    path('', include(router.urls)),
 ]
@@ -1,3 +1,42 @@
-from django.shortcuts import render
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from .models import Notification
+from .outbox import mark_read, unread_count
+from .serializers import NotificationSerializer
 
-# Create your views here.
+
+class NotificationViewset(viewsets.ReadOnlyModelViewSet):
+    """
+    The signed-in user's notifications, newest first
+    - ?is_read=false lists the unread ones
+    - unread-count/ reads the user's UnreadCounter row instead of counting
+    - {id}/read/ and read-all/ mark notifications read and return the new unread count
+    """
+    serializer_class = NotificationSerializer
+    permission_classes = [IsAuthenticated]
+    filterset_fields = ['is_read', 'kind']
+    search_fields = ['title', 'message']
+    # Keyset pagination needs non-nullable ordering columns
+    ordering_fields = ['created_at']
+
+    def get_queryset(self):
+        if getattr(self, 'swagger_fake_view', False):
+            return Notification.objects.none()
+        return Notification.objects.filter(recipient=self.request.user).order_by('-created_at')
+
+    @action(detail=False, methods=['get'], url_path='unread-count', pagination_class=None)
+    def unread_count(self, request):
+        return Response({'unread': unread_count(request.user)})
+
+    @action(detail=True, methods=['post'])
+    def read(self, request, pk=None):
+        notification = self.get_object()
+        mark_read(request.user, Notification.objects.filter(pk=notification.pk))
+        return Response({'unread': unread_count(request.user)})
+
+    @action(detail=False, methods=['post'], url_path='read-all')
+    def read_all(self, request):
+        mark_read(request.user, Notification.objects.all())
+        return Response({'unread': unread_count(request.user)})